@@ -1,37 +1,112 @@
-from django.contrib import admin
+from django.contrib import admin, messages
+from django.core.paginator import Paginator
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.functional import cached_property
 
-# Register your models here.
-from django.contrib import admin
+from .bulk import batched
+from .inbox import rebuild_summaries
+from .jobs import enqueue
 from .models import (
+    AvailabilityException,
+    AvailabilityWindow,
     Member,
     Skill,
     CreditWallet,
+    CreditTransaction,
     ServiceSession,
     SkillRequest,
     Message,
+    ConversationSummary,
+    Job,
+    Review,
 )
+from .stats import invalidate_member_stats
+
+# Changelists count exactly up to this many rows; past it they estimate.
+EXACT_COUNT_LIMIT = 10000
+
+
+class EstimatedCountPaginator(Paginator):
+    """Paginator that never runs an unbounded COUNT(*).
+
+    The count stops at EXACT_COUNT_LIMIT. Beyond that an unfiltered table is
+    sized from its largest primary key (an index lookup), and a filtered one
+    is shown as that many rows, so only its first pages are reachable.
+    """
+
+    @cached_property
+    def count(self):
+        queryset = self.object_list
+        capped = queryset.order_by()[: EXACT_COUNT_LIMIT + 1].count()
+        if capped <= EXACT_COUNT_LIMIT or queryset.query.has_filters():
+            return capped
+        pk = queryset.model._meta.pk.name
+        return queryset.model._default_manager.aggregate(last=Max(pk))["last"]
+
+
+class LargeTableAdmin(admin.ModelAdmin):
+    paginator = EstimatedCountPaginator
+    # Skip the second, unfiltered COUNT(*) behind "N results (M total)".
+    show_full_result_count = False
+    list_per_page = 50
 
 
 @admin.register(Member)
 class MemberAdmin(admin.ModelAdmin):
     list_display = ("member_id", "full_name", "email", "location")
     search_fields = ("full_name", "email", "location")
+    autocomplete_fields = ("user",)
 
 
 @admin.register(Skill)
-class SkillAdmin(admin.ModelAdmin):
-    list_display = ("skill_id", "skill_name", "member", "category", "rate")
+class SkillAdmin(LargeTableAdmin):
+    list_display = ("skill_id", "skill_name", "member", "category", "rate", "rating")
     list_filter = ("category",)
+    list_select_related = ("member",)
     search_fields = ("skill_name", "member__full_name", "member__email")
+    autocomplete_fields = ("member",)
 
 
 @admin.register(CreditWallet)
 class CreditWalletAdmin(admin.ModelAdmin):
     list_display = ("wallet_id", "member", "credits")
+    list_select_related = ("member",)
+    autocomplete_fields = ("member",)
+    # The balance is the sum of the wallet's ledger entries; editing it here
+    # would skip the ledger and fail reconciliation.
+    readonly_fields = ("credits",)
+
+
+@admin.register(CreditTransaction)
+class CreditTransactionAdmin(LargeTableAdmin):
+    list_display = (
+        "transaction_id",
+        "wallet",
+        "kind",
+        "amount",
+        "session",
+        "created_at",
+    )
+    list_filter = ("kind",)
+    list_select_related = ("wallet__member", "session__skill")
+    search_fields = ("idempotency_key", "wallet__member__email")
+    raw_id_fields = ("wallet", "session")
+
+    # The ledger is append-only and only members.ledger writes it, so each
+    # entry moves its wallet's balance in the same transaction.
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+    def has_delete_permission(self, request, obj=None):
+        return False
 
 
 @admin.register(SkillRequest)
-class SkillRequestAdmin(admin.ModelAdmin):
+class SkillRequestAdmin(LargeTableAdmin):
     list_display = (
         "request_id",
         "skill",
@@ -41,11 +116,30 @@ class SkillRequestAdmin(admin.ModelAdmin):
         "created_at",
     )
     list_filter = ("status", "created_at")
+    list_select_related = ("skill", "requester", "provider")
     search_fields = ("skill__skill_name", "requester__full_name", "provider__full_name")
+    autocomplete_fields = ("skill", "requester", "provider")
+    actions = ["decline_requests"]
+
+    @admin.action(description="Decline selected pending requests")
+    def decline_requests(self, request, queryset):
+        pending = queryset.filter(status="pending")
+        members = set()
+        for requester_id, provider_id in pending.values_list("requester_id", "provider_id"):
+            members.update((requester_id, provider_id))
+
+        # One UPDATE; updated_at is set by hand so delta syncs see the change.
+        declined = pending.update(status="declined", updated_at=timezone.now())
+
+        # update() skips post_save, so do its work here.
+        invalidate_member_stats(*members)
+        if declined:
+            enqueue("refresh_member_features", {"member_ids": sorted(members)})
+        self.message_user(request, f"Declined {declined} request(s).", messages.SUCCESS)
 
 
 @admin.register(ServiceSession)
-class ServiceSessionAdmin(admin.ModelAdmin):
+class ServiceSessionAdmin(LargeTableAdmin):
     list_display = (
         "session_id",
         "request",
@@ -53,19 +147,117 @@ class ServiceSessionAdmin(admin.ModelAdmin):
         "seeker",
         "provider",
         "hours",
+        "starts_at",
         "status",
     )
     list_filter = ("status",)
+    list_select_related = (
+        "request__skill",
+        "request__requester",
+        "request__provider",
+        "skill",
+        "seeker",
+        "provider",
+    )
     search_fields = ("skill__skill_name", "seeker__full_name", "provider__full_name")
+    autocomplete_fields = ("skill", "seeker", "provider")
+    raw_id_fields = ("request",)
 
 
 @admin.register(Message)
-class MessageAdmin(admin.ModelAdmin):
+class MessageAdmin(LargeTableAdmin):
     list_display = ("message_id", "request", "sender", "short_text", "created_at")
-    search_fields = ("text", "sender__full_name", "request__skill__skill_name")
+    list_select_related = (
+        "request__skill",
+        "request__requester",
+        "request__provider",
+        "sender",
+    )
+    # No joins through request: each LIKE is then a single scan of messages.
+    search_fields = ("text", "=sender__email")
+    search_help_text = "Message text, or a sender's exact email."
+    autocomplete_fields = ("sender",)
+    raw_id_fields = ("request",)
+    actions = ["delete_messages"]
+
+    def get_actions(self, request):
+        # The stock action loads every selected row and deletes them one by
+        # one; delete_messages does the same job in one statement.
+        actions = super().get_actions(request)
+        actions.pop("delete_selected", None)
+        return actions
+
+    @admin.action(description="Delete selected messages", permissions=["delete"])
+    def delete_messages(self, request, queryset):
+        request_ids = list(
+            queryset.order_by().values_list("request_id", flat=True).distinct()
+        )
+        # Nothing points at a message and no signal listens for its
+        # deletion, so Django issues a single DELETE.
+        deleted, _ = queryset.delete()
+        for batch in batched(request_ids, 500):
+            rebuild_summaries(batch)
+        self.message_user(request, f"Deleted {deleted} message(s).", messages.SUCCESS)
 
     def short_text(self, obj):
         text = (obj.text or "").strip()
         return text[:40] + ("..." if len(text) > 40 else "")
 
     short_text.short_description = "Message"
+
+
+@admin.register(ConversationSummary)
+class ConversationSummaryAdmin(LargeTableAdmin):
+    list_display = (
+        "request",
+        "message_count",
+        "requester_unread",
+        "provider_unread",
+        "last_message_at",
+    )
+    list_select_related = ("request__skill", "request__requester", "request__provider")
+    raw_id_fields = ("request",)
+    ordering = ("-last_message_at",)
+
+    # Maintained by members.inbox; repair with rebuild_summaries().
+    def has_add_permission(self, request):
+        return False
+
+    def has_change_permission(self, request, obj=None):
+        return False
+
+
+@admin.register(Job)
+class JobAdmin(LargeTableAdmin):
+    list_display = ("job_id", "name", "status", "attempts", "run_after", "created_at")
+    list_filter = ("status", "name")
+    search_fields = ("=idempotency_key",)
+    readonly_fields = ("last_error",)
+
+
+@admin.register(Review)
+class ReviewAdmin(LargeTableAdmin):
+    list_display = ("review_id", "session", "reviewer", "reviewee", "rating", "created_at")
+    list_filter = ("rating",)
+    list_select_related = ("session__skill", "reviewer", "reviewee")
+    search_fields = ("comment", "reviewer__full_name", "reviewee__full_name")
+    autocomplete_fields = ("skill", "reviewer", "reviewee")
+    raw_id_fields = ("session",)
+
+
+@admin.register(AvailabilityWindow)
+class AvailabilityWindowAdmin(LargeTableAdmin):
+    list_display = ("window_id", "provider", "weekday", "start_time", "end_time")
+    list_filter = ("weekday",)
+    list_select_related = ("provider",)
+    search_fields = ("provider__full_name", "=provider__email")
+    autocomplete_fields = ("provider",)
+
+
+@admin.register(AvailabilityException)
+class AvailabilityExceptionAdmin(LargeTableAdmin):
+    list_display = ("exception_id", "provider", "date", "start_time", "end_time", "available")
+    list_filter = ("available",)
+    list_select_related = ("provider",)
+    search_fields = ("provider__full_name", "=provider__email")
+    autocomplete_fields = ("provider",)
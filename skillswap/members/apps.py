@@ -3,3 +3,11 @@ from django.apps import AppConfig
 
 class MembersConfig(AppConfig):
     name = 'members'
+
+    def ready(self):
+        from . import signals, tasks  # noqa: F401
+        from .responses import json_serializer
+
+        # Fail at startup, not on the first JSON response, when the
+        # serializer setting cannot be honoured.
+        json_serializer()
@@ -0,0 +1,224 @@
+import gzip
+import json
+import mimetypes
+import re
+from pathlib import Path
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+from django.contrib.staticfiles.storage import ManifestStaticFilesStorage
+from django.core.exceptions import SuspiciousFileOperation
+from django.http import FileResponse, HttpResponse, HttpResponseNotAllowed, HttpResponseNotFound
+from django.utils._os import safe_join
+from django.utils.http import http_date
+from django.views.static import was_modified_since
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional codec
+    brotli = None
+
+try:
+    import rjsmin
+except ImportError:  # pragma: no cover - optional minifier
+    rjsmin = None
+
+try:
+    import rcssmin
+except ImportError:  # pragma: no cover - optional minifier
+    rcssmin = None
+
+COMPRESSIBLE_EXTENSIONS = (".css", ".js", ".svg", ".json", ".txt", ".html", ".map", ".xml")
+# Smaller files gain nothing worth a second lookup.
+MIN_COMPRESS_BYTES = 256
+
+# Hashed names never change content, so browsers may keep them for a year
+# without asking again.
+IMMUTABLE_CACHE_CONTROL = "public, max-age=31536000, immutable"
+REVALIDATE_CACHE_CONTROL = "public, no-cache"
+
+
+# 1. Minification
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.S)
+_CSS_SPACE_RE = re.compile(r"\s+")
+_CSS_PUNCT_RE = re.compile(r"\s*([{};,>])\s*")
+
+
+def minify_css(text):
+    if rcssmin is not None:
+        return rcssmin.cssmin(text)
+    # Conservative fallback: comments and layout whitespace only. Spaces
+    # around ":" are kept because "a :hover" and "a:hover" differ.
+    text = _CSS_COMMENT_RE.sub("", text)
+    text = _CSS_SPACE_RE.sub(" ", text)
+    text = _CSS_PUNCT_RE.sub(r"\1", text)
+    return text.replace(";}", "}").strip()
+
+
+def minify_js(text):
+    # Regex-based JS minifying is unsafe (strings, regex and template
+    # literals), so without rjsmin scripts are only precompressed.
+    if rjsmin is not None:
+        return rjsmin.jsmin(text)
+    return text
+
+
+MINIFIERS = {".css": minify_css, ".js": minify_js}
+
+
+# 2. Precompression
+def precompress(path):
+    """Write ``path.gz`` (and ``path.br`` with brotli) next to ``path``.
+
+    A variant is only kept when it is actually smaller. Returns the
+    encodings written.
+    """
+    data = path.read_bytes()
+    if len(data) < MIN_COMPRESS_BYTES:
+        return []
+    variants = [("gzip", ".gz", lambda raw: gzip.compress(raw, 9, mtime=0))]
+    if brotli is not None:
+        variants.append(("br", ".br", lambda raw: brotli.compress(raw, quality=11)))
+
+    written = []
+    for encoding, suffix, compress in variants:
+        compressed = compress(data)
+        target = path.with_name(path.name + suffix)
+        if len(compressed) < len(data) * 0.95:
+            target.write_bytes(compressed)
+            written.append(encoding)
+        elif target.exists():
+            target.unlink()
+    return written
+
+
+# 3. Build storage
+class CompressedManifestStaticFilesStorage(ManifestStaticFilesStorage):
+    """Manifest storage that minifies before hashing and precompresses after.
+
+    Minifying the collected copies first means the fingerprint is that of
+    the bytes actually served.
+    """
+
+    minify = True
+
+    def post_process(self, paths, dry_run=False, **options):
+        if dry_run:
+            yield from super().post_process(paths, dry_run, **options)
+            return
+
+        if self.minify:
+            paths = dict(paths)
+            for name in paths:
+                minifier = MINIFIERS.get(Path(name).suffix)
+                if minifier:
+                    target = Path(self.path(name))
+                    source = target.read_text(encoding="utf-8")
+                    target.write_text(minifier(source), encoding="utf-8")
+                    # Hashing reads from the source storage; point it at
+                    # the minified copy instead.
+                    paths[name] = (self, name)
+
+        yield from super().post_process(paths, dry_run, **options)
+
+        for hashed_name in set(self.hashed_files.values()):
+            if hashed_name.endswith(COMPRESSIBLE_EXTENSIONS):
+                precompress(Path(self.path(hashed_name)))
+
+
+# 4. Serving
+def _hashed_names(root):
+    try:
+        manifest = json.loads((root / ManifestStaticFilesStorage.manifest_name).read_text())
+    except (FileNotFoundError, ValueError):
+        return frozenset()
+    return frozenset(manifest.get("paths", {}).values())
+
+
+_accepts = {
+    "br": re.compile(r"\bbr\b"),
+    "gzip": re.compile(r"\bgzip\b"),
+}
+
+
+class StaticFilesMiddleware:
+    """Serve STATIC_ROOT, preferring precompressed variants.
+
+    Goes first in MIDDLEWARE so asset requests skip sessions, auth and the
+    metrics recorder. Fingerprinted names get immutable far-future headers;
+    anything else is revalidated by Last-Modified.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        self.prefix = "/" + settings.STATIC_URL.strip("/") + "/"
+        self.root = Path(settings.STATIC_ROOT)
+        self.immutable = _hashed_names(self.root)
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        response = self.serve(request)
+        return response if response is not None else self.get_response(request)
+
+    async def __acall__(self, request):
+        response = self.serve(request)
+        return response if response is not None else await self.get_response(request)
+
+    def serve(self, request):
+        if not request.path_info.startswith(self.prefix):
+            return None
+        if request.method not in ("GET", "HEAD"):
+            return HttpResponseNotAllowed(["GET", "HEAD"])
+
+        name = request.path_info[len(self.prefix):]
+        try:
+            path = Path(safe_join(self.root, name))
+        except SuspiciousFileOperation:
+            return HttpResponseNotFound()
+        if not name or not path.is_file():
+            return HttpResponseNotFound()
+
+        stat = path.stat()
+        immutable = name in self.immutable
+        if not immutable and not was_modified_since(
+            request.META.get("HTTP_IF_MODIFIED_SINCE"), stat.st_mtime
+        ):
+            response = HttpResponse(status=304)
+        else:
+            response = self.file_response(request, path)
+        response["Cache-Control"] = (
+            IMMUTABLE_CACHE_CONTROL if immutable else REVALIDATE_CACHE_CONTROL
+        )
+        response["Last-Modified"] = http_date(stat.st_mtime)
+        return response
+
+    def file_response(self, request, path):
+        content_type, _ = mimetypes.guess_type(path.name)
+        accept = request.META.get("HTTP_ACCEPT_ENCODING", "")
+
+        served, encoding, has_variants = path, None, False
+        for candidate, suffix in (("br", ".br"), ("gzip", ".gz")):
+            variant = path.with_name(path.name + suffix)
+            if variant.is_file():
+                has_variants = True
+                if served is path and _accepts[candidate].search(accept):
+                    served, encoding = variant, candidate
+
+        if request.method == "HEAD":
+            response = HttpResponse(content_type=content_type)
+            response["Content-Length"] = served.stat().st_size
+        else:
+            response = FileResponse(served.open("rb"), content_type=content_type)
+            # Derived from the variant's name; the asset is not a download.
+            response.headers.pop("Content-Disposition", None)
+        if encoding:
+            response["Content-Encoding"] = encoding
+        if has_variants:
+            response["Vary"] = "Accept-Encoding"
+        return response
@@ -0,0 +1,209 @@
+# ASGI-native versions of the polling and messaging JSON views, picked in
+# urls.py when ASYNC_API_VIEWS is on (asgi.py turns it on). Reads use the
+# async ORM; writes that need a transaction reuse the sync helpers from
+# views in one sync_to_async hop, since atomic() cannot span awaits.
+import asyncio
+import json
+
+from asgiref.sync import sync_to_async
+from django.db.models import Max, Q
+from django.shortcuts import aget_object_or_404
+
+from .identity import aget_member_for_user
+from .models import ConversationSummary, Skill, SkillRequest
+from .responses import JsonResponse, content_etag
+from .scheduling import SchedulingError
+from .stats import get_member_stats
+from .views import (
+    _build_conversations_payload,
+    _build_requests_payload,
+    _create_skill_request,
+    _message_payload,
+    _parse_booking,
+    _parse_sync_cursor,
+    _scheduling_error,
+    _set_request_status,
+    _store_message,
+    _sync_cursor,
+    _sync_payload,
+    get_available_credits,
+)
+
+
+async def aget_logged_in_member(request):
+    user = await request.auser()
+    if not user.is_authenticated or user.is_superuser:
+        return None
+    if not hasattr(request, "_member"):
+        request._member = await aget_member_for_user(user)
+    return request._member
+
+
+def _json_body(request):
+    try:
+        data = json.loads(request.body.decode("utf-8")) if request.body else {}
+    except json.JSONDecodeError:
+        data = {}
+    return data
+
+
+async def _latest_change_at(member):
+    member_requests = SkillRequest.objects.filter(
+        Q(requester=member) | Q(provider=member)
+    )
+    requests, messages = await asyncio.gather(
+        member_requests.aaggregate(latest=Max("updated_at")),
+        ConversationSummary.objects.filter(
+            request__in=member_requests.values("request_id")
+        ).aaggregate(latest=Max("last_message_at")),
+    )
+    return max(filter(None, [requests["latest"], messages["latest"]]), default=None)
+
+
+@content_etag
+async def sync_data(request):
+    if request.method != "GET":
+        return JsonResponse({"error": "Invalid request method"}, status=405)
+
+    member = await aget_logged_in_member(request)
+    if not member:
+        return JsonResponse({"error": "Not logged in"}, status=403)
+
+    since = _parse_sync_cursor(request.GET.get("since"))
+
+    # The parts are independent, so they are gathered. On SQLite Django
+    # still runs every query on the one ORM thread, so they queue there;
+    # what this saves is the per-request worker thread.
+    latest, stats, requests, (conversations, messages) = await asyncio.gather(
+        _latest_change_at(member),
+        sync_to_async(get_member_stats)(member),
+        sync_to_async(_build_requests_payload)(member, since=since),
+        sync_to_async(_build_conversations_payload)(member, since=since),
+    )
+
+    return JsonResponse(_sync_payload(
+        since,
+        _sync_cursor(latest, since),
+        requests,
+        conversations,
+        messages,
+        stats,
+    ))
+
+
+async def send_message(request):
+    if request.method != "POST":
+        return JsonResponse({"error": "Invalid request method"}, status=405)
+
+    member = await aget_logged_in_member(request)
+    if not member:
+        return JsonResponse({"error": "Not logged in"}, status=403)
+
+    data = _json_body(request)
+    request_id = data.get("request_id") or request.POST.get("request_id")
+    text = (data.get("text") or request.POST.get("text") or "").strip()
+
+    if not request_id or not text:
+        return JsonResponse({"error": "Message text required"}, status=400)
+
+    skill_request = await aget_object_or_404(SkillRequest, request_id=request_id)
+    if member.member_id not in (skill_request.requester_id, skill_request.provider_id):
+        return JsonResponse({"error": "Unauthorized"}, status=403)
+
+    message = await sync_to_async(_store_message)(skill_request, member, text)
+
+    return JsonResponse(_message_payload(message))
+
+
+async def request_skill(request):
+    if request.method != "POST":
+        return JsonResponse({"error": "Invalid request method"}, status=405)
+
+    member = await aget_logged_in_member(request)
+    if not member:
+        return JsonResponse({"error": "Not logged in"}, status=403)
+
+    data = _json_body(request)
+    skill_id = data.get("skill_id") or request.POST.get("skill_id")
+    note = (data.get("note") or request.POST.get("note") or "").strip()
+    if not skill_id:
+        return JsonResponse({"error": "Skill ID missing"}, status=400)
+
+    skill = await aget_object_or_404(
+        Skill.objects.select_related("member"), skill_id=skill_id
+    )
+    if skill.member_id == member.member_id:
+        return JsonResponse({"error": "Cannot request your own skill"}, status=400)
+
+    existing = await (
+        SkillRequest.objects.filter(skill=skill, requester=member)
+        .order_by("-created_at")
+        .afirst()
+    )
+    if existing and existing.status in ["pending", "accepted"]:
+        return JsonResponse(
+            {
+                "request_id": existing.request_id,
+                "status": existing.status,
+                "message": "Request already exists",
+            }
+        )
+
+    new_request = await sync_to_async(_create_skill_request)(member, skill, note)
+
+    return JsonResponse(
+        {
+            "request_id": new_request.request_id,
+            "status": new_request.status,
+        }
+    )
+
+
+async def update_request(request):
+    if request.method != "POST":
+        return JsonResponse({"error": "Invalid request method"}, status=405)
+
+    member = await aget_logged_in_member(request)
+    if not member:
+        return JsonResponse({"error": "Not logged in"}, status=403)
+
+    data = _json_body(request)
+    request_id = data.get("request_id") or request.POST.get("request_id")
+    action = data.get("action") or request.POST.get("action")
+
+    if not request_id or action not in ["accept", "decline"]:
+        return JsonResponse({"error": "Invalid request data"}, status=400)
+
+    skill_request = await aget_object_or_404(
+        SkillRequest.objects.select_related("skill", "requester", "provider"),
+        request_id=request_id,
+    )
+    if skill_request.provider_id != member.member_id:
+        return JsonResponse({"error": "Unauthorized"}, status=403)
+
+    if action == "accept":
+        try:
+            starts_at, required_credits = _parse_booking({**request.POST.dict(), **data})
+        except SchedulingError as error:
+            return _scheduling_error(error)
+        available_credits = await sync_to_async(get_available_credits)(
+            skill_request.requester
+        )
+        if available_credits < required_credits:
+            return JsonResponse(
+                {
+                    "error": "Learner does not have enough credits",
+                    "available_credits": available_credits,
+                },
+                status=400,
+            )
+        try:
+            await sync_to_async(_set_request_status)(
+                skill_request, "accepted", hours=required_credits, starts_at=starts_at
+            )
+        except SchedulingError as error:
+            return _scheduling_error(error)
+    else:
+        await sync_to_async(_set_request_status)(skill_request, "declined")
+
+    return JsonResponse({"status": skill_request.status})
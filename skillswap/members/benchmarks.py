@@ -0,0 +1,296 @@
+import random
+import statistics
+import time
+from datetime import timedelta
+
+from django.db import connection
+from django.db.models import Q, Sum
+from django.utils import timezone
+
+from .bulk import batched
+from .inbox import rebuild_summaries
+from .matchmaking import rank_providers, refresh_member_features
+from .models import CreditWallet, Member, Message, ServiceSession, Skill, SkillRequest
+
+CATEGORIES = ["education", "technology", "arts", "wellness", "home"]
+STATUSES = ["pending", "accepted", "declined"]
+
+# Composite indexes matched to the hot query shapes (see members/models.py).
+HOT_INDEXES = [
+    "request_provider_status_idx",
+    "request_requester_skill_idx",
+    "session_seeker_status_idx",
+    "session_provider_status_idx",
+    "session_provider_starts_idx",
+    "session_seeker_starts_idx",
+    "message_request_created_idx",
+]
+
+
+# 1. Synthetic data
+def seed_dataset(
+    members=1000,
+    skills_per_member=2,
+    requests_per_member=5,
+    messages_per_request=4,
+    seed=7,
+    batch_size=2000,
+):
+    """Bulk-insert a synthetic marketplace and return the created ids.
+
+    Rows go in with ``bulk_create`` so large datasets seed in seconds; the
+    email prefix is unique per call so seeding twice never collides.
+    """
+    rng = random.Random(seed)
+    prefix = f"bench{time.time_ns()}"
+
+    member_objs = Member.objects.bulk_create(
+        [
+            Member(
+                full_name=f"Member {i}",
+                email=f"{prefix}-{i}@example.com",
+                location="Benchmark",
+            )
+            for i in range(members)
+        ],
+        batch_size=batch_size,
+    )
+    member_ids = [member.member_id for member in member_objs]
+    CreditWallet.objects.bulk_create(
+        [CreditWallet(member_id=member_id, credits=10) for member_id in member_ids],
+        batch_size=batch_size,
+    )
+
+    skills = []
+    for member_id in member_ids:
+        for j in range(skills_per_member):
+            skill = Skill(
+                member_id=member_id,
+                skill_name=f"Skill {member_id}-{j}",
+                description="Synthetic benchmark listing",
+                category=rng.choice(CATEGORIES),
+                latitude=28.6 + rng.uniform(-0.5, 0.5),
+                longitude=77.2 + rng.uniform(-0.5, 0.5),
+            )
+            skill.assign_grid_buckets()
+            skills.append(skill)
+    skills = Skill.objects.bulk_create(skills, batch_size=batch_size)
+
+    requests = []
+    for member_id in member_ids:
+        for _ in range(requests_per_member):
+            skill = rng.choice(skills)
+            if skill.member_id == member_id:
+                continue
+            requests.append(
+                SkillRequest(
+                    skill_id=skill.skill_id,
+                    requester_id=member_id,
+                    provider_id=skill.member_id,
+                    status=rng.choice(STATUSES),
+                    note="Benchmark request",
+                )
+            )
+    requests = SkillRequest.objects.bulk_create(requests, batch_size=batch_size)
+
+    sessions = [
+        ServiceSession(
+            request_id=req.request_id,
+            skill_id=req.skill_id,
+            seeker_id=req.requester_id,
+            provider_id=req.provider_id,
+            hours=1,
+            status=rng.choice(["pending", "completed"]),
+        )
+        for req in requests
+        if req.status == "accepted"
+    ]
+    ServiceSession.objects.bulk_create(sessions, batch_size=batch_size)
+
+    def messages():
+        for req in requests:
+            for k in range(messages_per_request):
+                sender = req.requester_id if k % 2 == 0 else req.provider_id
+                yield Message(request_id=req.request_id, sender_id=sender, text=f"Message {k}")
+
+    for batch in batched(messages(), batch_size):
+        Message.objects.bulk_create(batch)
+    rebuild_summaries(batch_size=batch_size)
+
+    return {
+        "members": member_ids,
+        "skills": [skill.skill_id for skill in skills],
+        "requests": [req.request_id for req in requests],
+    }
+
+
+# 2. Hot query shapes, each as (label, queryset factory, executor)
+def hot_queries(dataset, seed=7):
+    rng = random.Random(seed)
+    member_id = rng.choice(dataset["members"])
+    skill_id = rng.choice(dataset["skills"])
+    request_id = rng.choice(dataset["requests"])
+    return [
+        (
+            "pending incoming requests",
+            lambda: SkillRequest.objects.filter(provider_id=member_id, status="pending"),
+            lambda qs: qs.count(),
+        ),
+        (
+            "latest request for skill",
+            lambda: SkillRequest.objects.filter(
+                requester_id=member_id, skill_id=skill_id
+            ).order_by("-created_at"),
+            lambda qs: qs.first(),
+        ),
+        (
+            "pending hours as seeker",
+            lambda: ServiceSession.objects.filter(seeker_id=member_id, status="pending"),
+            lambda qs: qs.aggregate(total=Sum("hours")),
+        ),
+        (
+            "completed sessions",
+            lambda: ServiceSession.objects.filter(
+                Q(seeker_id=member_id) | Q(provider_id=member_id), status="completed"
+            ),
+            lambda qs: qs.count(),
+        ),
+        (
+            "pending sessions as provider",
+            lambda: ServiceSession.objects.filter(provider_id=member_id, status="pending"),
+            lambda qs: qs.count(),
+        ),
+        (
+            "provider bookings this week",
+            lambda: ServiceSession.objects.filter(
+                provider_id=member_id,
+                starts_at__gte=timezone.now(),
+                starts_at__lt=timezone.now() + timedelta(days=7),
+            ),
+            lambda qs: list(qs.values_list("starts_at", "ends_at")),
+        ),
+        (
+            "conversation history",
+            lambda: Message.objects.filter(request_id=request_id).order_by(
+                "-created_at", "-message_id"
+            )[:50],
+            lambda qs: list(qs),
+        ),
+    ]
+
+
+def explain_plan(queryset, tag=""):
+    sql, params = queryset.query.sql_with_params()
+    with connection.cursor() as cursor:
+        # sqlite3 caches prepared statements by SQL text and does not
+        # re-plan a cached EXPLAIN after an index change; the tag keeps each
+        # phase's text distinct.
+        cursor.execute(f"EXPLAIN QUERY PLAN {sql} /* {tag} */", params)
+        return " | ".join(str(row[-1]) for row in cursor.fetchall())
+
+
+def measure_queries(queries, repeat=50, tag=""):
+    results = []
+    for label, factory, execute in queries:
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            execute(factory())
+            timings.append((time.perf_counter() - started) * 1000)
+        results.append({
+            "query": label,
+            "median_ms": statistics.median(timings),
+            "plan": explain_plan(factory(), tag),
+        })
+    return results
+
+
+def drop_hot_indexes():
+    with connection.cursor() as cursor:
+        for name in HOT_INDEXES:
+            cursor.execute(f"DROP INDEX IF EXISTS {connection.ops.quote_name(name)}")
+
+
+# 3. Matchmaking at marketplace scale
+# Latency goal for rank_providers over ~100k listings.
+MATCH_TARGET_MS = 50
+
+MATCH_WORDS = [
+    "guitar", "piano", "violin", "singing", "yoga", "pilates", "python",
+    "javascript", "excel", "spanish", "french", "hindi", "painting", "pottery",
+    "sketching", "cooking", "baking", "gardening", "plumbing", "carpentry",
+    "chess", "maths", "physics", "chemistry", "photography", "editing",
+    "knitting", "sewing", "dance", "salsa", "swimming", "running",
+]
+
+
+def seed_listings(listings=100_000, skills_per_member=4, seed=7, batch_size=5000):
+    """Bulk-insert ``listings`` searchable, located skills; return their member ids.
+
+    Listings spread over a ~400 km square, a quarter of them around one
+    city centre, with names and descriptions drawn from MATCH_WORDS so
+    each word matches a few percent of the catalogue.
+    """
+    rng = random.Random(seed)
+    prefix = f"match{time.time_ns()}"
+    member_objs = Member.objects.bulk_create(
+        [
+            Member(full_name=f"Provider {i}", email=f"{prefix}-{i}@example.com", location="Bench")
+            for i in range(max(listings // skills_per_member, 1))
+        ],
+        batch_size=batch_size,
+    )
+    member_ids = [member.member_id for member in member_objs]
+
+    def skills():
+        for i in range(listings):
+            name, extra = rng.sample(MATCH_WORDS, 2)
+            if rng.random() < 0.25:
+                lat, lng = 28.6 + rng.gauss(0, 0.1), 77.2 + rng.gauss(0, 0.1)
+            else:
+                lat, lng = 28.6 + rng.uniform(-2, 2), 77.2 + rng.uniform(-2, 2)
+            skill = Skill(
+                member_id=member_ids[i % len(member_ids)],
+                skill_name=f"{name.title()} lessons",
+                description=f"Friendly {name} sessions, some {extra} too",
+                category=rng.choice(CATEGORIES),
+                latitude=lat,
+                longitude=lng,
+            )
+            skill.assign_grid_buckets()
+            yield skill
+
+    for batch in batched(skills(), batch_size):
+        Skill.objects.bulk_create(batch)
+    refresh_member_features(member_ids)
+    return member_ids
+
+
+def match_queries():
+    """Representative match_providers calls, as (label, kwargs)."""
+    centre = {"lat": 28.6139, "lng": 77.209}
+    return [
+        ("query within 10 km", {"query": "guitar", **centre, "radius_km": 10}),
+        ("two words within 25 km", {"query": "piano yoga", **centre, "radius_km": 25}),
+        ("query, no location", {"query": "python"}),
+        ("location only, 5 km", {**centre, "radius_km": 5}),
+        ("no query, no location", {}),
+    ]
+
+
+def measure_matchmaking(repeat=20, k=10):
+    results = []
+    for label, kwargs in match_queries():
+        timings = []
+        for _ in range(repeat):
+            started = time.perf_counter()
+            matches = rank_providers(k=k, **kwargs)
+            timings.append((time.perf_counter() - started) * 1000)
+        timings.sort()
+        results.append({
+            "query": label,
+            "matches": len(matches),
+            "median_ms": statistics.median(timings),
+            "p95_ms": timings[min(int(len(timings) * 0.95), len(timings) - 1)],
+        })
+    return results
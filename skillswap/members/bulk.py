@@ -0,0 +1,228 @@
+import csv
+import json
+import math
+from itertools import islice
+
+from django.db import transaction
+
+from .catalog import bump_catalog_version
+from .identity import invalidate_member_for_user
+from .models import PRIOR_RATING, CreditTransaction, CreditWallet, Member, Skill
+from .stats import invalidate_member_stats
+
+EXPORT_FIELDS = {
+    "members": ["member_id", "full_name", "email", "location"],
+    "skills": [
+        "skill_id",
+        "member__email",
+        "skill_name",
+        "description",
+        "category",
+        "rate",
+        "rating",
+        "latitude",
+        "longitude",
+    ],
+    "wallets": ["wallet_id", "member__email", "credits"],
+}
+
+EXPORT_QUERYSETS = {
+    "members": lambda: Member.objects.order_by("member_id"),
+    "skills": lambda: Skill.objects.order_by("skill_id"),
+    "wallets": lambda: CreditWallet.objects.order_by("wallet_id"),
+}
+
+
+class RowError(ValueError):
+    """A line of an import file that cannot be read as a row."""
+
+    def __init__(self, line_number, message):
+        super().__init__(f"line {line_number}: {message}")
+        self.line_number = line_number
+
+
+def detect_format(path, fmt=None):
+    if fmt:
+        return fmt
+    return "jsonl" if str(path).endswith((".jsonl", ".ndjson")) else "csv"
+
+
+def _check_coordinates(row, line_number):
+    # float() reads "nan" and "inf", and JSON allows NaN and Infinity;
+    # neither is a place, so the line is rejected like malformed JSON.
+    for field in ("latitude", "longitude"):
+        value = _parse_number(row.get(field), float)
+        if value is not None and not math.isfinite(value):
+            raise RowError(line_number, f"{field} must be a finite number")
+
+
+def read_rows(handle, fmt):
+    if fmt == "csv":
+        reader = csv.DictReader(handle)
+        for row in reader:
+            _check_coordinates(row, reader.line_num)
+            yield row
+        return
+
+    for line_number, line in enumerate(handle, start=1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            row = json.loads(line)
+        except ValueError as exc:
+            raise RowError(line_number, f"invalid JSON ({exc})") from exc
+        if not isinstance(row, dict):
+            raise RowError(line_number, "expected a JSON object")
+        _check_coordinates(row, line_number)
+        yield row
+
+
+def batched(rows, size):
+    rows = iter(rows)
+    while batch := list(islice(rows, size)):
+        yield batch
+
+
+def _clean(value):
+    return value.strip() if isinstance(value, str) else value
+
+
+def _parse_number(value, cast, default=None):
+    try:
+        return cast(value) if value not in (None, "") else default
+    except (TypeError, ValueError):
+        return default
+
+
+# 1. Members (and their wallets) in one transaction per batch
+def import_member_batch(rows, default_credits=0):
+    rows_by_email = {}
+    for row in rows:
+        email = _clean(row.get("email"))
+        if email:
+            rows_by_email[email] = row
+
+    with transaction.atomic():
+        existing = Member.objects.in_bulk(list(rows_by_email), field_name="email")
+
+        updated = []
+        for email, member in existing.items():
+            row = rows_by_email[email]
+            member.full_name = _clean(row.get("full_name")) or member.full_name
+            member.location = _clean(row.get("location")) or member.location
+            updated.append(member)
+        Member.objects.bulk_update(updated, ["full_name", "location"])
+        # bulk_update skips post_save, which normally drops cached members.
+        transaction.on_commit(
+            lambda: invalidate_member_for_user(*[member.user_id for member in updated])
+        )
+
+        new_rows = [row for email, row in rows_by_email.items() if email not in existing]
+        created = Member.objects.bulk_create([
+            Member(
+                full_name=_clean(row.get("full_name")) or _clean(row["email"]),
+                email=_clean(row["email"]),
+                location=_clean(row.get("location")) or "Not set",
+            )
+            for row in new_rows
+        ])
+
+        wallets = CreditWallet.objects.bulk_create([
+            CreditWallet(
+                member=member,
+                credits=_parse_number(row.get("credits"), int, default_credits),
+            )
+            for member, row in zip(created, new_rows)
+        ])
+        CreditTransaction.objects.bulk_create([
+            CreditTransaction(
+                wallet=wallet,
+                kind="opening",
+                amount=wallet.credits,
+                idempotency_key=f"opening:wallet:{wallet.wallet_id}",
+            )
+            for wallet in wallets
+            if wallet.credits
+        ])
+
+    return len(created), len(updated)
+
+
+# 2. Skills, matched to members by email
+def import_skill_batch(rows):
+    emails = {_clean(row.get("member_email")) for row in rows} - {None, ""}
+    members = Member.objects.in_bulk(list(emails), field_name="email")
+
+    skills = []
+    for row in rows:
+        member = members.get(_clean(row.get("member_email")))
+        if not member or not _clean(row.get("skill_name")):
+            continue
+        skill = Skill(
+            member=member,
+            skill_name=_clean(row["skill_name"]),
+            description=row.get("description") or "",
+            category=_clean(row.get("category")) or "education",
+            rate=_parse_number(row.get("rate"), int, 1),
+            # Ratings come from reviews, and an imported listing has none.
+            rating=PRIOR_RATING,
+            latitude=_parse_number(row.get("latitude"), float),
+            longitude=_parse_number(row.get("longitude"), float),
+        )
+        # bulk_create bypasses save(), which normally fills these in.
+        skill.assign_grid_buckets()
+        skills.append(skill)
+
+    with transaction.atomic():
+        Skill.objects.bulk_create(skills)
+
+    invalidate_member_stats(*{skill.member_id for skill in skills})
+    return len(skills), len(rows) - len(skills)
+
+
+def import_rows(kind, rows, batch_size, **options):
+    """Import ``rows`` in batches and return summed per-batch counts.
+
+    Bulk writes skip model signals, so the catalog version is bumped once at
+    the end instead of per row. Each batch commits on its own, so the bump
+    also happens when a later row fails and the import stops part way.
+    """
+    totals = [0, 0]
+    written = False
+    try:
+        for batch in batched(rows, batch_size):
+            if kind == "members":
+                counts = import_member_batch(batch, options.get("default_credits", 0))
+            else:
+                counts = import_skill_batch(batch)
+            written = True
+            totals = [total + count for total, count in zip(totals, counts)]
+    finally:
+        if written:
+            bump_catalog_version()
+    return tuple(totals)
+
+
+def export_columns(kind):
+    # "member__email" is written as "member_email" so exported skills can be
+    # fed straight back into import_data.
+    return [field.replace("__", "_") for field in EXPORT_FIELDS[kind]]
+
+
+def export_rows(kind, batch_size):
+    columns = export_columns(kind)
+    queryset = EXPORT_QUERYSETS[kind]().values_list(*EXPORT_FIELDS[kind])
+    for values in queryset.iterator(chunk_size=batch_size):
+        yield dict(zip(columns, values))
+
+
+def write_rows(handle, rows, columns, fmt):
+    if fmt == "csv":
+        writer = csv.DictWriter(handle, fieldnames=columns)
+        writer.writeheader()
+        writer.writerows(rows)
+        return
+
+    for row in rows:
+        handle.write(json.dumps(row) + "\n")
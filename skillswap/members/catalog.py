@@ -0,0 +1,69 @@
+import time
+
+from django.core.cache import cache
+
+from .models import Skill
+from .responses import dumps
+
+CATALOG_VERSION_KEY = "skill-catalog:version"
+CATALOG_SNAPSHOT_KEY = "skill-catalog:snapshot:{version}"
+CATALOG_SNAPSHOT_TIMEOUT = 60 * 60 * 24
+
+
+def serialize_skill(skill):
+    return {
+        "id": skill.skill_id,
+        "skill_name": skill.skill_name,
+        "description": skill.description,
+        "category": skill.category,
+        "rate": skill.rate,
+        "rating": float(skill.rating) if skill.rating is not None else None,
+        "latitude": skill.latitude,
+        "longitude": skill.longitude,
+        "member_id": skill.member.member_id if skill.member else None,
+        "member_email": skill.member.email if skill.member else None,
+        "member_name": skill.member.full_name if skill.member else "Unknown",
+    }
+
+
+def catalog_version():
+    version = cache.get(CATALOG_VERSION_KEY)
+    if version is None:
+        # Seed from the clock so a cache flush never reuses an old version
+        # number (and with it a stale snapshot or ETag).
+        cache.add(CATALOG_VERSION_KEY, int(time.time() * 1000), timeout=None)
+        version = cache.get(CATALOG_VERSION_KEY)
+    return version
+
+
+def bump_catalog_version():
+    try:
+        cache.incr(CATALOG_VERSION_KEY)
+    except ValueError:
+        catalog_version()
+
+
+def catalog_etag(version=None):
+    return f'"skills-{version or catalog_version()}"'
+
+
+def get_catalog_snapshot():
+    """Return the cached ``{"version", "json"}`` catalog snapshot.
+
+    ``json`` is the encoded skill list served by the catalog endpoint; it
+    is not rebuilt until a skill or member change bumps the version.
+    """
+    version = catalog_version()
+    key = CATALOG_SNAPSHOT_KEY.format(version=version)
+    snapshot = cache.get(key)
+    if snapshot is None:
+        payload = [
+            serialize_skill(skill)
+            for skill in Skill.objects.select_related("member").order_by("skill_id")
+        ]
+        snapshot = {
+            "version": version,
+            "json": dumps(payload).decode(),
+        }
+        cache.set(key, snapshot, CATALOG_SNAPSHOT_TIMEOUT)
+    return snapshot
@@ -1,14 +1,17 @@
-from .models import Member, Skill, CreditWallet, ServiceSession
-from django.db import transaction
+from .models import Member, Skill, SkillRequest, ServiceSession
+from .inbox import open_conversation, post_message
+from .ledger import InsufficientCredits, open_wallet, settle_session
+from .search import search_skills as full_text_search
 
 # 1. STORE DATA (Create Member)
-def create_member(name, email, location):
+def create_member(name, email, location, credits=0, user=None):
     member = Member.objects.create(
         full_name=name,
         email=email,
-        location=location
+        location=location,
+        user=user
     )
-    CreditWallet.objects.create(member=member, credits=0)
+    open_wallet(member, credits=credits)
     return member
 
 
@@ -26,35 +29,24 @@ def get_member_skills(member):
     return Skill.objects.filter(member=member)
 
 
-# 4. SEARCH DATA (Find Skills by Name)
-def search_skills(keyword):
-    return Skill.objects.filter(skill_name__icontains=keyword)
+# 4. SEARCH DATA (Find Skills by Name, Description or Category)
+def search_skills(keyword, category=None, limit=20):
+    skills, _ = full_text_search(keyword, category=category, limit=limit)
+    return skills
 
 
 # 5. UPDATE DATA (Transfer Credits)
 def transfer_credits(session):
-    seeker_wallet = CreditWallet.objects.get(member=session.seeker)
-    provider_wallet = CreditWallet.objects.get(member=session.provider)
-
-    if seeker_wallet.credits < session.hours:
+    try:
+        return settle_session(session)
+    except InsufficientCredits:
         return False
 
-    with transaction.atomic():
-        seeker_wallet.credits -= session.hours
-        provider_wallet.credits += session.hours
-
-        seeker_wallet.save()
-        provider_wallet.save()
-
-        session.status = "completed"
-        session.save()
-
-    return True
-
 
 # 6. STORE SESSION DATA
-def create_service_session(skill, seeker, provider, hours):
+def create_service_session(skill, seeker, provider, hours, request=None):
     return ServiceSession.objects.create(
+        request=request,
         skill=skill,
         seeker=seeker,
         provider=provider,
@@ -72,3 +64,21 @@ def update_session_status(session, new_status):
 # 8. DELETE DATA (Remove Skill)
 def delete_skill(skill):
     skill.delete()
+
+
+# 9. STORE DATA (Request a Skill)
+def create_skill_request(skill, requester, note="", status="pending"):
+    skill_request = SkillRequest.objects.create(
+        skill=skill,
+        requester=requester,
+        provider=skill.member,
+        status=status,
+        note=note
+    )
+    open_conversation(skill_request)
+    return skill_request
+
+
+# 10. STORE DATA (Send Message)
+def send_message(skill_request, sender, text):
+    return post_message(skill_request, sender, text)
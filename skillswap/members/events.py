@@ -0,0 +1,96 @@
+import asyncio
+import json
+import threading
+from collections import defaultdict
+
+from django.db import transaction
+
+# Seconds between SSE comments that keep idle connections (and proxies) open.
+HEARTBEAT_SECONDS = 20
+
+
+class EventHub:
+    """In-process pub/sub that fans member events out to open streams.
+
+    Subscribers live on the ASGI event loop while publishers are usually sync
+    views running in worker threads, so delivery is handed to the owning loop
+    with ``call_soon_threadsafe``. Single-node only: events published in one
+    process never reach streams held by another.
+    """
+
+    def __init__(self, queue_size=100):
+        self.queue_size = queue_size
+        self._lock = threading.Lock()
+        self._subscribers = defaultdict(set)
+
+    def subscribe(self, member_id):
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue(self.queue_size)
+        with self._lock:
+            self._subscribers[member_id].add((loop, queue))
+        return queue
+
+    def unsubscribe(self, member_id, queue):
+        with self._lock:
+            subscribers = self._subscribers.get(member_id, set())
+            subscribers.difference_update(
+                {entry for entry in subscribers if entry[1] is queue}
+            )
+            if not subscribers:
+                self._subscribers.pop(member_id, None)
+
+    def subscriber_count(self, member_id):
+        with self._lock:
+            return len(self._subscribers.get(member_id, ()))
+
+    def publish(self, member_ids, event_type, data=None):
+        event = {"type": event_type, "data": data or {}}
+        with self._lock:
+            targets = [
+                entry
+                for member_id in set(member_ids)
+                for entry in self._subscribers.get(member_id, ())
+            ]
+
+        for loop, queue in targets:
+            try:
+                loop.call_soon_threadsafe(_deliver, queue, event)
+            except RuntimeError:
+                # The loop has shut down; its streams are already gone.
+                pass
+
+
+def _deliver(queue, event):
+    try:
+        queue.put_nowait(event)
+    except asyncio.QueueFull:
+        # A stalled client is behind anyway and will catch up on its next
+        # sync-data call, so dropping is safe.
+        pass
+
+
+hub = EventHub()
+
+
+def publish_on_commit(member_ids, event_type, data=None):
+    # Only announce changes that readers can actually see.
+    transaction.on_commit(lambda: hub.publish(member_ids, event_type, data))
+
+
+def format_sse(event):
+    return f"event: {event['type']}\ndata: {json.dumps(event['data'])}\n\n"
+
+
+async def stream_events(member_id):
+    queue = hub.subscribe(member_id)
+    try:
+        yield "retry: 5000\n\n"
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), HEARTBEAT_SECONDS)
+            except asyncio.TimeoutError:
+                yield ": keep-alive\n\n"
+                continue
+            yield format_sse(event)
+    finally:
+        hub.unsubscribe(member_id, queue)
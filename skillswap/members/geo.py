@@ -0,0 +1,92 @@
+import heapq
+import math
+
+from django.db.models import Q
+
+EARTH_RADIUS_KM = 6371.0
+
+# Size of one grid bucket in degrees (~11 km of latitude). Radius searches
+# first narrow the candidates to the buckets covering the bounding box, which
+# the (lat_bucket, lng_bucket) index on Skill answers without a table scan.
+GRID_CELL_DEGREES = 0.1
+
+
+def grid_bucket(value):
+    # NaN and infinities have no cell; floor() would raise on them.
+    if value is None or not math.isfinite(value):
+        return None
+    return math.floor(value / GRID_CELL_DEGREES)
+
+
+def haversine_km(lat1, lng1, lat2, lng2):
+    d_lat = math.radians(lat2 - lat1)
+    d_lng = math.radians(lng2 - lng1)
+    a = (
+        math.sin(d_lat / 2) ** 2
+        + math.cos(math.radians(lat1))
+        * math.cos(math.radians(lat2))
+        * math.sin(d_lng / 2) ** 2
+    )
+    return 2 * EARTH_RADIUS_KM * math.atan2(math.sqrt(a), math.sqrt(1 - a))
+
+
+def bounding_box(lat, lng, radius_km):
+    d_lat = math.degrees(radius_km / EARTH_RADIUS_KM)
+    min_lat = max(lat - d_lat, -90.0)
+    max_lat = min(lat + d_lat, 90.0)
+
+    cos_lat = math.cos(math.radians(lat))
+    if min_lat <= -90.0 or max_lat >= 90.0 or cos_lat <= 1e-9:
+        return min_lat, max_lat, -180.0, 180.0
+
+    d_lng = math.degrees(radius_km / (EARTH_RADIUS_KM * cos_lat))
+    if d_lng >= 180.0:
+        return min_lat, max_lat, -180.0, 180.0
+
+    return min_lat, max_lat, lng - d_lng, lng + d_lng
+
+
+def bounding_box_filter(lat, lng, radius_km):
+    min_lat, max_lat, min_lng, max_lng = bounding_box(lat, lng, radius_km)
+
+    lat_q = Q(
+        lat_bucket__range=(grid_bucket(min_lat), grid_bucket(max_lat)),
+        latitude__range=(min_lat, max_lat),
+    )
+
+    def lng_q(low, high):
+        return Q(
+            lng_bucket__range=(grid_bucket(low), grid_bucket(high)),
+            longitude__range=(low, high),
+        )
+
+    # Boxes that cross the antimeridian are split into two longitude ranges.
+    if min_lng < -180.0:
+        return lat_q & (lng_q(min_lng + 360.0, 180.0) | lng_q(-180.0, max_lng))
+    if max_lng > 180.0:
+        return lat_q & (lng_q(min_lng, 180.0) | lng_q(-180.0, max_lng - 360.0))
+    return lat_q & lng_q(min_lng, max_lng)
+
+
+def skills_within_radius(queryset, lat, lng, radius_km, offset=0, limit=None):
+    """Return one page of ``(skill, distance_km)`` pairs, nearest first, and
+    the number of skills inside the radius.
+
+    Distances are computed over bare ``(pk, lat, lng)`` rows; full skills
+    are loaded only for the page, so a wide radius does not build and sort
+    a model for every listing in the box.
+    """
+    candidates = queryset.filter(bounding_box_filter(lat, lng, radius_km))
+
+    inside = []
+    for pk, skill_lat, skill_lng in candidates.values_list("pk", "latitude", "longitude"):
+        distance = haversine_km(lat, lng, skill_lat, skill_lng)
+        if distance <= radius_km:
+            inside.append((distance, pk))
+
+    if limit is None:
+        nearest = sorted(inside)[offset:]
+    else:
+        nearest = heapq.nsmallest(offset + limit, inside)[offset:]
+    skills = queryset.in_bulk([pk for _, pk in nearest])
+    return [(skills[pk], distance) for distance, pk in nearest], len(inside)
@@ -0,0 +1,53 @@
+from asgiref.sync import sync_to_async
+from django.core.cache import cache
+
+from .models import Member
+
+MEMBER_FOR_USER_KEY = "member-for-user:{user_id}"
+MEMBER_FOR_USER_TIMEOUT = 60 * 5
+
+
+def _resolve_member(user):
+    member = Member.objects.filter(user=user).first()
+    if member:
+        return member
+
+    # Accounts from before the user link existed are matched by email once,
+    # then linked so later lookups go through the indexed foreign key.
+    member, _ = Member.objects.get_or_create(
+        email=user.email,
+        defaults={"full_name": user.username, "location": "Not set", "user_id": user.pk},
+    )
+    if member.user_id is None:
+        Member.objects.filter(pk=member.pk, user__isnull=True).update(user=user)
+        member.user_id = user.pk
+    return member
+
+
+def get_member_for_user(user):
+    key = MEMBER_FOR_USER_KEY.format(user_id=user.pk)
+    member = cache.get(key)
+    if member is None:
+        member = _resolve_member(user)
+        cache.set(key, member, MEMBER_FOR_USER_TIMEOUT)
+    return member
+
+
+async def aget_member_for_user(user):
+    key = MEMBER_FOR_USER_KEY.format(user_id=user.pk)
+    member = await cache.aget(key)
+    if member is None:
+        member = await sync_to_async(_resolve_member)(user)
+        await cache.aset(key, member, MEMBER_FOR_USER_TIMEOUT)
+    return member
+
+
+def invalidate_member_for_user(*user_ids):
+    cache.delete_many(
+        [
+            MEMBER_FOR_USER_KEY.format(user_id=user_id)
+            for user_id in set(user_ids)
+            if user_id
+        ]
+    )
+
@@ -0,0 +1,99 @@
+from django.db import transaction
+from django.db.models import (
+    Case,
+    Count,
+    F,
+    OuterRef,
+    Subquery,
+    TextField,
+    Value,
+    When,
+)
+
+from .bulk import batched
+from .models import ConversationSummary, Message, SkillRequest
+
+
+def open_conversation(skill_request):
+    return ConversationSummary.objects.create(
+        request=skill_request, last_message_at=skill_request.created_at
+    )
+
+
+def _unread_field(skill_request, sender_id):
+    # The sender has read their own message; the other side has not.
+    if sender_id == skill_request.requester_id:
+        return "provider_unread"
+    return "requester_unread"
+
+
+def post_message(skill_request, sender, text):
+    """Store a message and fold it into the conversation summary atomically."""
+    with transaction.atomic():
+        message = Message.objects.create(request=skill_request, sender=sender, text=text)
+        unread = _unread_field(skill_request, sender.member_id)
+
+        # A writer that committed a newer message first keeps its preview.
+        is_stale = When(last_message_at__gt=message.created_at, then=F("last_message_text"))
+        updated = ConversationSummary.objects.filter(request=skill_request).update(
+            last_message_text=Case(
+                is_stale, default=Value(text), output_field=TextField()
+            ),
+            last_message_at=Case(
+                When(last_message_at__gt=message.created_at, then=F("last_message_at")),
+                default=Value(message.created_at),
+            ),
+            message_count=F("message_count") + 1,
+            **{unread: F(unread) + 1},
+        )
+        if not updated:
+            rebuild_summaries([skill_request.request_id])
+    return message
+
+
+def mark_read(skill_request, member):
+    field = (
+        "requester_unread"
+        if member.member_id == skill_request.requester_id
+        else "provider_unread"
+    )
+    return ConversationSummary.objects.filter(
+        request=skill_request, **{f"{field}__gt": 0}
+    ).update(**{field: 0})
+
+
+def rebuild_summaries(request_ids=None, batch_size=2000):
+    """Recompute previews and counts from the messages themselves.
+
+    For backfills and repairs after bulk inserts that bypass post_message.
+    Unread counters of existing rows are left alone; new rows start at 0.
+    """
+    latest = Message.objects.filter(request=OuterRef("pk")).order_by(
+        "-created_at", "-message_id"
+    )
+    requests = SkillRequest.objects.annotate(
+        count=Count("messages"),
+        last_text=Subquery(latest.values("text")[:1]),
+        last_at=Subquery(latest.values("created_at")[:1]),
+    ).values_list("request_id", "created_at", "count", "last_text", "last_at")
+    if request_ids is not None:
+        requests = requests.filter(request_id__in=request_ids)
+
+    total = 0
+    for batch in batched(requests.iterator(chunk_size=batch_size), batch_size):
+        ConversationSummary.objects.bulk_create(
+            [
+                ConversationSummary(
+                    request_id=request_id,
+                    last_message_text=last_text or "",
+                    last_message_at=last_at or created_at,
+                    message_count=count,
+                )
+                for request_id, created_at, count, last_text, last_at in batch
+            ],
+            update_conflicts=True,
+            unique_fields=["request"],
+            update_fields=["last_message_text", "last_message_at", "message_count"],
+        )
+        total += len(batch)
+    return total
@@ -0,0 +1,197 @@
+import logging
+import os
+import random
+import socket
+import threading
+import traceback
+from datetime import timedelta
+
+from django.db import IntegrityError, close_old_connections, transaction
+from django.db.models import F, Q
+from django.utils import timezone
+
+from .models import Job
+
+logger = logging.getLogger(__name__)
+
+# Retry delays grow as BASE * 2 ** (attempt - 1), capped, with some jitter so
+# jobs that failed together do not all come back together.
+BACKOFF_BASE_SECONDS = 5
+BACKOFF_MAX_SECONDS = 3600
+
+# A running job whose worker has not finished it within this long is assumed
+# lost (the process died) and becomes claimable again.
+LEASE_SECONDS = 600
+
+# Finished jobs older than this are deleted by purge_finished().
+KEEP_FINISHED_DAYS = 7
+
+_handlers = {}
+
+
+# 1. Handlers
+def job_handler(name):
+    """Register ``func(**payload)`` as the handler for jobs called ``name``.
+
+    Jobs are retried after failures and a crashed worker's job runs again,
+    so handlers must be idempotent.
+    """
+    def register(func):
+        _handlers[name] = func
+        return func
+    return register
+
+
+def get_handler(name):
+    return _handlers[name]
+
+
+# 2. Enqueueing
+def enqueue(name, payload=None, key=None, delay=0, max_attempts=5):
+    """Store a job and return it; an existing job with ``key`` wins.
+
+    Called inside the caller's transaction, the job commits or rolls back
+    with the change that caused it.
+    """
+    if key is not None:
+        existing = Job.objects.filter(idempotency_key=key).first()
+        if existing:
+            return existing
+    try:
+        with transaction.atomic():
+            return Job.objects.create(
+                name=name,
+                payload=payload or {},
+                idempotency_key=key,
+                max_attempts=max_attempts,
+                run_after=timezone.now() + timedelta(seconds=delay),
+            )
+    except IntegrityError:
+        # Lost a race with another enqueue of the same key.
+        return Job.objects.get(idempotency_key=key)
+
+
+def backoff_seconds(attempts):
+    delay = min(BACKOFF_BASE_SECONDS * 2 ** (attempts - 1), BACKOFF_MAX_SECONDS)
+    return delay * random.uniform(0.8, 1.2)
+
+
+# 3. Claiming and running
+def _claimable(now):
+    return Job.objects.filter(
+        Q(status="pending", run_after__lte=now)
+        | Q(status="running", locked_at__lt=now - timedelta(seconds=LEASE_SECONDS))
+    )
+
+
+def claim_next(worker_id):
+    """Claim the oldest due job for ``worker_id``, or return None.
+
+    The claim is a conditional UPDATE on the status seen when the job was
+    picked, so two workers racing for one job cannot both win it.
+    """
+    now = timezone.now()
+    while True:
+        candidate = (
+            _claimable(now)
+            .order_by("run_after", "job_id")
+            .values("job_id", "status", "locked_at")
+            .first()
+        )
+        if candidate is None:
+            return None
+        claimed = Job.objects.filter(
+            job_id=candidate["job_id"],
+            status=candidate["status"],
+            locked_at=candidate["locked_at"],
+        ).update(
+            status="running",
+            locked_by=worker_id,
+            locked_at=now,
+            attempts=F("attempts") + 1,
+        )
+        if claimed:
+            return Job.objects.get(job_id=candidate["job_id"])
+
+
+def run_job(job):
+    try:
+        get_handler(job.name)(**job.payload)
+    except Exception:
+        error = traceback.format_exc()
+        if job.attempts >= job.max_attempts:
+            logger.error("Job %s (%s) failed for good:\n%s", job.job_id, job.name, error)
+            job.status = "failed"
+            job.finished_at = timezone.now()
+        else:
+            logger.warning("Job %s (%s) failed, will retry:\n%s", job.job_id, job.name, error)
+            job.status = "pending"
+            job.run_after = timezone.now() + timedelta(
+                seconds=backoff_seconds(job.attempts)
+            )
+        job.last_error = error
+    else:
+        job.status = "done"
+        job.finished_at = timezone.now()
+        job.last_error = ""
+    job.locked_by = ""
+    job.locked_at = None
+    job.save(
+        update_fields=[
+            "status", "run_after", "finished_at", "last_error", "locked_by", "locked_at",
+        ]
+    )
+    return job
+
+
+def run_pending(worker_id="inline", limit=None):
+    """Run due jobs in this thread until none are left; return how many ran."""
+    ran = 0
+    while limit is None or ran < limit:
+        job = claim_next(worker_id)
+        if job is None:
+            break
+        run_job(job)
+        ran += 1
+    return ran
+
+
+def purge_finished(days=KEEP_FINISHED_DAYS):
+    cutoff = timezone.now() - timedelta(days=days)
+    deleted, _ = Job.objects.filter(status="done", finished_at__lt=cutoff).delete()
+    return deleted
+
+
+# 4. Workers
+def default_worker_id():
+    return f"{socket.gethostname()}:{os.getpid()}"
+
+
+def work(worker_id, stop, poll_interval=1.0):
+    """Run jobs until ``stop`` (a threading.Event) is set."""
+    while not stop.is_set():
+        close_old_connections()
+        try:
+            ran = run_pending(worker_id, limit=100)
+        except Exception:
+            # A database hiccup must not kill the worker thread.
+            logger.exception("Job worker %s crashed while claiming", worker_id)
+            ran = 0
+        if not ran:
+            stop.wait(poll_interval)
+    close_old_connections()
+
+
+def start_workers(count, stop, poll_interval=1.0):
+    base = default_worker_id()
+    threads = []
+    for i in range(count):
+        thread = threading.Thread(
+            target=work,
+            args=(f"{base}:{i}", stop, poll_interval),
+            name=f"job-worker-{i}",
+            daemon=True,
+        )
+        thread.start()
+        threads.append(thread)
+    return threads
@@ -0,0 +1,102 @@
+from django.db import transaction
+from django.db.models import F, Sum
+from django.db.models.functions import Coalesce
+
+from .models import CreditTransaction, CreditWallet, ServiceSession
+from .stats import invalidate_member_stats
+
+
+class LedgerError(Exception):
+    pass
+
+
+class InsufficientCredits(LedgerError):
+    pass
+
+
+def open_wallet(member, credits=0):
+    with transaction.atomic():
+        wallet = CreditWallet.objects.create(member=member, credits=credits)
+        if credits:
+            CreditTransaction.objects.create(
+                wallet=wallet,
+                kind="opening",
+                amount=credits,
+                idempotency_key=f"opening:wallet:{wallet.wallet_id}",
+            )
+    return wallet
+
+
+def settle_session(session):
+    """Move ``session.hours`` credits from seeker to provider exactly once.
+
+    Returns False when the session was already settled. Balances change only
+    through conditional ``F()`` updates inside one transaction, so concurrent
+    completions can neither lose an update nor overdraw the seeker, and no
+    lock is held beyond the two wallet rows involved.
+    """
+    hours = session.hours
+    key = f"session:{session.session_id}"
+
+    with transaction.atomic():
+        # Claiming the session first makes a second completion a no-op.
+        claimed = (
+            ServiceSession.objects.filter(session_id=session.session_id)
+            .exclude(status="completed")
+            .update(status="completed")
+        )
+        if not claimed:
+            return False
+
+        debited = CreditWallet.objects.filter(
+            member_id=session.seeker_id, credits__gte=hours
+        ).update(credits=F("credits") - hours)
+        if not debited:
+            raise InsufficientCredits(key)
+
+        credited = CreditWallet.objects.filter(
+            member_id=session.provider_id
+        ).update(credits=F("credits") + hours)
+        if not credited:
+            raise LedgerError(f"{key}: provider has no wallet")
+
+        wallet_ids = dict(
+            CreditWallet.objects.filter(
+                member_id__in=[session.seeker_id, session.provider_id]
+            ).values_list("member_id", "wallet_id")
+        )
+        CreditTransaction.objects.bulk_create([
+            CreditTransaction(
+                wallet_id=wallet_ids[session.seeker_id],
+                session_id=session.session_id,
+                kind="debit",
+                amount=-hours,
+                idempotency_key=f"{key}:debit",
+            ),
+            CreditTransaction(
+                wallet_id=wallet_ids[session.provider_id],
+                session_id=session.session_id,
+                kind="credit",
+                amount=hours,
+                idempotency_key=f"{key}:credit",
+            ),
+        ])
+
+        # update() skips post_save, so drop the cached counters by hand.
+        transaction.on_commit(
+            lambda: invalidate_member_stats(session.seeker_id, session.provider_id)
+        )
+
+    session.status = "completed"
+    return True
+
+
+def unreconciled_wallets():
+    return (
+        CreditWallet.objects.select_related("member")
+        .annotate(
+            ledger_balance=Coalesce(Sum("transactions__amount"), 0)
+        )
+        .exclude(credits=F("ledger_balance"))
+        .order_by("wallet_id")
+    )
@@ -0,0 +1,245 @@
+import json
+import math
+import random
+import time
+
+from django.contrib.auth.models import User
+from django.db import connection
+from django.test import Client
+from django.test.utils import CaptureQueriesContext
+from django.urls import reverse
+
+from . import dbms
+from .models import ServiceSession, Skill
+
+CATEGORIES = ["education", "technology", "arts", "wellness", "home"]
+
+# Endpoints in the order one scenario iteration calls them.
+ENDPOINTS = [
+    "index",
+    "request_skill",
+    "send_message",
+    "update_request",
+    "sync_data",
+    "sync_data_delta",
+    "complete_session",
+]
+
+# Latency regressions smaller than this are treated as noise.
+MIN_REGRESSION_MS = 1.0
+
+
+class LoadTestError(Exception):
+    pass
+
+
+# 1. Data generator
+def generate_dataset(
+    members=50,
+    skills_per_member=2,
+    requests_per_member=3,
+    messages_per_request=3,
+    credits=1000,
+    seed=7,
+):
+    """Create a marketplace through the ``dbms`` helpers, row by row.
+
+    Slower than ``benchmarks.seed_dataset`` but it goes through the same
+    model code paths (save(), signals, the ledger) as the live app. Every
+    member gets a login with an unusable password, so no hashing cost.
+    """
+    rng = random.Random(seed)
+    prefix = f"load{time.time_ns()}"
+
+    created = []
+    for i in range(members):
+        email = f"{prefix}-{i}@example.com"
+        user = User.objects.create_user(username=email, email=email)
+        member = dbms.create_member(
+            f"Member {i}", email, "Benchmark", credits=credits, user=user
+        )
+        for j in range(skills_per_member):
+            skill = dbms.add_skill(member, f"Skill {i}-{j}", "Synthetic load-test listing")
+            skill.category = rng.choice(CATEGORIES)
+            skill.latitude = 28.6 + rng.uniform(-0.5, 0.5)
+            skill.longitude = 77.2 + rng.uniform(-0.5, 0.5)
+            skill.save()
+        created.append(member)
+
+    skills = list(Skill.objects.filter(member__in=created).select_related("member"))
+    for member in created:
+        for _ in range(requests_per_member):
+            skill = rng.choice(skills)
+            if skill.member_id == member.member_id:
+                continue
+            req = dbms.create_skill_request(skill, member, note="Load-test request")
+            for k in range(messages_per_request):
+                sender = member if k % 2 == 0 else skill.member
+                dbms.send_message(req, sender, f"Message {k}")
+            if rng.random() < 0.3:
+                req.status = "accepted"
+                req.save()
+                dbms.create_service_session(skill, member, skill.member, 1, request=req)
+
+    return {"members": created, "skills": skills}
+
+
+# 2. Driver
+def percentile(values, pct):
+    # Nearest-rank, so the result is always an observed sample.
+    ordered = sorted(values)
+    rank = max(math.ceil(pct / 100 * len(ordered)), 1)
+    return ordered[rank - 1]
+
+
+class LoadDriver:
+    def __init__(self):
+        self.samples = {endpoint: [] for endpoint in ENDPOINTS}
+        self.clients = {}
+
+    def client_for(self, member):
+        # One logged-in client per member, so login cost stays out of timings.
+        if member.member_id not in self.clients:
+            client = Client()
+            client.force_login(member.user)
+            self.clients[member.member_id] = client
+        return self.clients[member.member_id]
+
+    def call(self, endpoint, member, method, url, payload=None):
+        client = self.client_for(member)
+        with CaptureQueriesContext(connection) as queries:
+            started = time.perf_counter()
+            if method == "post":
+                response = client.post(
+                    url, json.dumps(payload), content_type="application/json"
+                )
+            else:
+                response = client.get(url, payload)
+            elapsed = (time.perf_counter() - started) * 1000
+        if response.status_code >= 400:
+            raise LoadTestError(
+                f"{endpoint} returned {response.status_code}: {response.content[:200]!r}"
+            )
+        self.samples[endpoint].append((elapsed, len(queries)))
+        return response
+
+    def run_iteration(self, seeker, skill):
+        provider = skill.member
+        self.call("index", seeker, "get", reverse("index"))
+
+        data = self.call(
+            "request_skill", seeker, "post", reverse("request_skill"),
+            {"skill_id": skill.skill_id, "note": "Load-test request"},
+        ).json()
+        request_id = data["request_id"]
+
+        self.call(
+            "send_message", seeker, "post", reverse("send_message"),
+            {"request_id": request_id, "text": "Are you free this week?"},
+        )
+        if data["status"] == "pending":
+            self.call(
+                "update_request", provider, "post", reverse("update_request"),
+                {"request_id": request_id, "action": "accept"},
+            )
+
+        cursor = self.call("sync_data", provider, "get", reverse("sync_data")).json()["cursor"]
+        self.call(
+            "sync_data_delta", provider, "get", reverse("sync_data"), {"since": cursor}
+        )
+
+        session = ServiceSession.objects.filter(
+            request_id=request_id, status="pending"
+        ).first()
+        if session:
+            self.call(
+                "complete_session", provider, "post", reverse("complete_session"),
+                {"session_id": session.session_id},
+            )
+
+    def report(self, elapsed_seconds):
+        endpoints = {}
+        total = 0
+        for endpoint, samples in self.samples.items():
+            if not samples:
+                continue
+            latencies = [sample[0] for sample in samples]
+            queries = [sample[1] for sample in samples]
+            total += len(samples)
+            endpoints[endpoint] = {
+                "requests": len(samples),
+                "p50_ms": round(percentile(latencies, 50), 3),
+                "p95_ms": round(percentile(latencies, 95), 3),
+                "p99_ms": round(percentile(latencies, 99), 3),
+                "queries_mean": round(sum(queries) / len(queries), 2),
+                "queries_max": max(queries),
+                "requests_per_second": round(len(samples) / (sum(latencies) / 1000), 1),
+            }
+        return {
+            "endpoints": endpoints,
+            "total": {
+                "requests": total,
+                "seconds": round(elapsed_seconds, 3),
+                "requests_per_second": round(total / elapsed_seconds, 1),
+            },
+        }
+
+
+def run_load_test(dataset, iterations=50, seed=7):
+    rng = random.Random(seed)
+    members = dataset["members"]
+    driver = LoadDriver()
+
+    # Log everyone in up front.
+    for member in members:
+        driver.client_for(member)
+
+    started = time.perf_counter()
+    for _ in range(iterations):
+        seeker = rng.choice(members)
+        skill = rng.choice(
+            [skill for skill in dataset["skills"] if skill.member_id != seeker.member_id]
+        )
+        driver.run_iteration(seeker, skill)
+    return driver.report(time.perf_counter() - started)
+
+
+# 3. Baselines
+def load_baseline(path):
+    try:
+        with open(path) as handle:
+            return json.load(handle)
+    except FileNotFoundError:
+        return None
+
+
+def save_baseline(path, report):
+    with open(path, "w") as handle:
+        json.dump(report, handle, indent=2, sort_keys=True)
+        handle.write("\n")
+
+
+def compare_to_baseline(report, baseline, tolerance=0.5):
+    """Return a list of regressions of ``report`` against ``baseline``.
+
+    Query counts are deterministic and must not grow at all. Latency is
+    noisy, so p95 only counts as regressed beyond ``tolerance`` (a fraction
+    of the baseline) and ``MIN_REGRESSION_MS``.
+    """
+    regressions = []
+    for endpoint, before in baseline.get("endpoints", {}).items():
+        after = report["endpoints"].get(endpoint)
+        if after is None:
+            continue
+        if after["queries_max"] > before["queries_max"]:
+            regressions.append(
+                f"{endpoint}: {after['queries_max']} queries per request "
+                f"(baseline {before['queries_max']})"
+            )
+        limit = max(before["p95_ms"] * (1 + tolerance), before["p95_ms"] + MIN_REGRESSION_MS)
+        if after["p95_ms"] > limit:
+            regressions.append(
+                f"{endpoint}: p95 {after['p95_ms']:.1f} ms "
+                f"(baseline {before['p95_ms']:.1f} ms)"
+            )
+    return regressions
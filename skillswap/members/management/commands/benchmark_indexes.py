@@ -0,0 +1,45 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from members.benchmarks import drop_hot_indexes, hot_queries, measure_queries, seed_dataset
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed a synthetic dataset and compare hot query plans and timings "
+        "with and without the composite indexes. Everything is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--members", type=int, default=5000)
+        parser.add_argument("--requests-per-member", type=int, default=10)
+        parser.add_argument("--messages-per-request", type=int, default=5)
+        parser.add_argument("--repeat", type=int, default=50)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.stdout.write("Seeding benchmark dataset...")
+            dataset = seed_dataset(
+                members=options["members"],
+                requests_per_member=options["requests_per_member"],
+                messages_per_request=options["messages_per_request"],
+            )
+            queries = hot_queries(dataset)
+
+            after = measure_queries(queries, options["repeat"], "with")
+            drop_hot_indexes()
+            before = measure_queries(queries, options["repeat"], "without")
+
+            # DDL is transactional in SQLite, so this also restores the indexes.
+            transaction.set_rollback(True)
+
+        for without, with_index in zip(before, after):
+            self.stdout.write(self.style.MIGRATE_HEADING(without["query"]))
+            self.stdout.write(
+                f"  without indexes: {without['median_ms']:.3f} ms  "
+                f"plan: {without['plan']}"
+            )
+            self.stdout.write(
+                f"  with indexes:    {with_index['median_ms']:.3f} ms  "
+                f"plan: {with_index['plan']}"
+            )
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from members.benchmarks import MATCH_TARGET_MS, measure_matchmaking, seed_listings
+
+
+class Command(BaseCommand):
+    help = (
+        "Seed synthetic located listings and time rank_providers against "
+        "the latency target. Everything is rolled back."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--listings", type=int, default=100_000)
+        parser.add_argument("--repeat", type=int, default=20)
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            self.stdout.write(f"Seeding {options['listings']} listings...")
+            seed_listings(options["listings"])
+            results = measure_matchmaking(options["repeat"])
+            transaction.set_rollback(True)
+
+        for result in results:
+            style = (
+                self.style.SUCCESS if result["p95_ms"] <= MATCH_TARGET_MS
+                else self.style.ERROR
+            )
+            self.stdout.write(style(
+                f"{result['query']:<24} median {result['median_ms']:7.2f} ms  "
+                f"p95 {result['p95_ms']:7.2f} ms  ({result['matches']} matches)"
+            ))
+        self.stdout.write(f"Target: p95 <= {MATCH_TARGET_MS} ms")
@@ -0,0 +1,53 @@
+from pathlib import Path
+
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.management import call_command
+from django.core.management.base import BaseCommand, CommandError
+
+from members.assets import CompressedManifestStaticFilesStorage
+
+# Assets whose sizes are reported after a build.
+REPORTED_ASSETS = ["css/style.css", "js/script.js"]
+
+
+class Command(BaseCommand):
+    help = (
+        "Collect static files into STATIC_ROOT with fingerprinted names, "
+        "minify CSS/JS and write gzip/brotli variants next to them."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--no-minify",
+            action="store_true",
+            help="Hash and precompress the files as they are.",
+        )
+        parser.add_argument(
+            "--clear",
+            action="store_true",
+            help="Delete STATIC_ROOT's contents before collecting.",
+        )
+
+    def handle(self, *args, **options):
+        if not isinstance(staticfiles_storage, CompressedManifestStaticFilesStorage):
+            raise CommandError(
+                "The static storage is not the production one; "
+                "set SKILLSWAP_STATIC_MODE=production."
+            )
+
+        staticfiles_storage.minify = not options["no_minify"]
+        call_command(
+            "collectstatic", interactive=False, clear=options["clear"], verbosity=0
+        )
+
+        for name in REPORTED_ASSETS:
+            hashed = staticfiles_storage.stored_name(name)
+            path = Path(staticfiles_storage.path(hashed))
+            sizes = [f"{path.stat().st_size} B"]
+            for suffix in (".gz", ".br"):
+                variant = path.with_name(path.name + suffix)
+                if variant.exists():
+                    sizes.append(f"{suffix[1:]} {variant.stat().st_size} B")
+            self.stdout.write(f"{hashed}: " + ", ".join(sizes))
+
+        self.stdout.write(self.style.SUCCESS("Static files built"))
@@ -0,0 +1,39 @@
+import sys
+
+from django.core.management.base import BaseCommand, CommandError
+
+from members.bulk import (
+    EXPORT_FIELDS,
+    detect_format,
+    export_columns,
+    export_rows,
+    write_rows,
+)
+
+
+class Command(BaseCommand):
+    help = "Stream members, skills or wallets out to a CSV/JSONL file."
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=sorted(EXPORT_FIELDS))
+        parser.add_argument("path", help='Output file, or "-" for stdout.')
+        parser.add_argument("--format", choices=["csv", "jsonl"])
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+
+        kind = options["kind"]
+        fmt = detect_format(options["path"], options["format"])
+        rows = export_rows(kind, options["batch_size"])
+
+        if options["path"] == "-":
+            write_rows(sys.stdout, rows, export_columns(kind), fmt)
+            return
+
+        try:
+            with open(options["path"], "w", newline="", encoding="utf-8") as handle:
+                write_rows(handle, rows, export_columns(kind), fmt)
+        except OSError as exc:
+            raise CommandError(str(exc))
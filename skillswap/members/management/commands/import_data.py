@@ -0,0 +1,48 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from members.bulk import RowError, detect_format, import_rows, read_rows
+
+
+class Command(BaseCommand):
+    help = (
+        "Stream members or skills from a CSV/JSONL file into the database "
+        "using batched bulk inserts."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("kind", choices=["members", "skills"])
+        parser.add_argument("path")
+        parser.add_argument("--format", choices=["csv", "jsonl"])
+        parser.add_argument("--batch-size", type=int, default=1000)
+        parser.add_argument(
+            "--default-credits",
+            type=int,
+            default=0,
+            help="Wallet credits for new members whose row has no credits column.",
+        )
+
+    def handle(self, *args, **options):
+        if options["batch_size"] < 1:
+            raise CommandError("--batch-size must be positive")
+
+        fmt = detect_format(options["path"], options["format"])
+        try:
+            with open(options["path"], newline="", encoding="utf-8") as handle:
+                first, second = import_rows(
+                    options["kind"],
+                    read_rows(handle, fmt),
+                    options["batch_size"],
+                    default_credits=options["default_credits"],
+                )
+        except OSError as exc:
+            raise CommandError(str(exc))
+        except RowError as exc:
+            raise CommandError(
+                f"Stopped at {exc}. Batches before it were already imported."
+            )
+
+        if options["kind"] == "members":
+            message = f"Created {first} member(s), updated {second}"
+        else:
+            message = f"Created {first} skill(s), skipped {second}"
+        self.stdout.write(self.style.SUCCESS(message))
@@ -0,0 +1,110 @@
+import json
+
+from django.conf import settings
+from django.core.cache import cache
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection
+from django.test.utils import setup_test_environment, teardown_test_environment
+
+from members.loadtest import (
+    compare_to_baseline,
+    generate_dataset,
+    load_baseline,
+    run_load_test,
+    save_baseline,
+)
+
+
+class Command(BaseCommand):
+    help = (
+        "Drive the member-facing endpoints against a throwaway test database "
+        "and report latency percentiles, queries per request and throughput. "
+        "Fails when the run regresses against the stored baseline."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--members", type=int, default=50)
+        parser.add_argument("--skills-per-member", type=int, default=2)
+        parser.add_argument("--requests-per-member", type=int, default=3)
+        parser.add_argument("--messages-per-request", type=int, default=3)
+        parser.add_argument("--iterations", type=int, default=100)
+        parser.add_argument("--seed", type=int, default=7)
+        parser.add_argument(
+            "--baseline", default=str(settings.BASE_DIR / "loadtest-baseline.json")
+        )
+        parser.add_argument(
+            "--save-baseline",
+            action="store_true",
+            help="Record this run as the new baseline instead of comparing.",
+        )
+        parser.add_argument(
+            "--tolerance",
+            type=float,
+            default=0.5,
+            help="Allowed p95 slowdown as a fraction of the baseline.",
+        )
+        parser.add_argument("--json", action="store_true", help="Print the raw report.")
+
+    def handle(self, *args, **options):
+        # Same isolation as the test runner: a fresh, migrated database that
+        # is dropped afterwards, so the real data is never touched.
+        old_name = connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, serialize=False
+        )
+        setup_test_environment()
+        cache.clear()
+        try:
+            self.stdout.write("Generating dataset...")
+            dataset = generate_dataset(
+                members=options["members"],
+                skills_per_member=options["skills_per_member"],
+                requests_per_member=options["requests_per_member"],
+                messages_per_request=options["messages_per_request"],
+                seed=options["seed"],
+            )
+            self.stdout.write(f"Running {options['iterations']} iterations...")
+            report = run_load_test(
+                dataset, iterations=options["iterations"], seed=options["seed"]
+            )
+        finally:
+            teardown_test_environment()
+            connection.creation.destroy_test_db(old_name, verbosity=0)
+
+        if options["json"]:
+            self.stdout.write(json.dumps(report, indent=2))
+        else:
+            self.write_table(report)
+
+        if options["save_baseline"]:
+            save_baseline(options["baseline"], report)
+            self.stdout.write(self.style.SUCCESS(f"Baseline saved to {options['baseline']}"))
+            return
+
+        baseline = load_baseline(options["baseline"])
+        if baseline is None:
+            self.stdout.write(
+                f"No baseline at {options['baseline']}; record one with --save-baseline."
+            )
+            return
+
+        regressions = compare_to_baseline(report, baseline, options["tolerance"])
+        if regressions:
+            raise CommandError("Regressions:\n  " + "\n  ".join(regressions))
+        self.stdout.write(self.style.SUCCESS("No regressions against the baseline."))
+
+    def write_table(self, report):
+        self.stdout.write(
+            f"{'endpoint':<18}{'n':>6}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}"
+            f"{'queries':>10}{'req/s':>10}"
+        )
+        for endpoint, stats in report["endpoints"].items():
+            self.stdout.write(
+                f"{endpoint:<18}{stats['requests']:>6}{stats['p50_ms']:>10.2f}"
+                f"{stats['p95_ms']:>10.2f}{stats['p99_ms']:>10.2f}"
+                f"{stats['queries_mean']:>10.1f}{stats['requests_per_second']:>10.1f}"
+            )
+        total = report["total"]
+        self.stdout.write(
+            f"{total['requests']} requests in {total['seconds']:.2f}s "
+            f"({total['requests_per_second']:.1f} req/s)"
+        )
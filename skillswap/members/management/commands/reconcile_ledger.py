@@ -0,0 +1,21 @@
+from django.core.management.base import BaseCommand, CommandError
+
+from members.ledger import unreconciled_wallets
+
+
+class Command(BaseCommand):
+    help = "Check every wallet balance against the sum of its ledger entries."
+
+    def handle(self, *args, **options):
+        mismatched = 0
+        for wallet in unreconciled_wallets().iterator():
+            mismatched += 1
+            self.stdout.write(
+                f"Wallet {wallet.wallet_id} ({wallet.member.email}): "
+                f"balance {wallet.credits}, ledger {wallet.ledger_balance}"
+            )
+
+        if mismatched:
+            raise CommandError(f"{mismatched} wallet(s) do not match the ledger")
+
+        self.stdout.write(self.style.SUCCESS("All wallets match the ledger"))
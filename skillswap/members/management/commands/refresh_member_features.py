@@ -0,0 +1,27 @@
+from django.core.management.base import BaseCommand
+
+from members.bulk import batched
+from members.matchmaking import refresh_member_features
+from members.models import Member
+from members.reviews import refresh_trust_scores
+
+
+class Command(BaseCommand):
+    help = (
+        "Recompute the precomputed matchmaking features for every member "
+        "and re-age their trust scores."
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--batch-size", type=int, default=1000)
+
+    def handle(self, *args, **options):
+        member_ids = Member.objects.order_by("member_id").values_list(
+            "member_id", flat=True
+        )
+        refreshed = 0
+        for batch in batched(member_ids.iterator(), options["batch_size"]):
+            refreshed += refresh_member_features(batch)
+        refresh_trust_scores()
+
+        self.stdout.write(self.style.SUCCESS(f"Refreshed {refreshed} member(s)"))
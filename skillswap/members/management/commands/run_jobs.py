@@ -0,0 +1,51 @@
+import signal
+import threading
+
+from django.core.management.base import BaseCommand
+
+from members.jobs import purge_finished, run_pending, start_workers
+
+
+class Command(BaseCommand):
+    help = "Run queued background jobs with a pool of worker threads."
+
+    def add_arguments(self, parser):
+        parser.add_argument("--workers", type=int, default=2)
+        parser.add_argument(
+            "--poll-interval",
+            type=float,
+            default=1.0,
+            help="Seconds an idle worker waits before looking for jobs again.",
+        )
+        parser.add_argument(
+            "--once",
+            action="store_true",
+            help="Run every job that is due now in this thread, then exit.",
+        )
+        parser.add_argument(
+            "--purge",
+            action="store_true",
+            help="Delete finished jobs older than a week before starting.",
+        )
+
+    def handle(self, *args, **options):
+        if options["purge"]:
+            self.stdout.write(f"Purged {purge_finished()} finished job(s)")
+
+        if options["once"]:
+            ran = run_pending()
+            self.stdout.write(self.style.SUCCESS(f"Ran {ran} job(s)"))
+            return
+
+        stop = threading.Event()
+        signal.signal(signal.SIGTERM, lambda *_: stop.set())
+        threads = start_workers(options["workers"], stop, options["poll_interval"])
+        self.stdout.write(f"Started {len(threads)} job worker(s); Ctrl+C to stop")
+        try:
+            while not stop.is_set():
+                stop.wait(1)
+        except KeyboardInterrupt:
+            stop.set()
+        for thread in threads:
+            thread.join()
+        self.stdout.write(self.style.SUCCESS("Job workers stopped"))
@@ -0,0 +1,230 @@
+import heapq
+import math
+import re
+from functools import lru_cache
+
+from django.db.models import Count, Q
+
+from .geo import bounding_box_filter, haversine_km
+from .models import MemberFeatures, ServiceSession, Skill, SkillRequest
+from .reviews import PRIOR_RATING
+from .search import skill_match_filter, tokenize
+
+# Weights of each normalised (0..1) signal in the final score.
+WEIGHTS = {
+    "relevance": 0.35,
+    "distance": 0.25,
+    "rating": 0.15,
+    "experience": 0.1,
+    "responsiveness": 0.1,
+    "availability": 0.05,
+}
+
+# Completed sessions at which the experience signal saturates.
+EXPERIENCE_SATURATION = 50
+
+# Without a location to narrow them, only this many best BM25 text matches
+# (or, with no query either, best-rated listings) are scored.
+MAX_CANDIDATES = 2000
+
+FEATURE_FIELDS = (
+    "review_count",
+    "trust_score",
+    "completed_sessions",
+    "pending_sessions",
+    "requests_received",
+    "response_rate",
+)
+
+# Scoring reads plain rows; only the final top k become model instances.
+CANDIDATE_FIELDS = (
+    "skill_id",
+    "skill_name",
+    "category",
+    "description",
+    "latitude",
+    "longitude",
+) + tuple(f"member__features__{name}" for name in FEATURE_FIELDS)
+
+
+# 1. Precomputed per-provider features
+def refresh_member_features(member_ids=None):
+    sessions = ServiceSession.objects.values("provider_id").annotate(
+        completed=Count("session_id", filter=Q(status="completed")),
+        pending=Count("session_id", filter=Q(status="pending")),
+    )
+    requests = SkillRequest.objects.values("provider_id").annotate(
+        received=Count("request_id"),
+        answered=Count("request_id", filter=~Q(status="pending")),
+    )
+
+    if member_ids is not None:
+        member_ids = list(member_ids)
+        sessions = sessions.filter(provider_id__in=member_ids)
+        requests = requests.filter(provider_id__in=member_ids)
+
+    features = {}
+
+    def row(member_id):
+        if member_id not in features:
+            features[member_id] = MemberFeatures(member_id=member_id)
+        return features[member_id]
+
+    for item in sessions:
+        entry = row(item["provider_id"])
+        entry.completed_sessions = item["completed"]
+        entry.pending_sessions = item["pending"]
+    for item in requests:
+        entry = row(item["provider_id"])
+        entry.requests_received = item["received"]
+        entry.requests_answered = item["answered"]
+        entry.response_rate = item["answered"] / item["received"]
+    for member_id in member_ids or ():
+        row(member_id)
+
+    MemberFeatures.objects.bulk_create(
+        features.values(),
+        update_conflicts=True,
+        unique_fields=["member"],
+        update_fields=[
+            "completed_sessions",
+            "pending_sessions",
+            "requests_received",
+            "requests_answered",
+            "response_rate",
+            "updated_at",
+        ],
+    )
+    return len(features)
+
+
+# 2. Scoring
+@lru_cache(maxsize=256)
+def _token_patterns(token):
+    # "\btok" matches a word starting with tok, "\btok\b" the whole word,
+    # with the same word characters as tokenize().
+    escaped = re.escape(token)
+    return re.compile(rf"\b{escaped}"), re.compile(rf"\b{escaped}\b")
+
+
+def _relevance(tokens, row):
+    if not tokens:
+        return 1.0
+    name = row["skill_name"].lower()
+    score = 0.0
+    for token in tokens:
+        prefix, word = _token_patterns(token)
+        if prefix.search(name):
+            score += 1.0
+        elif word.search(row["category"].lower()):
+            score += 0.6
+        elif prefix.search(row["description"].lower()):
+            score += 0.4
+    return score / len(tokens)
+
+
+def _score(row, tokens, distance_km, radius_km, floor=None):
+    """Return ``(score, signals)``, or None if it cannot beat ``floor``.
+
+    Relevance is the costly signal, so it is computed last and skipped
+    when even a perfect match would stay below ``floor``.
+    """
+    def feature(name, default):
+        value = row[f"member__features__{name}"]
+        return default if value is None else value
+
+    # Recency-weighted reviews; unreviewed providers sit at the prior.
+    rating = feature("trust_score", 0.0) if feature("review_count", 0) else PRIOR_RATING
+    signals = {
+        # Without a location every candidate gets the same neutral score.
+        "distance": (
+            1.0 - min(distance_km / radius_km, 1.0) if distance_km is not None else 0.5
+        ),
+        "rating": (rating or 0.0) / 5.0,
+        "experience": min(
+            math.log1p(feature("completed_sessions", 0))
+            / math.log1p(EXPERIENCE_SATURATION),
+            1.0,
+        ),
+        "responsiveness": (
+            feature("response_rate", 0.0) if feature("requests_received", 0) else 0.5
+        ),
+        "availability": 1.0 / (1.0 + feature("pending_sessions", 0)),
+    }
+    total = sum(WEIGHTS[name] * value for name, value in signals.items())
+    if floor is not None and total + WEIGHTS["relevance"] < floor:
+        return None
+    signals["relevance"] = _relevance(tokens, row)
+    return total + WEIGHTS["relevance"] * signals["relevance"], signals
+
+
+def score_skill(skill, tokens, distance_km=None, radius_km=None):
+    features = getattr(skill.member, "features", None)
+    row = {
+        "skill_name": skill.skill_name,
+        "category": skill.category,
+        "description": skill.description,
+    }
+    for name in FEATURE_FIELDS:
+        row[f"member__features__{name}"] = getattr(features, name, None)
+    return _score(row, tokens, distance_km, radius_km)
+
+
+def rank_providers(
+    query="", lat=None, lng=None, radius_km=None, k=10, category=None, exclude_member=None
+):
+    """Return the top ``k`` skills as ``(score, distance_km, skill, signals)``.
+
+    Candidates come from the indexes: the FTS index for the query and the
+    grid index for the radius. They are scored as plain rows in one
+    streaming pass into a size-k heap, whose minimum lets most rows skip
+    the relevance signal, and only the winners are loaded as models.
+    """
+    tokens = tokenize(query)
+    located = lat is not None and lng is not None and radius_km
+    candidates = Skill.objects.all()
+
+    if exclude_member:
+        candidates = candidates.exclude(member=exclude_member)
+    if category:
+        candidates = candidates.filter(category=category)
+    if located:
+        candidates = candidates.filter(bounding_box_filter(lat, lng, radius_km))
+
+    # The box already bounds a located search; otherwise the candidate set
+    # is capped, best matches first.
+    limit = None if located else MAX_CANDIDATES
+    text_filter = skill_match_filter(query, limit=limit)
+    if text_filter is not None:
+        candidates = candidates.filter(text_filter)
+    elif limit is not None:
+        candidates = candidates.order_by("-rating")[:limit]
+
+    # Min-heap of (score, -skill_id, distance, signals): ties go to the
+    # older listing, as before.
+    heap = []
+    for row in candidates.values(*CANDIDATE_FIELDS).iterator(chunk_size=2000):
+        distance = None
+        if located:
+            distance = haversine_km(lat, lng, row["latitude"], row["longitude"])
+            if distance > radius_km:
+                continue
+        floor = heap[0][0] if len(heap) == k else None
+        scored = _score(row, tokens, distance, radius_km, floor)
+        if scored is None or (tokens and scored[1]["relevance"] == 0):
+            continue
+        item = (scored[0], -row["skill_id"], distance, scored[1])
+        if len(heap) < k:
+            heapq.heappush(heap, item)
+        elif item[:2] > heap[0][:2]:
+            heapq.heapreplace(heap, item)
+
+    top = sorted(heap, key=lambda item: item[:2], reverse=True)
+    skills = Skill.objects.select_related("member", "member__features").in_bulk(
+        [-negated_id for _, negated_id, _, _ in top]
+    )
+    return [
+        (score, distance, skills[-negated_id], signals)
+        for score, negated_id, distance, signals in top
+        if -negated_id in skills
+    ]
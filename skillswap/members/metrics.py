@@ -0,0 +1,247 @@
+import logging
+import re
+import threading
+import time
+from collections import Counter
+from contextvars import ContextVar
+
+from asgiref.sync import iscoroutinefunction, markcoroutinefunction
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+DURATION_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_BUCKETS = (1, 2, 5, 10, 20, 50, 100, 200)
+
+# Slow-request logs list this many of the most repeated query shapes.
+SLOW_LOG_TOP_QUERIES = 5
+
+
+def slow_request_seconds():
+    return getattr(settings, "SLOW_REQUEST_MS", 500) / 1000
+
+
+def client_address(request):
+    """Return the client's address, looking through trusted proxies.
+
+    X-Forwarded-For is read right to left, since each proxy appends the
+    peer it saw; the first address that is not a trusted proxy is the
+    client. Without a trusted proxy in front the header is ignored.
+    """
+    trusted = set(getattr(settings, "TRUSTED_PROXIES", ()))
+    address = request.META.get("REMOTE_ADDR")
+    if address not in trusted:
+        return address
+    forwarded = request.META.get("HTTP_X_FORWARDED_FOR", "")
+    for hop in reversed([hop.strip() for hop in forwarded.split(",") if hop.strip()]):
+        address = hop
+        if hop not in trusted:
+            break
+    return address
+
+
+# 1. Query fingerprints
+_IN_LIST_RE = re.compile(r"IN \((?:%s, )*%s\)")
+_LITERAL_RE = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_SPACE_RE = re.compile(r"\s+")
+
+
+def fingerprint(sql):
+    # Django passes parameters separately, so only inlined literals and
+    # variable-length IN lists need folding for N+1 loops to collapse.
+    sql = _LITERAL_RE.sub("?", sql)
+    sql = _IN_LIST_RE.sub("IN (...)", sql)
+    return _SPACE_RE.sub(" ", sql).strip()
+
+
+class QueryRecorder:
+    """Per-request query counts and execute-only timings.
+
+    Times cover ``cursor.execute()`` alone: rows fetched afterwards are
+    read outside any hook Django offers, so large result sets cost more
+    than these numbers show.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.execute_seconds = 0.0
+        self.shapes = Counter()
+        self.shape_execute_seconds = Counter()
+
+    def record(self, sql, seconds):
+        shape = fingerprint(sql)
+        self.count += 1
+        self.execute_seconds += seconds
+        self.shapes[shape] += 1
+        self.shape_execute_seconds[shape] += seconds
+
+    @property
+    def duplicates(self):
+        # Repeats of one query shape: an N+1 loop shows up as n - 1.
+        return sum(count - 1 for count in self.shapes.values())
+
+
+# A ContextVar, not a thread-local: async views run their ORM calls on a
+# worker thread, and sync_to_async carries the context across.
+_recorder = ContextVar("query_recorder", default=None)
+
+
+def record_query(execute, sql, params, many, context):
+    recorder = _recorder.get()
+    if recorder is None:
+        return execute(sql, params, many, context)
+    started = time.perf_counter()
+    try:
+        return execute(sql, params, many, context)
+    finally:
+        recorder.record(sql, time.perf_counter() - started)
+
+
+def install_query_recorder(connection):
+    # Same hook as connection.execute_wrapper(), but left in place for the
+    # connection's lifetime so it also sees the worker threads' connections.
+    if record_query not in connection.execute_wrappers:
+        connection.execute_wrappers.append(record_query)
+
+
+# 2. Per-view histograms
+class Histogram:
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        self.sum += value
+        self.count += 1
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+                break
+
+
+class MetricsRegistry:
+    """In-process metrics, one set per worker; Prometheus sums the scrapes."""
+
+    HISTOGRAMS = {
+        "skillswap_request_duration_seconds": ("Wall time per request.", DURATION_BUCKETS),
+        "skillswap_db_execute_seconds": (
+            "Time in cursor.execute() per request, excluding row fetches.",
+            DURATION_BUCKETS,
+        ),
+        "skillswap_db_queries": ("Queries per request.", QUERY_BUCKETS),
+    }
+    DUPLICATES = "skillswap_db_duplicate_queries_total"
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        self.histograms = {name: {} for name in self.HISTOGRAMS}
+        self.duplicates = Counter()
+
+    def observe(self, view, seconds, recorder):
+        values = {
+            "skillswap_request_duration_seconds": seconds,
+            "skillswap_db_execute_seconds": recorder.execute_seconds,
+            "skillswap_db_queries": recorder.count,
+        }
+        with self.lock:
+            for name, value in values.items():
+                per_view = self.histograms[name]
+                if view not in per_view:
+                    per_view[view] = Histogram(self.HISTOGRAMS[name][1])
+                per_view[view].observe(value)
+            self.duplicates[view] += recorder.duplicates
+
+    def render(self):
+        lines = []
+        with self.lock:
+            for name, (help_text, _) in self.HISTOGRAMS.items():
+                lines.append(f"# HELP {name} {help_text}")
+                lines.append(f"# TYPE {name} histogram")
+                for view, histogram in sorted(self.histograms[name].items()):
+                    label = f'view="{_escape(view)}"'
+                    cumulative = 0
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        cumulative += count
+                        lines.append(f'{name}_bucket{{{label},le="{bound}"}} {cumulative}')
+                    lines.append(f'{name}_bucket{{{label},le="+Inf"}} {histogram.count}')
+                    lines.append(f"{name}_sum{{{label}}} {histogram.sum}")
+                    lines.append(f"{name}_count{{{label}}} {histogram.count}")
+
+            lines.append(f"# HELP {self.DUPLICATES} Repeated query shapes (likely N+1).")
+            lines.append(f"# TYPE {self.DUPLICATES} counter")
+            for view, count in sorted(self.duplicates.items()):
+                lines.append(f'{self.DUPLICATES}{{view="{_escape(view)}"}} {count}')
+        return "\n".join(lines) + "\n"
+
+
+def _escape(value):
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+registry = MetricsRegistry()
+
+
+# 3. Middleware
+class QueryMetricsMiddleware:
+    """Time each request and the queries it runs, keyed by view name.
+
+    Goes first in MIDDLEWARE so session and auth queries are counted too.
+    """
+
+    sync_capable = True
+    async_capable = True
+
+    def __init__(self, get_response):
+        self.get_response = get_response
+        if iscoroutinefunction(get_response):
+            markcoroutinefunction(self)
+
+    def __call__(self, request):
+        if iscoroutinefunction(self):
+            return self.__acall__(request)
+        recorder = QueryRecorder()
+        token = _recorder.set(recorder)
+        started = time.perf_counter()
+        try:
+            return self.get_response(request)
+        finally:
+            _recorder.reset(token)
+            self.finish(request, time.perf_counter() - started, recorder)
+
+    async def __acall__(self, request):
+        recorder = QueryRecorder()
+        token = _recorder.set(recorder)
+        started = time.perf_counter()
+        try:
+            return await self.get_response(request)
+        finally:
+            _recorder.reset(token)
+            self.finish(request, time.perf_counter() - started, recorder)
+
+    def finish(self, request, seconds, recorder):
+        match = getattr(request, "resolver_match", None)
+        view = match.view_name if match else "unresolved"
+        registry.observe(view, seconds, recorder)
+
+        if seconds >= slow_request_seconds():
+            top = "\n".join(
+                f"  {count}x {recorder.shape_execute_seconds[shape] * 1000:.1f}ms {shape}"
+                for shape, count in recorder.shapes.most_common(SLOW_LOG_TOP_QUERIES)
+            )
+            logger.warning(
+                "Slow request %s %s (%s): %.0fms, %d queries (%.0fms executing), "
+                "%d duplicates\n%s",
+                request.method,
+                request.path,
+                view,
+                seconds * 1000,
+                recorder.count,
+                recorder.execute_seconds * 1000,
+                recorder.duplicates,
+                top,
+            )
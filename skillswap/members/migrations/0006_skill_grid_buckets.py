@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:53
+
+import math
+
+from django.db import migrations, models
+
+GRID_CELL_DEGREES = 0.1
+
+
+def backfill_grid_buckets(apps, schema_editor):
+    Skill = apps.get_model('members', 'Skill')
+    located = Skill.objects.filter(latitude__isnull=False, longitude__isnull=False)
+    for skill in located.iterator():
+        skill.lat_bucket = math.floor(skill.latitude / GRID_CELL_DEGREES)
+        skill.lng_bucket = math.floor(skill.longitude / GRID_CELL_DEGREES)
+        skill.save(update_fields=['lat_bucket', 'lng_bucket'])
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0005_servicesession_request'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skill',
+            name='lat_bucket',
+            field=models.IntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='skill',
+            name='lng_bucket',
+            field=models.IntegerField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddIndex(
+            model_name='skill',
+            index=models.Index(fields=['lat_bucket', 'lng_bucket'], name='skill_grid_idx'),
+        ),
+        migrations.RunPython(backfill_grid_buckets, migrations.RunPython.noop),
+    ]
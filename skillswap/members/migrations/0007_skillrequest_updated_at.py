@@ -0,0 +1,24 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:54
+
+from django.db import migrations, models
+
+
+def backfill_updated_at(apps, schema_editor):
+    SkillRequest = apps.get_model('members', 'SkillRequest')
+    SkillRequest.objects.update(updated_at=models.F('created_at'))
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0006_skill_grid_buckets'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='skillrequest',
+            name='updated_at',
+            field=models.DateTimeField(auto_now=True, db_index=True),
+        ),
+        migrations.RunPython(backfill_updated_at, migrations.RunPython.noop),
+    ]
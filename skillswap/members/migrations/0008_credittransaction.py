@@ -0,0 +1,46 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:57
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def open_existing_wallets(apps, schema_editor):
+    # Record current balances as opening entries so the ledger reconciles
+    # from day one.
+    CreditWallet = apps.get_model('members', 'CreditWallet')
+    CreditTransaction = apps.get_model('members', 'CreditTransaction')
+    CreditTransaction.objects.bulk_create(
+        [
+            CreditTransaction(
+                wallet=wallet,
+                kind='opening',
+                amount=wallet.credits,
+                idempotency_key=f'opening:wallet:{wallet.wallet_id}',
+            )
+            for wallet in CreditWallet.objects.exclude(credits=0).iterator()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0007_skillrequest_updated_at'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CreditTransaction',
+            fields=[
+                ('transaction_id', models.AutoField(primary_key=True, serialize=False)),
+                ('kind', models.CharField(max_length=20)),
+                ('amount', models.IntegerField()),
+                ('idempotency_key', models.CharField(max_length=100, unique=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('session', models.ForeignKey(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='transactions', to='members.servicesession')),
+                ('wallet', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='transactions', to='members.creditwallet')),
+            ],
+        ),
+        migrations.RunPython(open_existing_wallets, migrations.RunPython.noop),
+    ]
@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 18:59
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0008_credittransaction'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='MemberFeatures',
+            fields=[
+                ('member', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='features', serialize=False, to='members.member')),
+                ('completed_sessions', models.IntegerField(default=0)),
+                ('pending_sessions', models.IntegerField(default=0)),
+                ('requests_received', models.IntegerField(default=0)),
+                ('requests_answered', models.IntegerField(default=0)),
+                ('response_rate', models.FloatField(db_index=True, default=0.0)),
+                ('avg_rating', models.FloatField(db_index=True, default=0.0)),
+                ('updated_at', models.DateTimeField(auto_now=True)),
+            ],
+        ),
+    ]
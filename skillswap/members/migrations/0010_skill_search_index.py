@@ -0,0 +1,26 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:20
+
+from django.db import migrations
+
+
+def install(apps, schema_editor):
+    from members.search import install_skill_search_index
+
+    install_skill_search_index(schema_editor.connection)
+
+
+def uninstall(apps, schema_editor):
+    from members.search import uninstall_skill_search_index
+
+    uninstall_skill_search_index(schema_editor.connection)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0009_memberfeatures'),
+    ]
+
+    operations = [
+        migrations.RunPython(install, uninstall),
+    ]
@@ -0,0 +1,33 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:01
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0010_skill_search_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='message',
+            index=models.Index(fields=['request', 'created_at'], name='message_request_created_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servicesession',
+            index=models.Index(fields=['seeker', 'status'], name='session_seeker_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='servicesession',
+            index=models.Index(fields=['provider', 'status'], name='session_provider_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skillrequest',
+            index=models.Index(fields=['provider', 'status'], name='request_provider_status_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='skillrequest',
+            index=models.Index(fields=['requester', 'skill', 'created_at'], name='request_requester_skill_idx'),
+        ),
+    ]
@@ -0,0 +1,57 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:11
+
+import django.db.models.deletion
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+
+
+def summarize_existing_conversations(apps, schema_editor):
+    # Existing history counts as read; only new messages raise unread.
+    SkillRequest = apps.get_model('members', 'SkillRequest')
+    Message = apps.get_model('members', 'Message')
+    ConversationSummary = apps.get_model('members', 'ConversationSummary')
+
+    latest = Message.objects.filter(request=OuterRef('pk')).order_by(
+        '-created_at', '-message_id'
+    )
+    requests = SkillRequest.objects.annotate(
+        count=Count('messages'),
+        last_text=Subquery(latest.values('text')[:1]),
+        last_at=Subquery(latest.values('created_at')[:1]),
+    )
+    ConversationSummary.objects.bulk_create(
+        [
+            ConversationSummary(
+                request_id=req.request_id,
+                last_message_text=req.last_text or '',
+                last_message_at=req.last_at or req.created_at,
+                message_count=req.count,
+            )
+            for req in requests.iterator()
+        ],
+        batch_size=500,
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0011_hot_query_indexes'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='ConversationSummary',
+            fields=[
+                ('request', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='summary', serialize=False, to='members.skillrequest')),
+                ('last_message_text', models.TextField(blank=True)),
+                ('last_message_at', models.DateTimeField(db_index=True)),
+                ('message_count', models.IntegerField(default=0)),
+                ('requester_unread', models.IntegerField(default=0)),
+                ('provider_unread', models.IntegerField(default=0)),
+            ],
+        ),
+        migrations.RunPython(
+            summarize_existing_conversations, migrations.RunPython.noop
+        ),
+    ]
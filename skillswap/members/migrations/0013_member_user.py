@@ -0,0 +1,41 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:13
+
+import django.db.models.deletion
+from django.conf import settings
+from django.db import migrations, models
+
+
+def link_members_to_users(apps, schema_editor):
+    # Members were matched to logins by email; make that link explicit.
+    # Users sharing an email go to the oldest account, as before.
+    Member = apps.get_model('members', 'Member')
+    User = apps.get_model(*settings.AUTH_USER_MODEL.split('.'))
+
+    user_ids = {}
+    for user_id, email in User.objects.order_by('-pk').values_list('pk', 'email'):
+        if email:
+            user_ids[email] = user_id
+
+    members = []
+    for member in Member.objects.filter(user__isnull=True).iterator():
+        if member.email in user_ids:
+            member.user_id = user_ids[member.email]
+            members.append(member)
+    Member.objects.bulk_update(members, ['user'], batch_size=500)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0012_conversationsummary'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='member',
+            name='user',
+            field=models.OneToOneField(blank=True, null=True, on_delete=django.db.models.deletion.SET_NULL, related_name='member', to=settings.AUTH_USER_MODEL),
+        ),
+        migrations.RunPython(link_members_to_users, migrations.RunPython.noop),
+    ]
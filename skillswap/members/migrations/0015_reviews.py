@@ -0,0 +1,78 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:22
+
+import django.db.models.deletion
+from django.db import migrations, models
+
+
+def clear_listing_ratings(apps, schema_editor):
+    # avg_rating used to average the self-entered listing ratings; it now
+    # averages reviews, of which there are none yet.
+    MemberFeatures = apps.get_model('members', 'MemberFeatures')
+    MemberFeatures.objects.update(avg_rating=0.0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0014_job'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='memberfeatures',
+            name='decayed_rating_sum',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='memberfeatures',
+            name='decayed_rating_weight',
+            field=models.FloatField(default=0.0),
+        ),
+        migrations.AddField(
+            model_name='memberfeatures',
+            name='rating_sum',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='memberfeatures',
+            name='review_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='memberfeatures',
+            name='trust_score',
+            field=models.FloatField(db_index=True, default=0.0),
+        ),
+        migrations.AddField(
+            model_name='skill',
+            name='rating_sum',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AddField(
+            model_name='skill',
+            name='review_count',
+            field=models.IntegerField(default=0),
+        ),
+        migrations.AlterField(
+            model_name='skill',
+            name='rating',
+            field=models.FloatField(db_index=True, default=5.0),
+        ),
+        migrations.CreateModel(
+            name='Review',
+            fields=[
+                ('review_id', models.AutoField(primary_key=True, serialize=False)),
+                ('rating', models.SmallIntegerField()),
+                ('comment', models.TextField(blank=True)),
+                ('created_at', models.DateTimeField(auto_now_add=True)),
+                ('reviewee', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reviews_received', to='members.member')),
+                ('reviewer', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reviews_written', to='members.member')),
+                ('session', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, related_name='review', to='members.servicesession')),
+                ('skill', models.ForeignKey(on_delete=django.db.models.deletion.CASCADE, related_name='reviews', to='members.skill')),
+            ],
+            options={
+                'indexes': [models.Index(fields=['reviewee', '-created_at'], name='review_reviewee_recent_idx')],
+            },
+        ),
+        migrations.RunPython(clear_listing_ratings, migrations.RunPython.noop),
+    ]
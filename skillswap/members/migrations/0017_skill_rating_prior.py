@@ -0,0 +1,27 @@
+# Generated by Django 5.2.18 on 2026-10-18 19:42
+
+from django.db import migrations, models
+
+
+def reset_unreviewed_ratings(apps, schema_editor):
+    # Unreviewed listings kept the old 5.0 default (or a self-entered
+    # rating) and so ranked above reviewed ones, which are pulled toward
+    # the 4.0 prior; put them on the prior too.
+    Skill = apps.get_model('members', 'Skill')
+    Skill.objects.filter(review_count=0).update(rating=4.0)
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('members', '0016_availability'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='skill',
+            name='rating',
+            field=models.FloatField(db_index=True, default=4.0),
+        ),
+        migrations.RunPython(reset_unreviewed_ratings, migrations.RunPython.noop),
+    ]
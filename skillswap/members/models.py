@@ -1,7 +1,11 @@
+from django.conf import settings
 from django.db import models
 
 # Create your models here.
 from django.db import models
+from django.utils import timezone
+
+from .geo import grid_bucket
 
 # 1. Member Table
 class Member(models.Model):
@@ -9,11 +13,23 @@ class Member(models.Model):
     full_name = models.CharField(max_length=100)
     email = models.EmailField(unique=True)
     location = models.CharField(max_length=100)
+    user = models.OneToOneField(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="member",
+    )
 
     def __str__(self):
         return self.full_name
 
 
+# Rating every listing starts from; members.reviews pulls each average of
+# reviews toward it, so unreviewed listings must sit at it too.
+PRIOR_RATING = 4.0
+
+
 # 2. Skill Table
 class Skill(models.Model):
     skill_id = models.AutoField(primary_key=True)
@@ -22,9 +38,36 @@ class Skill(models.Model):
     description = models.TextField()
     category = models.CharField(max_length=50, default="education")
     rate = models.IntegerField(default=1)
-    rating = models.FloatField(default=5.0)
+    # Bayesian average of reviews once there are any; see members.reviews.
+    rating = models.FloatField(default=PRIOR_RATING, db_index=True)
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
     latitude = models.FloatField(null=True, blank=True)
     longitude = models.FloatField(null=True, blank=True)
+    lat_bucket = models.IntegerField(null=True, blank=True, editable=False)
+    lng_bucket = models.IntegerField(null=True, blank=True, editable=False)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["lat_bucket", "lng_bucket"], name="skill_grid_idx"
+            ),
+        ]
+
+    def save(self, *args, **kwargs):
+        self.assign_grid_buckets()
+        super().save(*args, **kwargs)
+
+    def assign_grid_buckets(self):
+        # Skills without full, finite coordinates stay out of the spatial index.
+        lat_bucket = grid_bucket(self.latitude)
+        lng_bucket = grid_bucket(self.longitude)
+        if lat_bucket is None or lng_bucket is None:
+            self.lat_bucket = None
+            self.lng_bucket = None
+        else:
+            self.lat_bucket = lat_bucket
+            self.lng_bucket = lng_bucket
 
     def __str__(self):
         return self.skill_name
@@ -54,6 +97,21 @@ class ServiceSession(models.Model):
     provider = models.ForeignKey(Member, on_delete=models.CASCADE, related_name='provider')
     hours = models.IntegerField()
     status = models.CharField(max_length=20)
+    # Booked slot; older sessions have none. See members.scheduling.
+    starts_at = models.DateTimeField(null=True, blank=True)
+    ends_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["seeker", "status"], name="session_seeker_status_idx"),
+            models.Index(
+                fields=["provider", "status"], name="session_provider_status_idx"
+            ),
+            models.Index(
+                fields=["provider", "starts_at"], name="session_provider_starts_idx"
+            ),
+            models.Index(fields=["seeker", "starts_at"], name="session_seeker_starts_idx"),
+        ]
 
     def __str__(self):
         skill_name = self.skill.skill_name if self.skill else "Skill"
@@ -76,6 +134,18 @@ class SkillRequest(models.Model):
     status = models.CharField(max_length=20, default="pending")
     note = models.TextField(blank=True)
     created_at = models.DateTimeField(auto_now_add=True)
+    updated_at = models.DateTimeField(auto_now=True, db_index=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["provider", "status"], name="request_provider_status_idx"
+            ),
+            models.Index(
+                fields=["requester", "skill", "created_at"],
+                name="request_requester_skill_idx",
+            ),
+        ]
 
     def __str__(self):
         skill_name = self.skill.skill_name if self.skill else "Skill"
@@ -97,7 +167,208 @@ class Message(models.Model):
     text = models.TextField()
     created_at = models.DateTimeField(auto_now_add=True)
 
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["request", "created_at"], name="message_request_created_idx"
+            ),
+        ]
+
     def __str__(self):
         sender_name = self.sender.full_name if self.sender else "Sender"
         preview = (self.text or "").strip()[:30]
         return f"Message {self.message_id} - {sender_name}: {preview}"
+
+
+# 7. Credit Transaction Table (Ledger)
+class CreditTransaction(models.Model):
+    transaction_id = models.AutoField(primary_key=True)
+    wallet = models.ForeignKey(
+        CreditWallet, on_delete=models.CASCADE, related_name="transactions"
+    )
+    session = models.ForeignKey(
+        ServiceSession,
+        on_delete=models.SET_NULL,
+        null=True,
+        blank=True,
+        related_name="transactions",
+    )
+    kind = models.CharField(max_length=20)
+    amount = models.IntegerField()
+    idempotency_key = models.CharField(max_length=100, unique=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    def save(self, *args, **kwargs):
+        # Ledger rows are append-only; corrections are new entries.
+        if not self._state.adding:
+            raise ValueError("Credit transactions cannot be modified")
+        super().save(*args, **kwargs)
+
+    def __str__(self):
+        return f"Transaction {self.transaction_id} - {self.kind} {self.amount:+d}"
+
+
+# 8. Member Features Table (precomputed matchmaking signals)
+class MemberFeatures(models.Model):
+    member = models.OneToOneField(
+        Member,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="features",
+    )
+    completed_sessions = models.IntegerField(default=0)
+    pending_sessions = models.IntegerField(default=0)
+    requests_received = models.IntegerField(default=0)
+    requests_answered = models.IntegerField(default=0)
+    response_rate = models.FloatField(default=0.0, db_index=True)
+    # Review aggregates, maintained per review by members.reviews. The
+    # decayed sums use forward decay, so they too are plain increments.
+    review_count = models.IntegerField(default=0)
+    rating_sum = models.IntegerField(default=0)
+    avg_rating = models.FloatField(default=0.0, db_index=True)
+    decayed_rating_sum = models.FloatField(default=0.0)
+    decayed_rating_weight = models.FloatField(default=0.0)
+    trust_score = models.FloatField(default=0.0, db_index=True)
+    updated_at = models.DateTimeField(auto_now=True)
+
+    def __str__(self):
+        return f"{self.member.full_name} Features"
+
+
+# 9. Conversation Summary Table (inbox row per request, maintained on write)
+class ConversationSummary(models.Model):
+    request = models.OneToOneField(
+        SkillRequest,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name="summary",
+    )
+    last_message_text = models.TextField(blank=True)
+    last_message_at = models.DateTimeField(db_index=True)
+    message_count = models.IntegerField(default=0)
+    requester_unread = models.IntegerField(default=0)
+    provider_unread = models.IntegerField(default=0)
+
+    def unread_for(self, member_id):
+        if member_id == self.request.requester_id:
+            return self.requester_unread
+        return self.provider_unread
+
+    def __str__(self):
+        return f"Conversation {self.request_id} ({self.message_count} messages)"
+
+
+# 10. Job Table (durable queue for work done off the request path)
+class Job(models.Model):
+    STATUS_CHOICES = [
+        ("pending", "Pending"),
+        ("running", "Running"),
+        ("done", "Done"),
+        ("failed", "Failed"),
+    ]
+
+    job_id = models.AutoField(primary_key=True)
+    name = models.CharField(max_length=100)
+    payload = models.JSONField(default=dict, blank=True)
+    # Enqueueing the same key twice is a no-op, so callers can retry freely.
+    idempotency_key = models.CharField(max_length=200, unique=True, null=True, blank=True)
+    status = models.CharField(max_length=10, choices=STATUS_CHOICES, default="pending")
+    attempts = models.IntegerField(default=0)
+    max_attempts = models.IntegerField(default=5)
+    run_after = models.DateTimeField(default=timezone.now)
+    locked_by = models.CharField(max_length=100, blank=True)
+    locked_at = models.DateTimeField(null=True, blank=True)
+    last_error = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["status", "run_after"], name="job_status_run_after_idx"),
+        ]
+
+    def __str__(self):
+        return f"Job {self.job_id} - {self.name} ({self.status})"
+
+
+# 11. Review Table (one per completed session, written by the seeker)
+class Review(models.Model):
+    review_id = models.AutoField(primary_key=True)
+    session = models.OneToOneField(
+        ServiceSession, on_delete=models.CASCADE, related_name="review"
+    )
+    skill = models.ForeignKey(Skill, on_delete=models.CASCADE, related_name="reviews")
+    reviewer = models.ForeignKey(
+        Member, on_delete=models.CASCADE, related_name="reviews_written"
+    )
+    reviewee = models.ForeignKey(
+        Member, on_delete=models.CASCADE, related_name="reviews_received"
+    )
+    rating = models.SmallIntegerField()
+    comment = models.TextField(blank=True)
+    created_at = models.DateTimeField(auto_now_add=True)
+
+    class Meta:
+        indexes = [
+            models.Index(
+                fields=["reviewee", "-created_at"], name="review_reviewee_recent_idx"
+            ),
+        ]
+
+    def __str__(self):
+        return f"Review {self.review_id} - {self.rating}/5 for {self.reviewee_id}"
+
+
+# 12. Availability Window Table (a provider's recurring weekly hours)
+class AvailabilityWindow(models.Model):
+    WEEKDAY_CHOICES = [
+        (0, "Monday"),
+        (1, "Tuesday"),
+        (2, "Wednesday"),
+        (3, "Thursday"),
+        (4, "Friday"),
+        (5, "Saturday"),
+        (6, "Sunday"),
+    ]
+
+    window_id = models.AutoField(primary_key=True)
+    provider = models.ForeignKey(
+        Member, on_delete=models.CASCADE, related_name="availability_windows"
+    )
+    weekday = models.SmallIntegerField(choices=WEEKDAY_CHOICES)
+    start_time = models.TimeField()
+    end_time = models.TimeField()
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["provider", "weekday"], name="window_provider_day_idx"),
+        ]
+
+    def __str__(self):
+        return (
+            f"{self.get_weekday_display()} {self.start_time:%H:%M}-"
+            f"{self.end_time:%H:%M} ({self.provider_id})"
+        )
+
+
+# 13. Availability Exception Table (one-off changes to the weekly hours)
+class AvailabilityException(models.Model):
+    exception_id = models.AutoField(primary_key=True)
+    provider = models.ForeignKey(
+        Member, on_delete=models.CASCADE, related_name="availability_exceptions"
+    )
+    date = models.DateField()
+    # Both empty means the whole day.
+    start_time = models.TimeField(null=True, blank=True)
+    end_time = models.TimeField(null=True, blank=True)
+    # False blocks the time off; True adds hours outside the weekly windows.
+    available = models.BooleanField(default=False)
+
+    class Meta:
+        indexes = [
+            models.Index(fields=["provider", "date"], name="exception_provider_date_idx"),
+        ]
+
+    def __str__(self):
+        kind = "Extra" if self.available else "Blocked"
+        return f"{kind} {self.date} ({self.provider_id})"
@@ -0,0 +1,149 @@
+import json
+import re
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from django.core.serializers.json import DjangoJSONEncoder
+from django.http import HttpResponse
+from django.middleware.gzip import GZipMiddleware
+from django.utils.cache import (
+    get_conditional_response,
+    patch_cache_control,
+    patch_vary_headers,
+    set_response_etag,
+)
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - optional speedup
+    orjson = None
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional codec
+    brotli = None
+
+
+# 1. Pluggable JSON encoding
+def _django_default(value):
+    # Whatever orjson cannot encode natively (Decimal, lazy strings, ...)
+    # gets the same treatment as under JsonResponse.
+    return DjangoJSONEncoder().default(value)
+
+
+def _dumps_orjson(data):
+    return orjson.dumps(data, default=_django_default, option=orjson.OPT_NON_STR_KEYS)
+
+
+def _dumps_stdlib(data):
+    return json.dumps(data, cls=DjangoJSONEncoder, separators=(",", ":")).encode()
+
+
+def json_serializer():
+    """Return the ``dumps`` callable picked by ``settings.JSON_SERIALIZER``.
+
+    "auto" (the default) uses orjson when it is installed, "json" forces the
+    standard library, "orjson" requires orjson.
+    """
+    choice = getattr(settings, "JSON_SERIALIZER", "auto")
+    if choice not in ("auto", "json", "orjson"):
+        raise ImproperlyConfigured(
+            f'JSON_SERIALIZER must be "auto", "json" or "orjson", not {choice!r}'
+        )
+    if choice == "orjson" and orjson is None:
+        raise ImproperlyConfigured('JSON_SERIALIZER is "orjson" but orjson is not installed')
+    if choice != "json" and orjson is not None:
+        return _dumps_orjson
+    return _dumps_stdlib
+
+
+def dumps(data):
+    return json_serializer()(data)
+
+
+class JsonResponse(HttpResponse):
+    """Drop-in for django.http.JsonResponse that encodes with ``dumps``."""
+
+    def __init__(self, data, safe=True, **kwargs):
+        if safe and not isinstance(data, dict):
+            raise TypeError(
+                "In order to allow non-dict objects to be serialized set the "
+                "safe parameter to False."
+            )
+        kwargs.setdefault("content_type", "application/json")
+        super().__init__(content=dumps(data), **kwargs)
+
+
+# 2. Conditional GET on the response body
+def conditional_response(request, response, **cache_control):
+    """ETag ``response`` by its body and answer a matching request with 304.
+
+    ``cache_control`` defaults to private, no-cache: per-user data that
+    browsers may keep but must revalidate every time.
+    """
+    if (
+        request.method not in ("GET", "HEAD")
+        or response.status_code != 200
+        or response.streaming
+    ):
+        return response
+    patch_cache_control(response, **(cache_control or {"private": True, "no_cache": True}))
+    set_response_etag(response)
+    return get_conditional_response(request, etag=response["ETag"], response=response)
+
+
+def content_etag(view):
+    """ETag a view's response with a hash of its body and answer 304s.
+
+    For polled endpoints whose output is usually unchanged: the body is
+    still built, but identical bodies are never re-sent.
+    """
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def wrapper(request, *args, **kwargs):
+            return conditional_response(request, await view(request, *args, **kwargs))
+    else:
+        @wraps(view)
+        def wrapper(request, *args, **kwargs):
+            return conditional_response(request, view(request, *args, **kwargs))
+    return wrapper
+
+
+# 3. Compression
+_accepts_br = re.compile(r"\bbr\b")
+
+COMPRESSIBLE_TYPES = ("application/json",)
+
+
+class JsonCompressionMiddleware(GZipMiddleware):
+    """Compress JSON API responses with brotli when available, else gzip.
+
+    Limited to JSON: HTML pages embed the CSRF token, and only Django's gzip
+    path pads its output against BREACH-style length probing.
+    """
+
+    def process_response(self, request, response):
+        content_type = response.get("Content-Type", "").split(";")[0]
+        if response.streaming or content_type not in COMPRESSIBLE_TYPES:
+            return response
+
+        accept = request.META.get("HTTP_ACCEPT_ENCODING", "")
+        if brotli is None or not _accepts_br.search(accept):
+            return super().process_response(request, response)
+
+        if len(response.content) < 200 or response.has_header("Content-Encoding"):
+            return response
+        patch_vary_headers(response, ("Accept-Encoding",))
+
+        compressed = brotli.compress(response.content, quality=5)
+        if len(compressed) >= len(response.content):
+            return response
+        response.content = compressed
+        response.headers["Content-Length"] = str(len(compressed))
+        etag = response.get("ETag")
+        if etag and etag.startswith('"'):
+            response.headers["ETag"] = "W/" + etag
+        response.headers["Content-Encoding"] = "br"
+        return response
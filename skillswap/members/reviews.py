@@ -0,0 +1,123 @@
+import math
+from datetime import datetime, timezone as dt_timezone
+
+from django.db import IntegrityError, transaction
+from django.db.models import F, FloatField, Value
+from django.db.models.expressions import ExpressionWrapper
+from django.utils import timezone
+
+from .catalog import bump_catalog_version
+from .models import PRIOR_RATING, MemberFeatures, Review, Skill
+
+# Bayesian prior: every average starts as PRIOR_WEIGHT phantom reviews of
+# PRIOR_RATING, so one 5-star review cannot outrank fifty 4.8s.
+PRIOR_WEIGHT = 5
+
+# Time constant of the recency decay: a review's weight falls by 1/e every
+# DECAY_DAYS relative to a fresh one.
+DECAY_DAYS = 180
+
+# Forward decay: rather than shrinking every stored weight as time passes,
+# each review is weighted exp((t - DECAY_EPOCH) / tau), which only grows.
+# Ratios of such sums equal the usual decayed average, and adding a review
+# stays a single increment.
+DECAY_EPOCH = datetime(2024, 1, 1, tzinfo=dt_timezone.utc)
+
+
+class ReviewError(Exception):
+    pass
+
+
+def decay_weight(at=None):
+    age = ((at or timezone.now()) - DECAY_EPOCH).total_seconds()
+    return math.exp(age / (DECAY_DAYS * 86400))
+
+
+def _float(expression):
+    return ExpressionWrapper(expression, output_field=FloatField())
+
+
+def _bayesian(total, count):
+    return _float(
+        (Value(PRIOR_RATING * PRIOR_WEIGHT) + total) / (Value(float(PRIOR_WEIGHT)) + count)
+    )
+
+
+def _trust(decayed_sum, decayed_weight, now_weight):
+    # The prior is scaled to "now" so it keeps its pull as old reviews fade.
+    return _float(
+        (Value(PRIOR_RATING * PRIOR_WEIGHT * now_weight) + decayed_sum)
+        / (Value(PRIOR_WEIGHT * now_weight) + decayed_weight)
+    )
+
+
+# 1. Submitting
+def submit_review(session, reviewer, rating, comment=""):
+    """Record the seeker's review of a completed session.
+
+    The provider's and the skill's aggregates are bumped in the same
+    transaction with one UPDATE each, whatever the number of past reviews.
+    """
+    if session.status != "completed":
+        raise ReviewError("Only completed sessions can be reviewed")
+    if reviewer.member_id != session.seeker_id:
+        raise ReviewError("Only the learner can review this session")
+    if not isinstance(rating, int) or not 1 <= rating <= 5:
+        raise ReviewError("Rating must be a whole number from 1 to 5")
+
+    weight = decay_weight()
+    with transaction.atomic():
+        try:
+            with transaction.atomic():
+                review = Review.objects.create(
+                    session=session,
+                    skill_id=session.skill_id,
+                    reviewer=reviewer,
+                    reviewee_id=session.provider_id,
+                    rating=rating,
+                    comment=comment,
+                )
+        except IntegrityError:
+            raise ReviewError("This session has already been reviewed")
+
+        MemberFeatures.objects.bulk_create(
+            [MemberFeatures(member_id=session.provider_id)], ignore_conflicts=True
+        )
+        # Every right-hand side reads the row as it was before the UPDATE.
+        MemberFeatures.objects.filter(member_id=session.provider_id).update(
+            review_count=F("review_count") + 1,
+            rating_sum=F("rating_sum") + rating,
+            avg_rating=_bayesian(F("rating_sum") + rating, F("review_count") + 1),
+            decayed_rating_sum=F("decayed_rating_sum") + rating * weight,
+            decayed_rating_weight=F("decayed_rating_weight") + weight,
+            trust_score=_trust(
+                F("decayed_rating_sum") + rating * weight,
+                F("decayed_rating_weight") + weight,
+                weight,
+            ),
+            updated_at=timezone.now(),
+        )
+        Skill.objects.filter(skill_id=session.skill_id).update(
+            review_count=F("review_count") + 1,
+            rating_sum=F("rating_sum") + rating,
+            rating=_bayesian(F("rating_sum") + rating, F("review_count") + 1),
+        )
+        # update() skips post_save, which is what normally bumps the catalog.
+        transaction.on_commit(bump_catalog_version)
+
+    return review
+
+
+# 2. Decay
+def refresh_trust_scores():
+    """Re-evaluate every trust score at the current time.
+
+    A score is exact when written, and later only drifts toward the prior
+    as its reviews age. Running this now and then keeps rankings fresh;
+    it is one UPDATE over the reviewed members.
+    """
+    return MemberFeatures.objects.filter(review_count__gt=0).update(
+        trust_score=_trust(
+            F("decayed_rating_sum"), F("decayed_rating_weight"), decay_weight()
+        )
+    )
@@ -0,0 +1,57 @@
+from contextvars import ContextVar
+from functools import wraps
+from inspect import iscoroutinefunction
+
+from django.db import connections
+
+REPLICA = "replica"
+
+# Set for the duration of a view wrapped in read_only(). A ContextVar rather
+# than a thread-local so async views running on one thread stay separate.
+_reading_from_replica = ContextVar("reading_from_replica", default=False)
+
+
+def replica_configured():
+    return REPLICA in connections.settings
+
+
+def read_only(view):
+    """Route the ORM reads of ``view`` to the replica connection.
+
+    Only for views that never write and can tolerate reading a replica that
+    trails the primary. Without a configured replica this does nothing.
+    """
+    if iscoroutinefunction(view):
+        @wraps(view)
+        async def wrapper(*args, **kwargs):
+            token = _reading_from_replica.set(True)
+            try:
+                return await view(*args, **kwargs)
+            finally:
+                _reading_from_replica.reset(token)
+    else:
+        @wraps(view)
+        def wrapper(*args, **kwargs):
+            token = _reading_from_replica.set(True)
+            try:
+                return view(*args, **kwargs)
+            finally:
+                _reading_from_replica.reset(token)
+    return wrapper
+
+
+class ReadReplicaRouter:
+    def db_for_read(self, model, **hints):
+        if _reading_from_replica.get() and replica_configured():
+            return REPLICA
+        return None
+
+    def db_for_write(self, model, **hints):
+        return "default"
+
+    def allow_relation(self, obj1, obj2, **hints):
+        # Both connections hold the same data.
+        return True
+
+    def allow_migrate(self, db, app_label, model_name=None, **hints):
+        return db != REPLICA
@@ -0,0 +1,258 @@
+import bisect
+from datetime import datetime, time, timedelta
+from itertools import accumulate
+
+from django.db import transaction
+from django.utils import timezone
+
+from .models import AvailabilityException, AvailabilityWindow, Member, ServiceSession
+
+# Sessions last whole hours and start on a grid of this many minutes,
+# counted from the start of the availability window they fall in.
+SLOT_MINUTES = 60
+MAX_SESSION_HOURS = 8
+# Widest range one slot search may cover.
+MAX_SEARCH_DAYS = 62
+
+# No session is longer than this, so one that overlaps a range must start
+# within it of the range's start; this bounds every busy-time query.
+MAX_SESSION = timedelta(hours=MAX_SESSION_HOURS)
+
+
+class SchedulingError(Exception):
+    pass
+
+
+class SchedulingConflict(SchedulingError):
+    pass
+
+
+# 1. Interval index
+class IntervalIndex:
+    """Sorted, read-only set of half-open ``[start, end)`` intervals.
+
+    Starts are kept sorted alongside a running maximum of ends, so an
+    overlap check or a jump to the next free moment is a bisect, whatever
+    the number of intervals.
+    """
+
+    def __init__(self, intervals=()):
+        intervals = sorted(intervals)
+        self.starts = [start for start, _ in intervals]
+        self.max_end = list(accumulate((end for _, end in intervals), max))
+
+    def __len__(self):
+        return len(self.starts)
+
+    def overlaps(self, start, end):
+        # Only intervals starting before ``end`` can overlap; of those, the
+        # one reaching furthest decides.
+        i = bisect.bisect_left(self.starts, end)
+        return i > 0 and self.max_end[i - 1] > start
+
+    def next_free(self, at):
+        """Return the earliest moment at or after ``at`` that is not busy."""
+        while True:
+            i = bisect.bisect_right(self.starts, at)
+            if i == 0 or self.max_end[i - 1] <= at:
+                return at
+            at = self.max_end[i - 1]
+
+    def next_start(self, at):
+        """Return the first interval start after ``at``, or None."""
+        i = bisect.bisect_right(self.starts, at)
+        return self.starts[i] if i < len(self.starts) else None
+
+
+def _merge(intervals):
+    merged = []
+    for start, end in sorted(intervals):
+        if merged and start <= merged[-1][1]:
+            merged[-1][1] = max(merged[-1][1], end)
+        else:
+            merged.append([start, end])
+    return [tuple(interval) for interval in merged]
+
+
+def _subtract(intervals, start, end):
+    result = []
+    for a, b in intervals:
+        if b <= start or a >= end:
+            result.append((a, b))
+            continue
+        if a < start:
+            result.append((a, start))
+        if b > end:
+            result.append((end, b))
+    return result
+
+
+# 2. Availability
+def _at(day, clock):
+    return timezone.make_aware(datetime.combine(day, clock))
+
+
+def _day_span(day, start_time, end_time):
+    start = _at(day, start_time or time.min)
+    end = _at(day, end_time) if end_time else _at(day + timedelta(days=1), time.min)
+    return start, end
+
+
+def availability_intervals(provider_id, start, end):
+    """Return the provider's open time in ``[start, end)``, merged and sorted.
+
+    Weekly windows are expanded day by day, then the day's exceptions
+    block time off or add extra hours. A provider with no weekly windows
+    has not set a calendar and counts as open all day.
+    """
+    windows = {}
+    for window in AvailabilityWindow.objects.filter(provider_id=provider_id):
+        windows.setdefault(window.weekday, []).append(window)
+    exceptions = {}
+    for exception in AvailabilityException.objects.filter(
+        provider_id=provider_id,
+        date__gte=timezone.localdate(start),
+        date__lte=timezone.localdate(end),
+    ):
+        exceptions.setdefault(exception.date, []).append(exception)
+
+    intervals = []
+    day = timezone.localdate(start)
+    while _at(day, time.min) < end:
+        if windows:
+            spans = [
+                _day_span(day, window.start_time, window.end_time)
+                for window in windows.get(day.weekday(), [])
+            ]
+        else:
+            spans = [_day_span(day, None, None)]
+        for exception in exceptions.get(day, []):
+            span = _day_span(day, exception.start_time, exception.end_time)
+            spans = spans + [span] if exception.available else _subtract(spans, *span)
+        intervals.extend(spans)
+        day += timedelta(days=1)
+
+    return [
+        (max(a, start), min(b, end)) for a, b in _merge(intervals) if b > start and a < end
+    ]
+
+
+def busy_index(member_id, start, end):
+    """Index the member's booked sessions, as provider or seeker, near a range.
+
+    Both queries are range scans on (provider|seeker, starts_at), so the
+    cost follows the sessions in the range, not the member's history.
+    """
+    sessions = ServiceSession.objects.filter(
+        starts_at__gte=start - MAX_SESSION, starts_at__lt=end
+    )
+    intervals = []
+    for role in ("provider_id", "seeker_id"):
+        intervals.extend(
+            sessions.filter(**{role: member_id}).values_list("starts_at", "ends_at")
+        )
+    return IntervalIndex(intervals)
+
+
+def set_availability(provider, windows, exceptions):
+    """Replace the provider's weekly windows and upcoming exceptions.
+
+    ``windows`` holds ``(weekday, start_time, end_time)`` and
+    ``exceptions`` holds ``(date, start_time, end_time, available)``, with
+    both times None for a whole day. Past exceptions are kept as history.
+    """
+    for weekday, start_time, end_time in windows:
+        if weekday not in range(7) or start_time >= end_time:
+            raise SchedulingError("Each window needs a weekday and a start before its end")
+    today = timezone.localdate()
+    for day, start_time, end_time, _ in exceptions:
+        if day < today:
+            raise SchedulingError("Exceptions must be today or later")
+        if (start_time is None) != (end_time is None) or (
+            start_time is not None and start_time >= end_time
+        ):
+            raise SchedulingError("Each exception needs a start before its end, or neither")
+
+    with transaction.atomic():
+        AvailabilityWindow.objects.filter(provider=provider).delete()
+        AvailabilityException.objects.filter(provider=provider, date__gte=today).delete()
+        AvailabilityWindow.objects.bulk_create(
+            AvailabilityWindow(
+                provider=provider, weekday=weekday, start_time=start_time, end_time=end_time
+            )
+            for weekday, start_time, end_time in windows
+        )
+        AvailabilityException.objects.bulk_create(
+            AvailabilityException(
+                provider=provider,
+                date=day,
+                start_time=start_time,
+                end_time=end_time,
+                available=available,
+            )
+            for day, start_time, end_time, available in exceptions
+        )
+
+
+# 3. Slot search
+def find_free_slots(provider_id, start, end, hours=1, limit=50):
+    """Return up to ``limit`` ``(starts_at, ends_at)`` slots the provider can take."""
+    length = timedelta(hours=hours)
+    step = timedelta(minutes=SLOT_MINUTES)
+    now = timezone.now()
+    busy = busy_index(provider_id, max(start, now), end)
+
+    def align(anchor, at):
+        return anchor - ((anchor - at) // step) * step
+
+    slots = []
+    for open_start, open_end in availability_intervals(provider_id, start, end):
+        # The grid is anchored on the window, so a 9:30 window offers 9:30.
+        anchor = open_start
+        cursor = align(anchor, max(open_start, now))
+        while cursor + length <= open_end and len(slots) < limit:
+            if not busy.overlaps(cursor, cursor + length):
+                slots.append((cursor, cursor + length))
+                cursor += step
+                continue
+            # Jump past whatever is in the way instead of stepping through it.
+            free = busy.next_free(cursor)
+            if free == cursor:
+                # Free now, but a session starts before the slot would end.
+                free = busy.next_free(busy.next_start(cursor))
+            cursor = align(anchor, free)
+        if len(slots) >= limit:
+            break
+    return slots
+
+
+# 4. Booking
+def ensure_bookable(provider_id, seeker_id, starts_at, hours):
+    """Raise unless the slot is open for the provider and free for both.
+
+    Call inside the transaction that saves the session. The member rows
+    are locked so two bookings for the same people run one after the
+    other; on SQLite the write lock already does this.
+    """
+    if not 1 <= hours <= MAX_SESSION_HOURS:
+        raise SchedulingError(f"Sessions last 1 to {MAX_SESSION_HOURS} hours")
+    if starts_at <= timezone.now():
+        raise SchedulingError("Pick a time in the future")
+    ends_at = starts_at + timedelta(hours=hours)
+
+    list(
+        Member.objects.select_for_update()
+        .filter(member_id__in=[provider_id, seeker_id])
+        .values_list("member_id", flat=True)
+    )
+
+    if not any(
+        a <= starts_at and ends_at <= b
+        for a, b in availability_intervals(provider_id, starts_at, ends_at)
+    ):
+        raise SchedulingError("The provider is not available at that time")
+    for member_id in (provider_id, seeker_id):
+        if busy_index(member_id, starts_at, ends_at).overlaps(starts_at, ends_at):
+            raise SchedulingConflict("That time overlaps another session")
+    return ends_at
+
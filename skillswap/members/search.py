@@ -0,0 +1,184 @@
+import re
+from functools import reduce
+from operator import or_
+
+from django.db import connection, connections, router
+from django.db.models import Q
+from django.db.models.expressions import RawSQL
+
+from .models import Skill
+
+FTS_TABLE = "members_skill_fts"
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Column weights for bm25(): a hit in the name counts most, then category.
+BM25_WEIGHTS = (10.0, 1.0, 4.0)
+
+INSTALL_SQL = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        skill_name, description, category,
+        content='members_skill', content_rowid='skill_id',
+        tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON members_skill BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, skill_name, description, category)
+        VALUES (new.skill_id, new.skill_name, new.description, new.category);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON members_skill BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, skill_name, description, category)
+        VALUES ('delete', old.skill_id, old.skill_name, old.description, old.category);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE ON members_skill BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, skill_name, description, category)
+        VALUES ('delete', old.skill_id, old.skill_name, old.description, old.category);
+        INSERT INTO {FTS_TABLE}(rowid, skill_name, description, category)
+        VALUES (new.skill_id, new.skill_name, new.description, new.category);
+    END
+    """,
+]
+
+UNINSTALL_SQL = [
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ai",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_ad",
+    f"DROP TRIGGER IF EXISTS {FTS_TABLE}_au",
+    f"DROP TABLE IF EXISTS {FTS_TABLE}",
+]
+
+
+def tokenize(text):
+    return [token for token in TOKEN_RE.findall((text or "").lower()) if len(token) > 1]
+
+
+def fts_available(using=None):
+    return (using or connection).vendor == "sqlite"
+
+
+def install_skill_search_index(using=None):
+    """Create the FTS5 table and its sync triggers, rebuilding when needed.
+
+    Safe to run repeatedly. SQLite drops a table's triggers whenever a
+    migration rebuilds ``members_skill``, so this also runs after every
+    ``migrate`` and reindexes if any trigger had gone missing.
+    """
+    conn = using or connection
+    if not fts_available(conn):
+        return False
+
+    with conn.cursor() as cursor:
+        cursor.execute(
+            "SELECT count(*) FROM sqlite_master WHERE type = 'trigger' AND name LIKE %s",
+            [f"{FTS_TABLE}_a_"],
+        )
+        complete = cursor.fetchone()[0] == 3
+        for statement in INSTALL_SQL:
+            cursor.execute(statement)
+        if not complete:
+            cursor.execute(f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')")
+    return not complete
+
+
+def uninstall_skill_search_index(using=None):
+    conn = using or connection
+    if not fts_available(conn):
+        return
+    with conn.cursor() as cursor:
+        for statement in UNINSTALL_SQL:
+            cursor.execute(statement)
+
+
+def build_match_expression(query, any_token=False):
+    # Every token (or with any_token, at least one) must match, each as a
+    # prefix ("gui" finds "guitar"). tokenize() only yields word
+    # characters, so no FTS syntax leaks in.
+    joiner = " OR " if any_token else " "
+    return joiner.join(f'"{token}"*' for token in tokenize(query))
+
+
+def skill_match_filter(query, limit=None):
+    """Return a Q keeping skills that match any token of ``query``, or None.
+
+    On SQLite this is a rowid subquery on the FTS index; ``limit`` keeps
+    only that many best BM25 matches. Elsewhere it is a LIKE scan.
+    """
+    match = build_match_expression(query, any_token=True)
+    if not match:
+        return None
+
+    if not fts_available():
+        return reduce(
+            or_,
+            (
+                Q(skill_name__icontains=token)
+                | Q(category__iexact=token)
+                | Q(description__icontains=token)
+                for token in tokenize(query)
+            ),
+        )
+
+    sql = f"SELECT rowid FROM {FTS_TABLE} WHERE {FTS_TABLE} MATCH %s"
+    params = [match]
+    if limit is not None:
+        weights = ", ".join(str(weight) for weight in BM25_WEIGHTS)
+        sql += f" ORDER BY bm25({FTS_TABLE}, {weights}) LIMIT %s"
+        params.append(limit)
+    return Q(skill_id__in=RawSQL(sql, params))
+
+
+def search_skills(query, category=None, limit=20, offset=0):
+    """Return ``(skills, total)`` for ``query``, best BM25 match first."""
+    match = build_match_expression(query)
+    if not match:
+        return [], 0
+
+    if not fts_available():
+        return _search_skills_fallback(query, category, limit, offset)
+
+    # Raw SQL skips the router, so pick the read connection explicitly.
+    conn = connections[router.db_for_read(Skill)]
+
+    where = f"{FTS_TABLE} MATCH %s"
+    params = [match]
+    if category:
+        where += " AND s.category = %s"
+        params.append(category)
+
+    from_clause = (
+        f"FROM {FTS_TABLE} JOIN members_skill s ON s.skill_id = {FTS_TABLE}.rowid "
+        f"WHERE {where}"
+    )
+    weights = ", ".join(str(weight) for weight in BM25_WEIGHTS)
+
+    with conn.cursor() as cursor:
+        cursor.execute(f"SELECT count(*) {from_clause}", params)
+        total = cursor.fetchone()[0]
+        cursor.execute(
+            f"SELECT s.skill_id {from_clause} "
+            f"ORDER BY bm25({FTS_TABLE}, {weights}), s.skill_id LIMIT %s OFFSET %s",
+            params + [limit, offset],
+        )
+        ids = [row[0] for row in cursor.fetchall()]
+
+    skills = Skill.objects.select_related("member").in_bulk(ids)
+    return [skills[skill_id] for skill_id in ids if skill_id in skills], total
+
+
+def _search_skills_fallback(query, category, limit, offset):
+    skills = Skill.objects.select_related("member")
+    for token in tokenize(query):
+        skills = skills.filter(
+            Q(skill_name__icontains=token)
+            | Q(description__icontains=token)
+            | Q(category__icontains=token)
+        )
+    if category:
+        skills = skills.filter(category=category)
+    skills = skills.order_by("skill_name", "skill_id")
+    return list(skills[offset:offset + limit]), skills.count()
@@ -0,0 +1,65 @@
+from django.contrib.auth import get_user_model
+from django.db import connections
+from django.db.backends.signals import connection_created
+from django.db.models.signals import post_delete, post_migrate, post_save
+from django.dispatch import receiver
+
+from .catalog import bump_catalog_version
+from .identity import invalidate_member_for_user
+from .metrics import install_query_recorder
+from .models import CreditWallet, Member, ServiceSession, Skill, SkillRequest
+from .search import FTS_TABLE, fts_available, install_skill_search_index
+from .stats import invalidate_member_stats
+
+
+# The catalog embeds member names and emails, so member edits invalidate it
+# as well as skill changes.
+@receiver([post_save, post_delete], sender=Skill)
+@receiver([post_save, post_delete], sender=Member)
+def invalidate_skill_catalog(sender, **kwargs):
+    bump_catalog_version()
+
+
+@receiver([post_save, post_delete], sender=Member)
+def invalidate_cached_member(sender, instance, **kwargs):
+    invalidate_member_for_user(instance.user_id)
+
+
+# An email change re-keys the legacy email match, so drop the cached member.
+@receiver([post_save, post_delete], sender=get_user_model())
+def invalidate_user_member(sender, instance, **kwargs):
+    invalidate_member_for_user(instance.pk)
+
+
+@receiver([post_save, post_delete], sender=Skill)
+@receiver([post_save, post_delete], sender=CreditWallet)
+def invalidate_owner_stats(sender, instance, **kwargs):
+    invalidate_member_stats(instance.member_id)
+
+
+@receiver([post_save, post_delete], sender=SkillRequest)
+def invalidate_request_stats(sender, instance, **kwargs):
+    invalidate_member_stats(instance.requester_id, instance.provider_id)
+
+
+@receiver([post_save, post_delete], sender=ServiceSession)
+def invalidate_session_stats(sender, instance, **kwargs):
+    invalidate_member_stats(instance.seeker_id, instance.provider_id)
+
+
+# SQLite drops triggers when a migration rebuilds members_skill; put the
+# full-text index triggers back (and reindex) after every migrate.
+@receiver(post_migrate)
+def repair_skill_search_index(sender, using, **kwargs):
+    connection = connections[using]
+    if sender.name != "members" or not fts_available(connection):
+        return
+    # Only repair an index a migration installed; never recreate one that
+    # was migrated away.
+    if FTS_TABLE in connection.introspection.table_names():
+        install_skill_search_index(connection)
+
+
+@receiver(connection_created)
+def record_connection_queries(sender, connection, **kwargs):
+    install_query_recorder(connection)
@@ -0,0 +1,79 @@
+from django.core.cache import cache
+from django.db.models import Count, Q, Sum
+
+from .models import Member, ServiceSession, SkillRequest
+
+MEMBER_STATS_KEY = "member-stats:{member_id}"
+MEMBER_STATS_TIMEOUT = 60 * 5
+
+EMPTY_STATS = {
+    "pending_requests_count": 0,
+    "offers_count": 0,
+    "total_requests_count": 0,
+    "completed_sessions_count": 0,
+    "pending_sessions_count": 0,
+    "pending_credits": 0,
+    "wallet_credits": 0,
+}
+
+
+def _compute_member_stats(member):
+    requests = SkillRequest.objects.filter(
+        Q(requester=member) | Q(provider=member)
+    ).aggregate(
+        total=Count("request_id"),
+        pending_incoming=Count(
+            "request_id", filter=Q(provider=member, status="pending")
+        ),
+    )
+
+    sessions = ServiceSession.objects.filter(
+        Q(seeker=member) | Q(provider=member)
+    ).aggregate(
+        completed=Count("session_id", filter=Q(status="completed")),
+        pending_provided=Count(
+            "session_id", filter=Q(provider=member, status="pending")
+        ),
+        pending_hours=Sum("hours", filter=Q(seeker=member, status="pending")),
+    )
+
+    wallet_credits, offers = (
+        Member.objects.filter(pk=member.pk)
+        .annotate(offers=Count("skill"))
+        .values_list("creditwallet__credits", "offers")
+        .first()
+    ) or (0, 0)
+
+    return {
+        "pending_requests_count": requests["pending_incoming"],
+        "offers_count": offers,
+        "total_requests_count": requests["total"],
+        "completed_sessions_count": sessions["completed"],
+        "pending_sessions_count": sessions["pending_provided"],
+        "pending_credits": sessions["pending_hours"] or 0,
+        "wallet_credits": wallet_credits or 0,
+    }
+
+
+def get_member_stats(member, fresh=False):
+    # Credit checks pass fresh=True: another worker may have changed the
+    # wallet after this process cached it.
+    if not member:
+        return dict(EMPTY_STATS)
+
+    key = MEMBER_STATS_KEY.format(member_id=member.member_id)
+    stats = None if fresh else cache.get(key)
+    if stats is None:
+        stats = _compute_member_stats(member)
+        cache.set(key, stats, MEMBER_STATS_TIMEOUT)
+    return stats
+
+
+def invalidate_member_stats(*member_ids):
+    cache.delete_many(
+        [
+            MEMBER_STATS_KEY.format(member_id=member_id)
+            for member_id in set(member_ids)
+            if member_id
+        ]
+    )
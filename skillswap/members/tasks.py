@@ -0,0 +1,29 @@
+# Job handlers, registered when the app loads (see MembersConfig.ready) so
+# both the web process and `manage.py run_jobs` know them by name. Every
+# handler may run more than once and must be safe to repeat.
+import logging
+
+from .jobs import job_handler
+from .ledger import unreconciled_wallets
+from .matchmaking import refresh_member_features
+
+logger = logging.getLogger(__name__)
+
+
+@job_handler("refresh_member_features")
+def refresh_features(member_ids):
+    refresh_member_features(member_ids)
+
+
+@job_handler("reconcile_wallets")
+def reconcile_wallets(member_ids):
+    # A mismatch is a bug to look at, not a transient failure, so it is
+    # reported rather than retried.
+    for wallet in unreconciled_wallets().filter(member_id__in=member_ids):
+        logger.error(
+            "Wallet %s (member %s) balance %s does not match ledger %s",
+            wallet.wallet_id,
+            wallet.member_id,
+            wallet.credits,
+            wallet.ledger_balance,
+        )
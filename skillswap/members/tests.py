@@ -1,3 +1,2044 @@
-from django.test import TestCase
+import asyncio
+import gzip
+import json
+import os
+import shutil
+import subprocess
+import tempfile
+from io import StringIO
+from pathlib import Path
+import threading
+from datetime import datetime, time, timedelta
+from decimal import Decimal
+from unittest import mock, skipUnless
+
+from asgiref.sync import sync_to_async
+from django.apps import apps
+from django.conf import settings
+from django.contrib.auth.models import User
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.cache import cache
+from django.core.exceptions import ImproperlyConfigured
+from django.core.management import CommandError, call_command
+from django.db import connection
+from django.http import HttpResponse
+from django.test.utils import CaptureQueriesContext
+from django.test import AsyncRequestFactory, RequestFactory, TestCase, override_settings
 
 # Create your tests here.
+from django.urls import reverse
+from django.utils import timezone
+
+from . import async_views, views
+from .admin import EstimatedCountPaginator
+from .assets import StaticFilesMiddleware
+from .benchmarks import (
+    drop_hot_indexes,
+    explain_plan,
+    hot_queries,
+    match_queries,
+    measure_matchmaking,
+    measure_queries,
+    seed_dataset,
+    seed_listings,
+)
+from .catalog import catalog_version, get_catalog_snapshot
+from .events import EventHub, format_sse
+from .geo import skills_within_radius
+from .stats import get_member_stats
+from .metrics import QueryMetricsMiddleware, QueryRecorder, fingerprint, registry
+from .identity import get_member_for_user
+from .jobs import LEASE_SECONDS, claim_next, enqueue, job_handler, run_pending
+from .inbox import mark_read, open_conversation, post_message, rebuild_summaries
+from .loadtest import ENDPOINTS, compare_to_baseline, generate_dataset, run_load_test
+from .ledger import InsufficientCredits, open_wallet, settle_session, unreconciled_wallets
+from .matchmaking import rank_providers, refresh_member_features
+from .responses import dumps
+from .reviews import (
+    PRIOR_RATING,
+    PRIOR_WEIGHT,
+    ReviewError,
+    decay_weight,
+    refresh_trust_scores,
+    submit_review,
+)
+from .routers import REPLICA, ReadReplicaRouter, read_only
+from .scheduling import IntervalIndex, busy_index, find_free_slots
+from .search import FTS_TABLE, install_skill_search_index, search_skills
+from .models import (
+    AvailabilityException,
+    AvailabilityWindow,
+    ConversationSummary,
+    CreditTransaction,
+    CreditWallet,
+    Job,
+    Member,
+    MemberFeatures,
+    Message,
+    Review,
+    ServiceSession,
+    Skill,
+    SkillRequest,
+)
+from .views import _build_conversations_payload, _build_requests_payload
+
+
+class MemberResolutionTests(TestCase):
+    def setUp(self):
+        self.user = User.objects.create_user(
+            username="asha@example.com", email="asha@example.com"
+        )
+
+    def test_legacy_member_is_linked_once_then_served_from_cache(self):
+        member = Member.objects.create(
+            full_name="Asha", email="asha@example.com", location="Delhi"
+        )
+
+        self.assertEqual(get_member_for_user(self.user), member)
+        member.refresh_from_db()
+        self.assertEqual(member.user_id, self.user.pk)
+
+        with self.assertNumQueries(0):
+            self.assertEqual(get_member_for_user(self.user), member)
+
+    def test_member_edits_invalidate_the_cached_member(self):
+        member = Member.objects.create(
+            full_name="Asha", email="asha@example.com", location="Delhi", user=self.user
+        )
+        get_member_for_user(self.user)
+
+        member.location = "Pune"
+        member.save()
+
+        self.assertEqual(get_member_for_user(self.user).location, "Pune")
+
+    def test_unknown_user_gets_a_linked_member(self):
+        member = get_member_for_user(self.user)
+
+        self.assertEqual(member.email, "asha@example.com")
+        self.assertEqual(Member.objects.get(user=self.user), member)
+
+
+class SkillsNearbyTests(TestCase):
+    def setUp(self):
+        self.member = Member.objects.create(
+            full_name="Asha", email="asha@example.com", location="Delhi"
+        )
+
+    def add_skill(self, name, lat, lng):
+        return Skill.objects.create(
+            member=self.member,
+            skill_name=name,
+            description="",
+            latitude=lat,
+            longitude=lng,
+        )
+
+    def test_save_assigns_grid_buckets(self):
+        skill = self.add_skill("Guitar", 28.6139, 77.209)
+        self.assertEqual((skill.lat_bucket, skill.lng_bucket), (286, 772))
+
+        skill.latitude = None
+        skill.save()
+        self.assertIsNone(skill.lat_bucket)
+
+    def test_non_finite_coordinates_get_no_grid_buckets(self):
+        skill = self.add_skill("Guitar", float("nan"), 77.209)
+        self.assertEqual((skill.lat_bucket, skill.lng_bucket), (None, None))
+
+    def test_add_skill_rejects_non_finite_coordinates(self):
+        user = User.objects.create_user(
+            username=self.member.email, email=self.member.email, password="pw"
+        )
+        self.client.force_login(user)
+
+        for lat, lng in (("nan", "77.2"), ("28.6", "inf"), ("-inf", "-inf")):
+            with self.subTest(lat=lat, lng=lng):
+                response = self.client.post(
+                    reverse("add_skill"),
+                    {"skill_name": "Guitar", "description": "", "latitude": lat, "longitude": lng},
+                )
+                self.assertEqual(response.status_code, 400)
+        self.assertFalse(Skill.objects.exists())
+
+    def test_returns_nearby_skills_sorted_by_distance(self):
+        far = self.add_skill("Far", 28.70, 77.209)
+        near = self.add_skill("Near", 28.62, 77.209)
+        self.add_skill("Mumbai", 19.07, 72.87)
+        self.add_skill("Nowhere", None, None)
+
+        response = self.client.get(
+            reverse("skills_nearby"), {"lat": 28.6139, "lng": 77.209, "radius": 15}
+        )
+
+        data = response.json()
+        self.assertEqual([s["id"] for s in data["results"]], [near.skill_id, far.skill_id])
+        self.assertEqual(data["count"], 2)
+        self.assertLess(data["results"][0]["distance_km"], 1)
+
+    def test_paginates_results(self):
+        for i in range(5):
+            self.add_skill(f"Skill {i}", 28.6139 + i * 0.001, 77.209)
+
+        response = self.client.get(
+            reverse("skills_nearby"),
+            {"lat": 28.6139, "lng": 77.209, "radius": 5, "page": 2, "page_size": 2},
+        )
+
+        data = response.json()
+        self.assertEqual([s["skill_name"] for s in data["results"]], ["Skill 2", "Skill 3"])
+        self.assertTrue(data["has_next"])
+
+    def test_loads_only_the_requested_page(self):
+        skills = [
+            self.add_skill(f"Skill {i}", 28.6139 + i * 0.001, 77.209) for i in range(5)
+        ]
+
+        with self.assertNumQueries(2):
+            page, count = skills_within_radius(
+                Skill.objects.select_related("member"), 28.6139, 77.209, 5,
+                offset=2, limit=2,
+            )
+            self.assertEqual([skill.member for skill, _ in page], [self.member] * 2)
+
+        self.assertEqual([skill for skill, _ in page], skills[2:4])
+        self.assertEqual(count, 5)
+
+    def test_search_across_antimeridian(self):
+        east = self.add_skill("East", -17.0, 179.99)
+        west = self.add_skill("West", -17.0, -179.99)
+
+        response = self.client.get(
+            reverse("skills_nearby"), {"lat": -17.0, "lng": 179.995, "radius": 10}
+        )
+
+        ids = {s["id"] for s in response.json()["results"]}
+        self.assertEqual(ids, {east.skill_id, west.skill_id})
+
+    def test_rejects_non_finite_coordinates_and_radius(self):
+        for params in (
+            {"lat": 1, "lng": 1, "radius": "nan"},
+            {"lat": 1, "lng": 1, "radius": "inf"},
+            {"lat": "nan", "lng": 1},
+            {"lat": 1, "lng": "-inf"},
+        ):
+            for name in ("skills_nearby", "match_providers"):
+                with self.subTest(name=name, params=params):
+                    response = self.client.get(reverse(name), params)
+                    self.assertEqual(response.status_code, 400)
+
+    def test_rejects_missing_coordinates(self):
+        response = self.client.get(reverse("skills_nearby"), {"radius": 5})
+        self.assertEqual(response.status_code, 400)
+
+
+class PayloadQueryCountTests(TestCase):
+    def setUp(self):
+        self.provider = Member.objects.create(
+            full_name="Provider", email="provider@example.com", location="Delhi"
+        )
+        self.skill = Skill.objects.create(
+            member=self.provider, skill_name="Guitar", description=""
+        )
+
+    def add_requests(self, count, with_sessions=True):
+        created = []
+        for _ in range(count):
+            n = Member.objects.count()
+            seeker = Member.objects.create(
+                full_name=f"Seeker {n}", email=f"seeker{n}@example.com", location="Delhi"
+            )
+            req = SkillRequest.objects.create(
+                skill=self.skill, requester=seeker, provider=self.provider, note="hi"
+            )
+            post_message(req, seeker, "hello")
+            if with_sessions:
+                ServiceSession.objects.create(
+                    request=req,
+                    skill=self.skill,
+                    seeker=seeker,
+                    provider=self.provider,
+                    hours=1,
+                    status="pending",
+                )
+            created.append(req)
+        return created
+
+    def test_requests_payload_query_count_is_constant(self):
+        self.add_requests(2)
+        with self.assertNumQueries(2):
+            _build_requests_payload(self.provider)
+
+        self.add_requests(10)
+        with self.assertNumQueries(2):
+            payload = _build_requests_payload(self.provider)
+        self.assertEqual(len(payload), 12)
+
+    def test_conversations_payload_query_count_is_constant(self):
+        self.add_requests(2)
+        with self.assertNumQueries(1):
+            _build_conversations_payload(self.provider)
+
+        self.add_requests(10)
+        with self.assertNumQueries(1):
+            conversations, messages = _build_conversations_payload(self.provider)
+        self.assertEqual(len(conversations), 12)
+        self.assertEqual(messages, {})
+        self.assertEqual({c["lastMessage"] for c in conversations}, {"hello"})
+
+    def test_conversations_carry_their_own_session(self):
+        with_session = self.add_requests(1)[0]
+        without_session = self.add_requests(1, with_sessions=False)[0]
+
+        conversations, _ = _build_conversations_payload(self.provider)
+
+        by_id = {c["id"]: c for c in conversations}
+        self.assertEqual(
+            by_id[with_session.request_id]["session_id"],
+            with_session.servicesession.session_id,
+        )
+        self.assertTrue(by_id[with_session.request_id]["can_complete"])
+        self.assertIsNone(by_id[without_session.request_id]["session_id"])
+        self.assertFalse(by_id[without_session.request_id]["can_complete"])
+
+
+class ConversationHistoryTests(TestCase):
+    def setUp(self):
+        self.provider = Member.objects.create(
+            full_name="Provider", email="provider@example.com", location="Delhi"
+        )
+        self.seeker = Member.objects.create(
+            full_name="Seeker", email="seeker@example.com", location="Delhi"
+        )
+        skill = Skill.objects.create(
+            member=self.provider, skill_name="Guitar", description=""
+        )
+        self.req = SkillRequest.objects.create(
+            skill=skill, requester=self.seeker, provider=self.provider, note="hi"
+        )
+        self.url = reverse("conversation_messages", args=[self.req.request_id])
+        self.login(self.seeker)
+
+    def login(self, member):
+        user = User.objects.create_user(
+            username=member.email, email=member.email, password="pw"
+        )
+        self.client.force_login(user)
+
+    def add_messages(self, count):
+        Message.objects.bulk_create([
+            Message(request=self.req, sender=self.seeker, text=f"m{i}")
+            for i in range(count)
+        ])
+        # Identical timestamps force the message_id tie-break.
+        Message.objects.update(created_at=timezone.now())
+
+    def test_pages_backwards_without_gaps_or_duplicates(self):
+        self.add_messages(7)
+
+        texts, params = [], {"limit": 3}
+        while True:
+            data = self.client.get(self.url, params).json()
+            texts = [m["text"] for m in data["messages"]] + texts
+            if not data["has_more"]:
+                break
+            params = {
+                "limit": 3,
+                "before_at": data["before_at"],
+                "before_id": data["before_id"],
+            }
+
+        self.assertEqual(texts, [f"m{i}" for i in range(7)])
+
+    def test_empty_conversation_shows_the_request_note(self):
+        data = self.client.get(self.url).json()
+        self.assertEqual([m["text"] for m in data["messages"]], ["hi"])
+        self.assertFalse(data["has_more"])
+
+    def test_outsiders_cannot_read_history(self):
+        outsider = Member.objects.create(
+            full_name="Outsider", email="outsider@example.com", location="Delhi"
+        )
+        self.login(outsider)
+        self.assertEqual(self.client.get(self.url).status_code, 403)
+
+
+class ConversationSummaryTests(TestCase):
+    def setUp(self):
+        self.provider = Member.objects.create(
+            full_name="Provider", email="provider@example.com", location="Delhi"
+        )
+        self.seeker = Member.objects.create(
+            full_name="Seeker", email="seeker@example.com", location="Delhi"
+        )
+        self.skill = Skill.objects.create(
+            member=self.provider, skill_name="Guitar", description=""
+        )
+        self.req = SkillRequest.objects.create(
+            skill=self.skill, requester=self.seeker, provider=self.provider
+        )
+        open_conversation(self.req)
+
+    def summary(self):
+        return ConversationSummary.objects.get(request=self.req)
+
+    def test_messages_update_preview_and_recipient_unread(self):
+        post_message(self.req, self.seeker, "hello")
+        post_message(self.req, self.seeker, "anyone there?")
+        post_message(self.req, self.provider, "yes")
+
+        summary = self.summary()
+        self.assertEqual(summary.last_message_text, "yes")
+        self.assertEqual(summary.message_count, 3)
+        self.assertEqual(summary.provider_unread, 2)
+        self.assertEqual(summary.requester_unread, 1)
+
+        conversations, _ = _build_conversations_payload(self.provider)
+        self.assertEqual(conversations[0]["unread"], 2)
+        self.assertEqual(conversations[0]["lastMessage"], "yes")
+
+        self.assertEqual(mark_read(self.req, self.provider), 1)
+        self.assertEqual(self.summary().provider_unread, 0)
+        self.assertEqual(self.summary().requester_unread, 1)
+
+    def test_older_message_does_not_replace_newer_preview(self):
+        post_message(self.req, self.seeker, "newer")
+        ConversationSummary.objects.update(
+            last_message_at=timezone.now() + timedelta(minutes=5)
+        )
+
+        post_message(self.req, self.provider, "older")
+
+        summary = self.summary()
+        self.assertEqual(summary.last_message_text, "newer")
+        self.assertEqual(summary.message_count, 2)
+
+    def test_rebuild_matches_incremental_summary(self):
+        post_message(self.req, self.seeker, "one")
+        post_message(self.req, self.provider, "two")
+        before = self.summary()
+
+        ConversationSummary.objects.all().delete()
+        rebuild_summaries()
+
+        after = self.summary()
+        self.assertEqual(after.last_message_text, before.last_message_text)
+        self.assertEqual(after.last_message_at, before.last_message_at)
+        self.assertEqual(after.message_count, 2)
+
+    def test_inbox_is_ordered_by_latest_activity(self):
+        other = SkillRequest.objects.create(
+            skill=self.skill, requester=self.seeker, provider=self.provider
+        )
+        open_conversation(other)
+        post_message(self.req, self.seeker, "bump")
+
+        conversations, _ = _build_conversations_payload(self.provider)
+
+        self.assertEqual(
+            [c["id"] for c in conversations], [self.req.request_id, other.request_id]
+        )
+
+
+class SyncDeltaTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(
+            username="seeker@example.com", email="seeker@example.com", password="pw"
+        )
+        self.seeker = Member.objects.create(
+            full_name="Seeker", email=user.email, location="Delhi"
+        )
+        CreditWallet.objects.create(member=self.seeker, credits=10)
+        provider = Member.objects.create(
+            full_name="Provider", email="provider@example.com", location="Delhi"
+        )
+        skill = Skill.objects.create(member=provider, skill_name="Guitar", description="")
+        self.old = SkillRequest.objects.create(
+            skill=skill, requester=self.seeker, provider=provider
+        )
+        post_message(self.old, self.seeker, "old")
+        self.other = SkillRequest.objects.create(
+            skill=skill, requester=self.seeker, provider=provider
+        )
+        self.provider = provider
+
+        # Everything so far happened well before the cursor overlap window.
+        past = timezone.now() - timedelta(hours=1)
+        SkillRequest.objects.update(created_at=past, updated_at=past)
+        Message.objects.update(created_at=past)
+        ConversationSummary.objects.update(last_message_at=past)
+
+        self.client.force_login(user)
+
+    def sync(self, since=None):
+        params = {"since": since} if since else {}
+        return self.client.get(reverse("sync_data"), params).json()
+
+    def test_full_sync_returns_cursor(self):
+        data = self.sync()
+
+        self.assertFalse(data["delta"])
+        self.assertEqual(len(data["requests"]), 2)
+        self.assertIsNotNone(data["cursor"])
+
+    def test_idle_delta_is_empty_and_keeps_cursor(self):
+        cursor = self.sync()["cursor"]
+
+        data = self.sync(cursor)
+
+        self.assertTrue(data["delta"])
+        self.assertEqual(data["requests"], [])
+        self.assertEqual(data["conversations"], [])
+        self.assertEqual(data["messages"], {})
+        self.assertEqual(data["cursor"], cursor)
+
+    def test_delta_carries_only_new_messages_and_status_changes(self):
+        cursor = self.sync()["cursor"]
+        post_message(self.old, self.provider, "new")
+        self.other.status = "declined"
+        self.other.save()
+
+        data = self.sync(cursor)
+
+        self.assertEqual([r["id"] for r in data["requests"]], [self.other.request_id])
+        self.assertEqual(
+            {c["id"] for c in data["conversations"]},
+            {self.old.request_id, self.other.request_id},
+        )
+        self.assertEqual(
+            [m["text"] for m in data["messages"][str(self.old.request_id)]], ["new"]
+        )
+        self.assertGreater(data["cursor"], cursor)
+
+
+class EventHubTests(TestCase):
+    def test_publish_from_worker_thread_reaches_subscriber(self):
+        hub = EventHub()
+
+        async def scenario():
+            queue = hub.subscribe(7)
+            worker = threading.Thread(
+                target=hub.publish, args=([7, 8], "message", {"request_id": 1})
+            )
+            worker.start()
+            event = await asyncio.wait_for(queue.get(), 1)
+            worker.join()
+            hub.unsubscribe(7, queue)
+            return event
+
+        event = asyncio.run(scenario())
+
+        self.assertEqual(event, {"type": "message", "data": {"request_id": 1}})
+        self.assertEqual(hub.subscriber_count(7), 0)
+        self.assertEqual(
+            format_sse(event), 'event: message\ndata: {"request_id": 1}\n\n'
+        )
+
+    def test_send_message_publishes_to_both_participants(self):
+        user = User.objects.create_user(
+            username="a@example.com", email="a@example.com", password="pw"
+        )
+        sender = Member.objects.create(full_name="A", email=user.email, location="x")
+        provider = Member.objects.create(full_name="B", email="b@example.com", location="x")
+        skill = Skill.objects.create(member=provider, skill_name="Guitar", description="")
+        req = SkillRequest.objects.create(skill=skill, requester=sender, provider=provider)
+        self.client.force_login(user)
+
+        with mock.patch("members.events.hub.publish") as publish:
+            with self.captureOnCommitCallbacks(execute=True):
+                self.client.post(
+                    reverse("send_message"),
+                    {"request_id": req.request_id, "text": "hi"},
+                )
+
+        member_ids, event_type, data = publish.call_args.args
+        self.assertEqual(set(member_ids), {sender.member_id, provider.member_id})
+        self.assertEqual(event_type, "message")
+        self.assertEqual(data["request_id"], req.request_id)
+
+    @override_settings(EVENT_STREAM_ENABLED=False)
+    def test_stream_is_refused_and_not_advertised_under_wsgi(self):
+        response = asyncio.run(views.event_stream(RequestFactory().get("/events/")))
+        self.assertEqual(response.status_code, 501)
+
+        user = User.objects.create_user(username="a@example.com", email="a@example.com")
+        Member.objects.create(full_name="A", email=user.email, location="x", user=user)
+        self.client.force_login(user)
+        page = self.client.get(reverse("index"))
+        self.assertContains(page, 'data-event-stream="false"')
+
+
+class SkillCatalogTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.member = Member.objects.create(
+            full_name="Asha", email="asha@example.com", location="Delhi"
+        )
+        self.skill = Skill.objects.create(
+            member=self.member, skill_name="Guitar", description=""
+        )
+
+    def test_snapshot_is_reused_until_catalog_changes(self):
+        first = get_catalog_snapshot()
+        with self.assertNumQueries(0):
+            self.assertEqual(get_catalog_snapshot(), first)
+
+        Skill.objects.create(member=self.member, skill_name="Yoga", description="")
+
+        second = get_catalog_snapshot()
+        self.assertGreater(second["version"], first["version"])
+        self.assertIn("Yoga", second["json"])
+
+    def test_member_rename_and_skill_delete_bump_version(self):
+        version = catalog_version()
+        self.member.full_name = "Asha K"
+        self.member.save()
+        self.assertGreater(catalog_version(), version)
+
+        version = catalog_version()
+        Skill.objects.filter(pk=self.skill.pk).delete()
+        self.assertGreater(catalog_version(), version)
+
+    def test_endpoint_answers_matching_etag_with_304(self):
+        response = self.client.get(reverse("skills_catalog"))
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.json()[0]["skill_name"], "Guitar")
+
+        cached = self.client.get(
+            reverse("skills_catalog"), HTTP_IF_NONE_MATCH=response["ETag"]
+        )
+        self.assertEqual(cached.status_code, 304)
+
+    def test_signed_out_shell_is_public_and_data_free(self):
+        response = self.client.get(reverse("index"))
+
+        self.assertNotContains(response, "skills-data")
+        self.assertNotIn("csrftoken", response.cookies)
+        self.assertIn("public", response["Cache-Control"])
+        self.assertIn("max-age=300", response["Cache-Control"])
+        cached = self.client.get(reverse("index"), HTTP_IF_NONE_MATCH=response["ETag"])
+        self.assertEqual(cached.status_code, 304)
+
+    def test_forms_post_with_the_cookie_token(self):
+        client = self.client_class(enforce_csrf_checks=True)
+        self.assertEqual(client.get(reverse("csrf_cookie")).status_code, 204)
+
+        response = client.post(
+            reverse("signup_user"),
+            {
+                "name": "Ravi",
+                "email": "ravi@example.com",
+                "password": "pw-12345",
+                "csrfmiddlewaretoken": client.cookies["csrftoken"].value,
+            },
+        )
+        self.assertEqual(response.status_code, 302)
+
+
+class PageBootstrapTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(username="asha@example.com", email="asha@example.com")
+        self.member = Member.objects.create(
+            full_name="Asha", email="asha@example.com", location="Delhi", user=user
+        )
+        other = Member.objects.create(
+            full_name="Ravi", email="ravi@example.com", location="Delhi"
+        )
+        skill = Skill.objects.create(member=other, skill_name="Guitar", description="")
+        self.request = SkillRequest.objects.create(
+            skill=skill, requester=self.member, provider=other
+        )
+        open_conversation(self.request)
+        post_message(self.request, self.member, "Hello there")
+        # Outside the cursor overlap window, so the cursor (and ETag) is stable.
+        hour_ago = timezone.now() - timedelta(hours=1)
+        SkillRequest.objects.update(updated_at=hour_ago)
+        ConversationSummary.objects.update(last_message_at=hour_ago)
+        self.client.force_login(user)
+
+    def test_member_shell_is_private_and_data_free(self):
+        response = self.client.get(reverse("index"))
+
+        self.assertContains(response, f'data-member-id="{self.member.member_id}"')
+        self.assertNotContains(response, "Hello there")
+        self.assertIn("private", response["Cache-Control"])
+
+    def test_slices_carry_their_data_and_a_cursor(self):
+        requests = self.client.get(reverse("member_requests"))
+        conversations = self.client.get(reverse("member_conversations")).json()
+
+        self.assertEqual(
+            [item["id"] for item in requests.json()["requests"]], [self.request.request_id]
+        )
+        self.assertEqual(conversations["conversations"][0]["lastMessage"], "Hello there")
+        self.assertIsNotNone(conversations["cursor"])
+        self.assertIn("private", requests["Cache-Control"])
+
+        cached = self.client.get(
+            reverse("member_requests"), HTTP_IF_NONE_MATCH=requests["ETag"]
+        )
+        self.assertEqual(cached.status_code, 304)
+
+    def test_slices_require_a_member(self):
+        self.client.logout()
+        self.assertEqual(self.client.get(reverse("member_requests")).status_code, 403)
+
+
+# Loads static/js/script.js in node against a stub DOM, runs a snippet and
+# prints the URLs it fetched. Catches errors the endpoint tests cannot,
+# such as references to names that no longer exist.
+JS_SMOKE_HARNESS = r"""
+const fs = require("fs");
+const vm = require("vm");
+const [scriptPath, memberId] = process.argv.slice(2);
+
+// Any DOM lookup returns another stub, so the script's top level runs.
+function stub() {
+  return new Proxy(function () {}, {
+    get(target, prop) {
+      if (prop === Symbol.toPrimitive) return () => "";
+      if (prop === Symbol.iterator) return function* () {};
+      if (prop === "then") return undefined;
+      if (prop === "length") return 0;
+      return stub();
+    },
+    apply: () => stub(),
+    construct: () => stub(),
+  });
+}
+
+const ready = [];
+const document = new Proxy(stub(), {
+  get(target, prop) {
+    if (prop !== "addEventListener") return target[prop];
+    return (type, listener) => type === "DOMContentLoaded" && ready.push(listener);
+  },
+});
+const body = new Proxy(stub(), {
+  get: (target, prop) => (prop === "dataset" ? { memberId, auth: "true" } : target[prop]),
+});
+const calls = [];
+const context = {
+  console,
+  document: new Proxy(document, {
+    get: (target, prop) => (prop === "body" ? body : target[prop]),
+  }),
+  window: stub(),
+  localStorage: stub(),
+  navigator: stub(),
+  location: stub(),
+  setInterval: () => 0,
+  clearInterval: () => {},
+  setTimeout: () => 0,
+  clearTimeout: () => {},
+  URLSearchParams,
+  fetch: (url) => {
+    calls.push(String(url));
+    return Promise.resolve({ ok: true, status: 200, json: () => Promise.resolve({}) });
+  },
+};
+context.window = new Proxy(context.window, {
+  get: (target, prop) => (prop in context ? context[prop] : target[prop]),
+});
+vm.createContext(context);
+vm.runInContext(fs.readFileSync(scriptPath, "utf8"), context, { filename: scriptPath });
+ready.forEach((listener) => listener());
+vm.runInContext(process.argv[4] || "", context);
+// Print once the fetch promise chains have settled.
+setImmediate(() => console.log(JSON.stringify(calls)));
+"""
+
+
+@skipUnless(shutil.which("node"), "node is not installed")
+class ScriptSmokeTests(TestCase):
+    def run_script(self, member_id, snippet=""):
+        harness = tempfile.NamedTemporaryFile("w", suffix=".js", delete=False)
+        with harness:
+            harness.write(JS_SMOKE_HARNESS)
+        self.addCleanup(os.unlink, harness.name)
+        script = Path(settings.BASE_DIR) / "static" / "js" / "script.js"
+        result = subprocess.run(
+            ["node", harness.name, str(script), member_id, snippet],
+            capture_output=True, text=True, timeout=30,
+        )
+        self.assertEqual(result.returncode, 0, result.stderr)
+        return json.loads(result.stdout.strip().splitlines()[-1])
+
+    def test_signed_out_page_loads_only_the_catalog(self):
+        fetched = self.run_script("")
+
+        self.assertIn("/api/skills/catalog/", fetched)
+        self.assertFalse([url for url in fetched if url.startswith("/api/me/")])
+
+    def test_signed_in_page_loads_its_slices(self):
+        fetched = self.run_script("7")
+
+        self.assertIn("/api/me/requests/", fetched)
+        self.assertIn("/api/me/conversations/", fetched)
+
+    def test_opening_a_conversation_marks_it_read_and_loads_history(self):
+        fetched = self.run_script(
+            "7", "markConversationRead({ id: 1, unread: 2 }); loadConversationHistory(1);"
+        )
+
+        self.assertIn("/api/conversations/1/read/", fetched)
+        self.assertIn("/api/conversations/1/messages/?limit=50", fetched)
+
+
+class MemberStatsTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.provider = Member.objects.create(
+            full_name="Provider", email="provider@example.com", location="Delhi"
+        )
+        self.seeker = Member.objects.create(
+            full_name="Seeker", email="seeker@example.com", location="Delhi"
+        )
+        CreditWallet.objects.create(member=self.seeker, credits=7)
+        self.skill = Skill.objects.create(
+            member=self.provider, skill_name="Guitar", description=""
+        )
+        self.request = SkillRequest.objects.create(
+            skill=self.skill, requester=self.seeker, provider=self.provider
+        )
+        ServiceSession.objects.create(
+            request=self.request,
+            skill=self.skill,
+            seeker=self.seeker,
+            provider=self.provider,
+            hours=2,
+            status="pending",
+        )
+
+    def test_stats_are_aggregated_and_cached(self):
+        with self.assertNumQueries(3):
+            stats = get_member_stats(self.seeker)
+        with self.assertNumQueries(0):
+            get_member_stats(self.seeker)
+
+        self.assertEqual(stats["total_requests_count"], 1)
+        self.assertEqual(stats["pending_credits"], 2)
+        self.assertEqual(stats["wallet_credits"], 7)
+        self.assertEqual(get_member_stats(self.provider)["pending_requests_count"], 1)
+        self.assertEqual(get_member_stats(self.provider)["pending_sessions_count"], 1)
+        self.assertEqual(get_member_stats(self.provider)["offers_count"], 1)
+
+    def test_writes_invalidate_both_participants(self):
+        get_member_stats(self.seeker)
+        get_member_stats(self.provider)
+
+        self.request.status = "accepted"
+        self.request.save()
+        wallet = self.seeker.creditwallet
+        wallet.credits = 3
+        wallet.save()
+
+        self.assertEqual(get_member_stats(self.provider)["pending_requests_count"], 0)
+        self.assertEqual(get_member_stats(self.seeker)["wallet_credits"], 3)
+
+
+class CreditLedgerTests(TestCase):
+    def setUp(self):
+        self.seeker = Member.objects.create(
+            full_name="Seeker", email="seeker@example.com", location="Delhi"
+        )
+        self.provider = Member.objects.create(
+            full_name="Provider", email="provider@example.com", location="Delhi"
+        )
+        open_wallet(self.seeker, credits=3)
+        open_wallet(self.provider)
+        skill = Skill.objects.create(member=self.provider, skill_name="Guitar", description="")
+        self.session = ServiceSession.objects.create(
+            skill=skill, seeker=self.seeker, provider=self.provider, hours=2, status="pending"
+        )
+
+    def balances(self):
+        return (
+            CreditWallet.objects.get(member=self.seeker).credits,
+            CreditWallet.objects.get(member=self.provider).credits,
+        )
+
+    def test_settles_once_and_records_ledger_entries(self):
+        self.assertTrue(settle_session(self.session))
+
+        stale_copy = ServiceSession.objects.get(pk=self.session.pk)
+        stale_copy.status = "pending"
+        self.assertFalse(settle_session(stale_copy))
+
+        self.assertEqual(self.balances(), (1, 2))
+        self.assertEqual(
+            sorted(self.session.transactions.values_list("amount", flat=True)), [-2, 2]
+        )
+        self.assertFalse(unreconciled_wallets().exists())
+
+    def test_insufficient_credits_rolls_back_the_claim(self):
+        self.session.hours = 5
+        self.session.save()
+
+        with self.assertRaises(InsufficientCredits):
+            settle_session(self.session)
+
+        self.session.refresh_from_db()
+        self.assertEqual(self.session.status, "pending")
+        self.assertEqual(self.balances(), (3, 0))
+        self.assertFalse(CreditTransaction.objects.filter(session=self.session).exists())
+
+    def test_ledger_rows_are_append_only(self):
+        entry = CreditTransaction.objects.get(kind="opening")
+        entry.amount = 100
+        with self.assertRaises(ValueError):
+            entry.save()
+
+    def test_reconcile_command_reports_drift(self):
+        call_command("reconcile_ledger", stdout=StringIO())
+
+        CreditWallet.objects.filter(member=self.provider).update(credits=9)
+
+        out = StringIO()
+        with self.assertRaises(CommandError):
+            call_command("reconcile_ledger", stdout=out)
+        self.assertIn("balance 9, ledger 0", out.getvalue())
+
+
+class BulkImportExportTests(TestCase):
+    def write_file(self, suffix, content):
+        handle = tempfile.NamedTemporaryFile(
+            "w", suffix=suffix, delete=False, encoding="utf-8"
+        )
+        with handle:
+            handle.write(content)
+        self.addCleanup(os.unlink, handle.name)
+        return handle.name
+
+    def test_import_members_creates_wallets_and_updates_existing(self):
+        Member.objects.create(full_name="Old", email="a@example.com", location="x")
+        path = self.write_file(
+            ".csv",
+            "full_name,email,location,credits\n"
+            "Asha,a@example.com,Delhi,\n"
+            "Ben,b@example.com,Pune,4\n"
+            "Cal,c@example.com,,\n",
+        )
+
+        call_command(
+            "import_data", "members", path, "--batch-size", "2",
+            "--default-credits", "1", stdout=StringIO(),
+        )
+
+        self.assertEqual(Member.objects.get(email="a@example.com").full_name, "Asha")
+        self.assertEqual(CreditWallet.objects.get(member__email="b@example.com").credits, 4)
+        self.assertEqual(CreditWallet.objects.get(member__email="c@example.com").credits, 1)
+        self.assertFalse(unreconciled_wallets().exists())
+
+    def test_skill_export_round_trips_through_import(self):
+        member = Member.objects.create(full_name="Asha", email="a@example.com", location="x")
+        Skill.objects.create(
+            member=member, skill_name="Guitar", description="Chords",
+            latitude=28.61, longitude=77.2,
+        )
+        path = self.write_file(".jsonl", "")
+
+        call_command("export_data", "skills", path)
+        with open(path, encoding="utf-8") as handle:
+            rows = [json.loads(line) for line in handle]
+        self.assertEqual(rows[0]["member_email"], "a@example.com")
+
+        Skill.objects.all().delete()
+        call_command("import_data", "skills", path, stdout=StringIO())
+
+        skill = Skill.objects.get()
+        self.assertEqual((skill.skill_name, skill.member_id), ("Guitar", member.member_id))
+        self.assertEqual(skill.lat_bucket, 286)
+
+    def test_malformed_line_stops_with_its_number_and_still_bumps_the_catalog(self):
+        member = Member.objects.create(full_name="Asha", email="a@example.com", location="x")
+        path = self.write_file(
+            ".jsonl",
+            '{"member_email": "a@example.com", "skill_name": "Guitar"}\n'
+            "\n"
+            '{"member_email": "a@example.com", "skill_name": \n',
+        )
+        version = catalog_version()
+
+        with self.assertRaisesMessage(CommandError, "line 3"):
+            call_command("import_data", "skills", path, "--batch-size", "1", stdout=StringIO())
+
+        self.assertEqual(Skill.objects.get().member_id, member.member_id)
+        self.assertNotEqual(catalog_version(), version)
+
+    def test_non_finite_coordinates_are_reported_with_their_line(self):
+        Member.objects.create(full_name="Asha", email="a@example.com", location="x")
+        for suffix, content, line in (
+            (
+                ".csv",
+                "member_email,skill_name,latitude,longitude\n"
+                "a@example.com,Guitar,28.61,77.2\n"
+                "a@example.com,Piano,nan,77.2\n",
+                "line 3",
+            ),
+            (
+                ".jsonl",
+                '{"member_email": "a@example.com", "skill_name": "Guitar"}\n'
+                '{"member_email": "a@example.com", "skill_name": "Piano", "longitude": Infinity}\n',
+                "line 2",
+            ),
+        ):
+            with self.subTest(suffix=suffix):
+                Skill.objects.all().delete()
+                path = self.write_file(suffix, content)
+
+                with self.assertRaisesMessage(CommandError, f"{line}: "):
+                    call_command(
+                        "import_data", "skills", path, "--batch-size", "1", stdout=StringIO()
+                    )
+
+                self.assertEqual(Skill.objects.get().skill_name, "Guitar")
+
+
+class MatchmakingTests(TestCase):
+    def setUp(self):
+        self.seeker = Member.objects.create(
+            full_name="Seeker", email="seeker@example.com", location="Delhi"
+        )
+
+    def provider_with_skill(self, name, skill_name, lat, lng, completed=0):
+        provider = Member.objects.create(
+            full_name=name, email=f"{name.lower()}@example.com", location="Delhi"
+        )
+        skill = Skill.objects.create(
+            member=provider, skill_name=skill_name, description="",
+            latitude=lat, longitude=lng,
+        )
+        for _ in range(completed):
+            ServiceSession.objects.create(
+                skill=skill, seeker=self.seeker, provider=provider,
+                hours=1, status="completed",
+            )
+        return skill
+
+    def test_refresh_computes_provider_features(self):
+        skill = self.provider_with_skill("Ana", "Guitar", 28.6, 77.2, completed=3)
+        SkillRequest.objects.create(
+            skill=skill, requester=self.seeker, provider=skill.member, status="accepted"
+        )
+        SkillRequest.objects.create(skill=skill, requester=self.seeker, provider=skill.member)
+
+        refresh_member_features([skill.member_id])
+
+        features = MemberFeatures.objects.get(member=skill.member)
+        self.assertEqual(features.completed_sessions, 3)
+        self.assertEqual(features.response_rate, 0.5)
+        self.assertEqual(features.review_count, 0)
+
+    def test_ranks_relevant_nearby_experienced_providers_first(self):
+        veteran = self.provider_with_skill("Vee", "Guitar lessons", 28.62, 77.2, completed=20)
+        rookie = self.provider_with_skill("Roo", "Guitar basics", 28.62, 77.2)
+        self.provider_with_skill("Far", "Guitar", 19.07, 72.87)
+        self.provider_with_skill("Yogi", "Yoga", 28.62, 77.2)
+        refresh_member_features()
+
+        matches = rank_providers("guitar", lat=28.6139, lng=77.209, radius_km=10, k=5)
+
+        self.assertEqual(
+            [skill.skill_id for _, _, skill, _ in matches],
+            [veteran.skill_id, rookie.skill_id],
+        )
+
+    def test_candidates_come_from_the_text_and_grid_indexes(self):
+        guitar = self.provider_with_skill("Gia", "Music", 28.62, 77.2)
+        Skill.objects.filter(pk=guitar.pk).update(description="Guitar and ukulele")
+        self.provider_with_skill("Pia", "Piano", 28.62, 77.2)
+
+        with CaptureQueriesContext(connection) as queries:
+            matches = rank_providers("ukulele", lat=28.6139, lng=77.209, radius_km=10)
+
+        candidate_sql = queries.captured_queries[0]["sql"]
+        self.assertIn(FTS_TABLE, candidate_sql)
+        self.assertIn("lat_bucket", candidate_sql)
+        self.assertNotIn("LIKE", candidate_sql)
+        self.assertEqual([skill.skill_id for _, _, skill, _ in matches], [guitar.skill_id])
+        self.assertEqual(matches[0][3]["relevance"], 0.4)
+
+    def test_matchmaking_benchmark_covers_every_query_shape(self):
+        seed_listings(400)
+
+        results = measure_matchmaking(repeat=1)
+
+        self.assertEqual(len(results), len(match_queries()))
+        for result in results:
+            self.assertGreater(result["matches"], 0, result["query"])
+
+    def test_top_k_limits_results(self):
+        for i in range(5):
+            self.provider_with_skill(f"P{i}", "Guitar", 28.6, 77.2)
+
+        response = self.client.get(reverse("match_providers"), {"q": "guitar", "k": 2})
+
+        results = response.json()["results"]
+        self.assertEqual(len(results), 2)
+        self.assertIsNone(results[0]["distance_km"])
+
+
+class JobQueueTests(TestCase):
+    def setUp(self):
+        self.calls = []
+        job_handler("test_record")(lambda value: self.calls.append(value))
+
+    def test_duplicate_keys_enqueue_one_job(self):
+        first = enqueue("test_record", {"value": 1}, key="once")
+        second = enqueue("test_record", {"value": 2}, key="once")
+
+        self.assertEqual(first.job_id, second.job_id)
+        self.assertEqual(run_pending(), 1)
+        self.assertEqual(self.calls, [1])
+        self.assertEqual(Job.objects.get().status, "done")
+
+    def test_failures_back_off_then_give_up(self):
+        def flaky():
+            raise RuntimeError("boom")
+
+        job_handler("test_flaky")(flaky)
+        job = enqueue("test_flaky", max_attempts=2)
+
+        with self.assertLogs("members.jobs", "WARNING"):
+            self.assertEqual(run_pending(), 1)
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("pending", 1))
+        self.assertGreater(job.run_after, timezone.now())
+        self.assertIn("boom", job.last_error)
+        self.assertEqual(run_pending(), 0)
+
+        Job.objects.filter(pk=job.pk).update(run_after=timezone.now())
+        with self.assertLogs("members.jobs", "ERROR"):
+            run_pending()
+        job.refresh_from_db()
+        self.assertEqual((job.status, job.attempts), ("failed", 2))
+
+    def test_claims_are_exclusive_until_the_lease_expires(self):
+        job = enqueue("test_record", {"value": 1})
+
+        self.assertEqual(claim_next("a").job_id, job.job_id)
+        self.assertIsNone(claim_next("b"))
+
+        Job.objects.filter(pk=job.pk).update(
+            locked_at=timezone.now() - timedelta(seconds=LEASE_SECONDS + 1)
+        )
+        reclaimed = claim_next("b")
+        self.assertEqual((reclaimed.locked_by, reclaimed.attempts), ("b", 2))
+
+    def test_completion_defers_side_effects_to_the_queue(self):
+        user = User.objects.create_user(username="pro@example.com", email="pro@example.com")
+        provider = Member.objects.create(
+            full_name="Provider", email="pro@example.com", location="Delhi", user=user
+        )
+        seeker = Member.objects.create(
+            full_name="Seeker", email="seeker@example.com", location="Delhi"
+        )
+        open_wallet(seeker, credits=2)
+        open_wallet(provider)
+        skill = Skill.objects.create(member=provider, skill_name="Guitar", description="")
+        session = ServiceSession.objects.create(
+            skill=skill, seeker=seeker, provider=provider, hours=1, status="pending"
+        )
+        self.client.force_login(user)
+
+        for _ in range(2):
+            self.client.post(
+                reverse("complete_session"),
+                json.dumps({"session_id": session.session_id}),
+                content_type="application/json",
+            )
+
+        self.assertEqual(
+            sorted(Job.objects.values_list("name", flat=True)),
+            ["reconcile_wallets", "refresh_member_features"],
+        )
+        self.assertFalse(MemberFeatures.objects.filter(member=provider).exists())
+
+        call_command("run_jobs", "--once", stdout=StringIO())
+
+        self.assertEqual(MemberFeatures.objects.get(member=provider).completed_sessions, 1)
+        self.assertFalse(Job.objects.exclude(status="done").exists())
+
+
+class ReviewTests(TestCase):
+    def setUp(self):
+        self.seeker = Member.objects.create(
+            full_name="Seeker", email="seeker@example.com", location="Delhi"
+        )
+        self.provider = Member.objects.create(
+            full_name="Provider", email="provider@example.com", location="Delhi"
+        )
+        self.skill = Skill.objects.create(
+            member=self.provider, skill_name="Guitar", description=""
+        )
+
+    def session(self, status="completed"):
+        return ServiceSession.objects.create(
+            skill=self.skill, seeker=self.seeker, provider=self.provider,
+            hours=1, status=status,
+        )
+
+    def test_aggregates_are_bumped_in_constant_queries(self):
+        sessions = [self.session(), self.session()]
+        with CaptureQueriesContext(connection) as first:
+            submit_review(sessions[0], self.seeker, 5)
+        with CaptureQueriesContext(connection) as second:
+            submit_review(sessions[1], self.seeker, 3)
+
+        self.assertEqual(len(first), len(second))
+        features = MemberFeatures.objects.get(member=self.provider)
+        self.assertEqual((features.review_count, features.rating_sum), (2, 8))
+        expected = (PRIOR_RATING * PRIOR_WEIGHT + 8) / (PRIOR_WEIGHT + 2)
+        self.assertAlmostEqual(features.avg_rating, expected)
+        self.assertAlmostEqual(features.trust_score, expected, places=3)
+        self.skill.refresh_from_db()
+        self.assertEqual(self.skill.review_count, 2)
+        self.assertAlmostEqual(self.skill.rating, expected)
+
+    def test_unreviewed_listings_do_not_outrank_reviewed_ones(self):
+        submit_review(self.session(), self.seeker, 5)
+        unreviewed = Skill.objects.create(
+            member=self.seeker, skill_name="Piano", description=""
+        )
+
+        self.assertEqual(unreviewed.rating, PRIOR_RATING)
+        self.assertEqual(
+            Skill.objects.order_by("-rating").first().skill_id, self.skill.skill_id
+        )
+
+    def test_recent_reviews_outweigh_old_ones(self):
+        year_ago = decay_weight(timezone.now() - timedelta(days=365))
+        with mock.patch("members.reviews.decay_weight", return_value=year_ago):
+            submit_review(self.session(), self.seeker, 1)
+        submit_review(self.session(), self.seeker, 5)
+
+        features = MemberFeatures.objects.get(member=self.provider)
+        self.assertGreater(features.trust_score, features.avg_rating)
+
+        # Re-ageing every score at once keeps the recent review ahead.
+        MemberFeatures.objects.update(trust_score=0)
+        refresh_trust_scores()
+        features.refresh_from_db()
+        self.assertGreater(features.trust_score, features.avg_rating)
+
+    def test_rejects_invalid_reviews(self):
+        session = self.session()
+        for bad in (
+            lambda: submit_review(self.session("pending"), self.seeker, 5),
+            lambda: submit_review(session, self.provider, 5),
+            lambda: submit_review(session, self.seeker, 6),
+        ):
+            with self.assertRaises(ReviewError):
+                bad()
+
+        submit_review(session, self.seeker, 4)
+        with self.assertRaises(ReviewError):
+            submit_review(session, self.seeker, 4)
+        self.assertEqual(MemberFeatures.objects.get(member=self.provider).review_count, 1)
+
+    def test_reviewed_providers_rank_by_trust(self):
+        user = User.objects.create_user(username="seeker@example.com", email="seeker@example.com")
+        Member.objects.filter(pk=self.seeker.pk).update(user=user)
+        rival = Member.objects.create(
+            full_name="Rival", email="rival@example.com", location="Delhi"
+        )
+        Skill.objects.create(member=rival, skill_name="Guitar", description="")
+        self.client.force_login(user)
+
+        response = self.client.post(
+            reverse("submit_review"),
+            json.dumps({"session_id": self.session().session_id, "rating": 5}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.status_code, 200)
+
+        matches = rank_providers("guitar", k=2)
+        self.assertEqual(matches[0][2].skill_id, self.skill.skill_id)
+
+    def test_fractional_or_out_of_range_ratings_are_refused(self):
+        user = User.objects.create_user(username="seeker@example.com", email="seeker@example.com")
+        Member.objects.filter(pk=self.seeker.pk).update(user=user)
+        self.client.force_login(user)
+        session = self.session()
+
+        for rating in ("4.7", 4.7, "0", 6, True, None, "four"):
+            with self.subTest(rating=rating):
+                response = self.client.post(
+                    reverse("submit_review"),
+                    json.dumps({"session_id": session.session_id, "rating": rating}),
+                    content_type="application/json",
+                )
+                self.assertEqual(response.status_code, 400)
+        self.assertFalse(Review.objects.exists())
+
+        response = self.client.post(
+            reverse("submit_review"),
+            json.dumps({"session_id": session.session_id, "rating": "4"}),
+            content_type="application/json",
+        )
+        self.assertEqual(response.json()["rating"], 4)
+
+
+class SchedulingTests(TestCase):
+    def setUp(self):
+        self.seeker_user = User.objects.create_user(
+            username="seeker@example.com", email="seeker@example.com"
+        )
+        self.seeker = Member.objects.create(
+            full_name="Seeker", email="seeker@example.com", location="Delhi",
+            user=self.seeker_user,
+        )
+        open_wallet(self.seeker, credits=5)
+        self.provider_user = User.objects.create_user(
+            username="provider@example.com", email="provider@example.com"
+        )
+        self.provider = Member.objects.create(
+            full_name="Provider", email="provider@example.com", location="Delhi",
+            user=self.provider_user,
+        )
+        open_wallet(self.provider)
+        self.skill = Skill.objects.create(
+            member=self.provider, skill_name="Guitar", description=""
+        )
+        # A Monday at least a week out, so every slot is in the future.
+        today = timezone.localdate()
+        self.monday = today + timedelta(days=7 + (7 - today.weekday()) % 7)
+        AvailabilityWindow.objects.create(
+            provider=self.provider, weekday=0, start_time=time(9), end_time=time(13)
+        )
+
+    def at(self, day, hour):
+        return timezone.make_aware(datetime.combine(day, time(hour)))
+
+    def book(self, starts_at, hours=1, seeker=None):
+        return ServiceSession.objects.create(
+            skill=self.skill, seeker=seeker or self.seeker, provider=self.provider,
+            hours=hours, status="pending",
+            starts_at=starts_at, ends_at=starts_at + timedelta(hours=hours),
+        )
+
+    def accept(self, starts_at, hours=1):
+        return self.accept_raw({"starts_at": starts_at.isoformat(), "hours": hours})
+
+    def accept_raw(self, booking):
+        req = SkillRequest.objects.create(
+            skill=self.skill, requester=self.seeker, provider=self.provider
+        )
+        self.client.force_login(self.provider_user)
+        return self.client.post(
+            reverse("update_request"),
+            json.dumps({"request_id": req.request_id, "action": "accept", **booking}),
+            content_type="application/json",
+        )
+
+    def test_interval_index_finds_overlaps_and_gaps(self):
+        index = IntervalIndex([(10, 20), (12, 14), (30, 40)])
+
+        self.assertTrue(index.overlaps(15, 16))
+        self.assertTrue(index.overlaps(5, 11))
+        self.assertFalse(index.overlaps(20, 30))
+        self.assertFalse(index.overlaps(0, 10))
+        self.assertEqual(index.next_free(13), 20)
+        self.assertEqual(index.next_free(25), 25)
+        self.assertEqual(index.next_start(20), 30)
+
+    def test_slots_follow_windows_exceptions_and_bookings(self):
+        tuesday = self.monday + timedelta(days=1)
+        AvailabilityException.objects.create(
+            provider=self.provider, date=self.monday, start_time=time(10), end_time=time(11)
+        )
+        AvailabilityException.objects.create(
+            provider=self.provider, date=tuesday, start_time=time(14), end_time=time(16),
+            available=True,
+        )
+        self.book(self.at(self.monday, 12))
+
+        week = self.at(self.monday, 0)
+        slots = find_free_slots(self.provider.member_id, week, week + timedelta(days=7))
+
+        self.assertEqual(
+            [start for start, _ in slots],
+            [
+                self.at(self.monday, 9),
+                self.at(self.monday, 11),
+                self.at(tuesday, 14),
+                self.at(tuesday, 15),
+            ],
+        )
+        two_hour = find_free_slots(
+            self.provider.member_id, self.at(self.monday, 0), self.at(tuesday, 23), hours=2
+        )
+        self.assertEqual([start for start, _ in two_hour], [self.at(tuesday, 14)])
+
+    def test_accepting_books_the_slot_once(self):
+        response = self.accept(self.at(self.monday, 9), hours=2)
+        self.assertEqual(response.status_code, 200)
+        session = ServiceSession.objects.get(provider=self.provider)
+        self.assertEqual((session.hours, session.ends_at), (2, self.at(self.monday, 11)))
+
+        # Overlaps the first booking.
+        response = self.accept(self.at(self.monday, 10))
+        self.assertEqual(response.status_code, 409)
+        # Outside the provider's hours.
+        response = self.accept(self.at(self.monday, 15))
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(ServiceSession.objects.count(), 1)
+        self.assertEqual(SkillRequest.objects.filter(status="accepted").count(), 1)
+
+        response = self.client.get(
+            reverse("provider_slots", args=[self.provider.member_id]),
+            {"from": self.monday.isoformat(), "days": 1},
+        )
+        self.assertEqual(
+            [slot["starts_at"] for slot in response.json()["slots"]],
+            [self.at(self.monday, 11).isoformat(), self.at(self.monday, 12).isoformat()],
+        )
+
+    def test_busy_lookup_reads_only_the_searched_range(self):
+        # Two years of weekly history before the searched week.
+        start = self.at(self.monday, 9)
+        ServiceSession.objects.bulk_create(
+            ServiceSession(
+                skill=self.skill, seeker=self.seeker, provider=self.provider,
+                hours=1, status="completed",
+                starts_at=start - timedelta(weeks=week),
+                ends_at=start - timedelta(weeks=week, hours=-1),
+            )
+            for week in range(1, 105)
+        )
+        self.book(start)
+
+        index = busy_index(self.provider.member_id, start, start + timedelta(days=1))
+
+        self.assertEqual(len(index), 1)
+        plan = explain_plan(
+            ServiceSession.objects.filter(
+                provider_id=self.provider.member_id,
+                starts_at__gte=start,
+                starts_at__lt=start + timedelta(days=1),
+            )
+        )
+        self.assertIn("session_provider_starts_idx", plan)
+
+    def test_availability_endpoint_replaces_the_calendar(self):
+        self.client.force_login(self.provider_user)
+        payload = {
+            "windows": [{"weekday": 2, "start": "18:00", "end": "20:00"}],
+            "exceptions": [{"date": self.monday.isoformat()}],
+        }
+
+        response = self.client.post(
+            reverse("availability"), json.dumps(payload), content_type="application/json"
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(
+            response.json(),
+            {
+                "windows": [{"weekday": 2, "start": "18:00", "end": "20:00"}],
+                "exceptions": [
+                    {
+                        "date": self.monday.isoformat(),
+                        "start": None,
+                        "end": None,
+                        "available": False,
+                    }
+                ],
+            },
+        )
+        self.assertEqual(AvailabilityWindow.objects.filter(provider=self.provider).count(), 1)
+
+        bad = {"windows": [{"weekday": 2, "start": "20:00", "end": "18:00"}]}
+        response = self.client.post(
+            reverse("availability"), json.dumps(bad), content_type="application/json"
+        )
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(AvailabilityWindow.objects.filter(provider=self.provider).count(), 1)
+
+
+    def test_impossible_dates_and_malformed_entries_are_rejected(self):
+        self.client.force_login(self.provider_user)
+        slots_url = reverse("provider_slots", args=[self.provider.member_id])
+        self.assertEqual(self.client.get(slots_url, {"from": "2026-02-30"}).status_code, 400)
+        self.assertEqual(self.accept_raw({"starts_at": "2026-02-30T10:00"}).status_code, 400)
+
+        for payload in (
+            {"exceptions": [{"date": "2026-02-30"}]},
+            {"windows": [{"weekday": 1, "start": "25:00", "end": "26:00"}]},
+            {"windows": ["monday"]},
+            {"exceptions": [17]},
+            {"windows": {"weekday": 1}},
+            ["windows"],
+        ):
+            with self.subTest(payload=payload):
+                response = self.client.post(
+                    reverse("availability"), json.dumps(payload),
+                    content_type="application/json",
+                )
+                self.assertEqual(response.status_code, 400)
+        self.assertFalse(ServiceSession.objects.exists())
+
+    def test_accepting_again_keeps_the_booked_session(self):
+        starts_at = self.at(self.monday, 9)
+        self.assertEqual(self.accept(starts_at).status_code, 200)
+        req = SkillRequest.objects.get()
+
+        response = self.client.post(
+            reverse("update_request"),
+            json.dumps({
+                "request_id": req.request_id,
+                "action": "accept",
+                "starts_at": starts_at.isoformat(),
+            }),
+            content_type="application/json",
+        )
+
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(ServiceSession.objects.get().starts_at, starts_at)
+
+    def test_fractional_hours_are_refused_not_rounded(self):
+        starts_at = self.at(self.monday, 9).isoformat()
+        for hours in ("1.5", 1.5, "two", True):
+            with self.subTest(hours=hours):
+                response = self.accept_raw({"starts_at": starts_at, "hours": hours})
+                self.assertEqual(response.status_code, 400)
+        self.assertFalse(ServiceSession.objects.exists())
+
+        self.assertEqual(self.accept_raw({"starts_at": starts_at, "hours": "2"}).status_code, 200)
+        self.assertEqual(ServiceSession.objects.get().hours, 2)
+
+
+class AdminPerformanceTests(TestCase):
+    def setUp(self):
+        admin_user = User.objects.create_superuser("admin", "admin@example.com", "pw")
+        self.client.force_login(admin_user)
+        self.seeker = Member.objects.create(
+            full_name="Seeker", email="seeker@example.com", location="Delhi"
+        )
+        self.provider = Member.objects.create(
+            full_name="Provider", email="provider@example.com", location="Delhi"
+        )
+        self.skill = Skill.objects.create(
+            member=self.provider, skill_name="Guitar", description=""
+        )
+
+    def add_requests(self, count):
+        requests = []
+        for _ in range(count):
+            req = SkillRequest.objects.create(
+                skill=self.skill, requester=self.seeker, provider=self.provider
+            )
+            open_conversation(req)
+            post_message(req, self.seeker, "Hello")
+            post_message(req, self.provider, "Hi")
+            requests.append(req)
+        return requests
+
+    def test_ledger_cannot_be_edited_from_the_admin(self):
+        wallet = open_wallet(self.seeker, credits=3)
+
+        response = self.client.post(
+            reverse("admin:members_creditwallet_change", args=[wallet.pk]),
+            {"member": self.seeker.pk, "credits": 999},
+        )
+        wallet.refresh_from_db()
+        self.assertEqual(wallet.credits, 3)
+        self.assertEqual(response.status_code, 302)
+
+        response = self.client.get(reverse("admin:members_credittransaction_add"))
+        self.assertEqual(response.status_code, 403)
+        self.assertFalse(unreconciled_wallets().exists())
+
+    def changelist_queries(self, model):
+        url = reverse(f"admin:members_{model}_changelist")
+        with CaptureQueriesContext(connection) as queries:
+            self.assertEqual(self.client.get(url).status_code, 200)
+        return len(queries)
+
+    def test_changelist_queries_do_not_grow_with_rows(self):
+        self.add_requests(2)
+        before = {m: self.changelist_queries(m) for m in ("message", "skillrequest")}
+        self.add_requests(8)
+        after = {m: self.changelist_queries(m) for m in ("message", "skillrequest")}
+
+        self.assertEqual(before, after)
+
+    def test_large_tables_are_estimated_past_the_limit(self):
+        self.add_requests(3)
+        with mock.patch("members.admin.EXACT_COUNT_LIMIT", 2):
+            everything = EstimatedCountPaginator(Message.objects.order_by("-pk"), 50)
+            self.assertEqual(everything.count, Message.objects.latest("pk").pk)
+
+            filtered = EstimatedCountPaginator(Message.objects.filter(text="Hi").order_by("-pk"), 50)
+            self.assertEqual(filtered.count, 3)
+
+        self.assertEqual(EstimatedCountPaginator(Message.objects.order_by("-pk"), 50).count, 6)
+
+    def test_decline_action_is_one_update(self):
+        pending, accepted = self.add_requests(2)
+        SkillRequest.objects.filter(pk=accepted.pk).update(status="accepted")
+        stamp = timezone.now() - timedelta(days=1)
+        SkillRequest.objects.update(updated_at=stamp)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(
+                reverse("admin:members_skillrequest_changelist"),
+                {"action": "decline_requests", "_selected_action": [pending.pk, accepted.pk]},
+            )
+
+        updates = [q for q in queries if q["sql"].startswith('UPDATE "members_skillrequest"')]
+        self.assertEqual(len(updates), 1)
+        pending.refresh_from_db()
+        accepted.refresh_from_db()
+        self.assertEqual((pending.status, accepted.status), ("declined", "accepted"))
+        self.assertGreater(pending.updated_at, stamp)
+        self.assertTrue(Job.objects.filter(name="refresh_member_features").exists())
+
+    def test_delete_action_is_one_delete_and_repairs_summaries(self):
+        req = self.add_requests(1)[0]
+        spam = Message.objects.filter(request=req, sender=self.provider)
+
+        with CaptureQueriesContext(connection) as queries:
+            self.client.post(
+                reverse("admin:members_message_changelist"),
+                {"action": "delete_messages", "_selected_action": list(spam.values_list("pk", flat=True))},
+            )
+
+        deletes = [q for q in queries if q["sql"].startswith('DELETE FROM "members_message"')]
+        self.assertEqual(len(deletes), 1)
+        summary = ConversationSummary.objects.get(request=req)
+        self.assertEqual((summary.message_count, summary.last_message_text), (1, "Hello"))
+
+
+PRODUCTION_STORAGES = {
+    "default": {"BACKEND": "django.core.files.storage.FileSystemStorage"},
+    "staticfiles": {"BACKEND": "members.assets.CompressedManifestStaticFilesStorage"},
+}
+
+
+class StaticAssetTests(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        super().setUpClass()
+        cls.root = tempfile.TemporaryDirectory()
+        cls.enterClassContext(
+            override_settings(STATIC_ROOT=cls.root.name, STORAGES=PRODUCTION_STORAGES)
+        )
+        call_command("build_static", stdout=StringIO())
+        cls.middleware = StaticFilesMiddleware(lambda request: HttpResponse("app"))
+
+    @classmethod
+    def tearDownClass(cls):
+        super().tearDownClass()
+        cls.root.cleanup()
+
+    def get(self, url, **headers):
+        return self.middleware(RequestFactory().get(url, **headers))
+
+    def test_build_fingerprints_minifies_and_precompresses(self):
+        css = staticfiles_storage.stored_name("css/style.css")
+        self.assertRegex(css, r"^css/style\.[0-9a-f]{12}\.css$")
+        built = Path(staticfiles_storage.path(css))
+        source = Path(settings.BASE_DIR, "static", "css", "style.css")
+        self.assertLess(built.stat().st_size, source.stat().st_size)
+        self.assertTrue(built.with_name(built.name + ".gz").exists())
+        self.assertIn(css, self.client.get(reverse("index")).content.decode())
+
+    def test_hashed_assets_are_immutable_and_precompressed(self):
+        url = staticfiles_storage.url("js/script.js")
+
+        response = self.get(url, HTTP_ACCEPT_ENCODING="gzip, deflate")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertEqual(response["Content-Type"], "text/javascript")
+        self.assertIn("immutable", response["Cache-Control"])
+        self.assertEqual(response["Vary"], "Accept-Encoding")
+        body = gzip.decompress(b"".join(response.streaming_content))
+        self.assertIn(b"loadBootstrapData", body)
+
+        plain = self.get(url)
+        self.assertFalse(plain.has_header("Content-Encoding"))
+
+    def test_unhashed_names_revalidate_and_others_pass_through(self):
+        response = self.get("/static/css/style.css")
+        self.assertEqual(response["Cache-Control"], "public, no-cache")
+        revalidated = self.get(
+            "/static/css/style.css", HTTP_IF_MODIFIED_SINCE=response["Last-Modified"]
+        )
+        self.assertEqual(revalidated.status_code, 304)
+
+        self.assertEqual(self.get("/static/../manage.py").status_code, 404)
+        self.assertEqual(self.get("/static/missing.js").status_code, 404)
+        self.assertEqual(self.get("/").content, b"app")
+
+
+class SkillSearchTests(TestCase):
+    def setUp(self):
+        self.member = Member.objects.create(
+            full_name="Asha", email="asha@example.com", location="Delhi"
+        )
+
+    def add_skill(self, name, description="", category="education"):
+        return Skill.objects.create(
+            member=self.member, skill_name=name, description=description, category=category
+        )
+
+    def test_prefix_matches_rank_name_hits_first(self):
+        in_description = self.add_skill("Music theory", "Learn guitar chord shapes")
+        in_name = self.add_skill("Guitar lessons", "Acoustic basics")
+        self.add_skill("Yoga")
+
+        skills, total = search_skills("guit")
+
+        self.assertEqual(total, 2)
+        self.assertEqual(
+            [s.skill_id for s in skills], [in_name.skill_id, in_description.skill_id]
+        )
+
+    def test_index_follows_updates_deletes_and_category_filter(self):
+        skill = self.add_skill("Painting", category="arts")
+        self.add_skill("Painting walls", category="home")
+
+        skill.skill_name = "Pottery"
+        skill.save()
+        self.assertEqual(search_skills("pottery")[1], 1)
+        self.assertEqual([s.category for s in search_skills("painting")[0]], ["home"])
+        self.assertEqual(search_skills("painting", category="arts")[1], 0)
+
+        skill.delete()
+        self.assertEqual(search_skills("pottery")[1], 0)
+
+    def test_repair_reindexes_after_triggers_are_lost(self):
+        self.add_skill("Chess")
+        with connection.cursor() as cursor:
+            cursor.execute("DROP TRIGGER members_skill_fts_ai")
+        self.add_skill("Chess openings")
+
+        self.assertTrue(install_skill_search_index())
+        self.assertEqual(search_skills("chess")[1], 2)
+        self.assertFalse(install_skill_search_index())
+
+    def test_endpoint_ignores_query_syntax(self):
+        self.add_skill("Guitar")
+
+        response = self.client.get(reverse("skills_search"), {"q": 'gui" * ('})
+
+        self.assertEqual(response.json()["count"], 1)
+
+
+class HotQueryIndexTests(TestCase):
+    def test_hot_queries_use_composite_indexes(self):
+        queries = hot_queries(seed_dataset(members=20))
+
+        with_indexes = measure_queries(queries, repeat=1, tag="with")
+        drop_hot_indexes()
+        without = measure_queries(queries, repeat=1, tag="without")
+
+        plans = {result["query"]: result["plan"] for result in with_indexes}
+        self.assertIn("request_provider_status_idx", plans["pending incoming requests"])
+        self.assertIn("message_request_created_idx", plans["conversation history"])
+        self.assertIn("session_provider_starts_idx", plans["provider bookings this week"])
+        self.assertNotIn("TEMP B-TREE", plans["conversation history"])
+        self.assertNotIn("_idx", " ".join(result["plan"] for result in without))
+
+
+class DatabaseProfileTests(TestCase):
+    def pragma(self, name):
+        with connection.cursor() as cursor:
+            cursor.execute(f"PRAGMA {name}")
+            return cursor.fetchone()[0]
+
+    def test_tuned_profile_applies_pragmas_on_connect(self):
+        if connection.settings_dict.get("OPTIONS", {}).get("init_command") is None:
+            self.skipTest("SKILLSWAP_DB_PROFILE is not 'tuned'")
+        self.assertEqual(self.pragma("busy_timeout"), 5000)
+        self.assertEqual(self.pragma("synchronous"), 1)  # NORMAL
+
+    def test_read_only_views_route_reads_to_the_replica(self):
+        router = ReadReplicaRouter()
+
+        @read_only
+        def view():
+            return router.db_for_read(Skill)
+
+        with mock.patch("members.routers.replica_configured", return_value=True):
+            self.assertEqual(view(), REPLICA)
+            self.assertIsNone(router.db_for_read(Skill))
+            self.assertEqual(router.db_for_write(Skill), "default")
+        with mock.patch("members.routers.replica_configured", return_value=False):
+            self.assertIsNone(view())
+        self.assertFalse(router.allow_migrate(REPLICA, "members"))
+
+
+class LoadTestTests(TestCase):
+    def test_drives_every_endpoint_and_flags_regressions(self):
+        dataset = generate_dataset(members=4, requests_per_member=1)
+
+        report = run_load_test(dataset, iterations=3)
+
+        self.assertEqual(set(report["endpoints"]), set(ENDPOINTS))
+        for stats in report["endpoints"].values():
+            self.assertEqual(stats["requests"], 3)
+            self.assertGreater(stats["queries_max"], 0)
+            self.assertLessEqual(stats["p50_ms"], stats["p99_ms"])
+        self.assertEqual(compare_to_baseline(report, report), [])
+
+        baseline = json.loads(json.dumps(report))
+        baseline["endpoints"]["index"]["queries_max"] -= 1
+        baseline["endpoints"]["sync_data"]["p95_ms"] = 0.001
+        regressions = compare_to_baseline(report, baseline)
+        self.assertEqual(len(regressions), 2)
+        self.assertTrue(regressions[0].startswith("index:"))
+
+
+class QueryMetricsTests(TestCase):
+    def setUp(self):
+        registry.reset()
+        self.member = Member.objects.create(
+            full_name="Seeker", email="seeker@example.com", location="Delhi"
+        )
+        self.client.force_login(
+            User.objects.create_user(username="seeker", email="seeker@example.com")
+        )
+
+    def test_fingerprint_folds_literals_and_in_lists(self):
+        self.assertEqual(
+            fingerprint("SELECT * FROM t WHERE id IN (%s, %s, %s) LIMIT 21"),
+            "SELECT * FROM t WHERE id IN (...) LIMIT ?",
+        )
+
+    def test_repeated_query_shapes_count_as_duplicates(self):
+        recorder = QueryRecorder()
+        for _ in range(3):
+            recorder.record('SELECT * FROM "members_member" WHERE id = %s', 0.001)
+        recorder.record('SELECT * FROM "members_skill"', 0.001)
+        self.assertEqual(recorder.duplicates, 2)
+
+    def test_requests_are_exported_per_view(self):
+        self.client.get(reverse("sync_data"))
+
+        body = self.client.get(reverse("metrics")).content.decode()
+
+        self.assertIn('skillswap_request_duration_seconds_count{view="sync_data"} 1', body)
+        self.assertRegex(body, r'skillswap_db_queries_sum\{view="sync_data"\} [1-9]')
+        self.assertIn('skillswap_db_duplicate_queries_total{view="sync_data"}', body)
+        self.assertIn('skillswap_db_execute_seconds_count{view="sync_data"} 1', body)
+
+    def test_metrics_endpoint_is_restricted(self):
+        response = self.client.get(reverse("metrics"), REMOTE_ADDR="10.0.0.8")
+        self.assertEqual(response.status_code, 403)
+        # Without a trusted proxy the forwarded header is not believed.
+        response = self.client.get(
+            reverse("metrics"), REMOTE_ADDR="10.0.0.8", HTTP_X_FORWARDED_FOR="127.0.0.1"
+        )
+        self.assertEqual(response.status_code, 403)
+
+    @override_settings(TRUSTED_PROXIES=["127.0.0.1"])
+    def test_metrics_reads_the_client_behind_a_trusted_proxy(self):
+        url = reverse("metrics")
+        outside = self.client.get(url, HTTP_X_FORWARDED_FOR="203.0.113.9, 127.0.0.1")
+        spoofed = self.client.get(url, HTTP_X_FORWARDED_FOR="::1, 203.0.113.9")
+        local = self.client.get(url, HTTP_X_FORWARDED_FOR="::1")
+
+        self.assertEqual(outside.status_code, 403)
+        self.assertEqual(spoofed.status_code, 403)
+        self.assertEqual(local.status_code, 200)
+
+    @override_settings(SLOW_REQUEST_MS=0)
+    def test_slow_requests_are_logged_with_query_shapes(self):
+        with self.assertLogs("members.metrics", "WARNING") as logs:
+            self.client.get(reverse("sync_data"))
+        self.assertIn('FROM "django_session"', logs.output[0])
+
+    def test_async_views_are_recorded(self):
+        async def view(request):
+            # Runs on a worker thread with its own connection.
+            await sync_to_async(Skill.objects.count)()
+            return HttpResponse()
+
+        middleware = QueryMetricsMiddleware(view)
+        asyncio.run(middleware(RequestFactory().get("/")))
+
+        histogram = registry.histograms["skillswap_db_queries"]["unresolved"]
+        self.assertEqual(histogram.sum, 1)
+
+
+class AsyncApiViewTests(TestCase):
+    def setUp(self):
+        self.seeker_user = User.objects.create_user(
+            username="seeker@example.com", email="seeker@example.com"
+        )
+        self.seeker = Member.objects.create(
+            full_name="Seeker", email="seeker@example.com", location="Delhi",
+            user=self.seeker_user,
+        )
+        open_wallet(self.seeker, credits=5)
+        self.provider_user = User.objects.create_user(
+            username="provider@example.com", email="provider@example.com"
+        )
+        self.provider = Member.objects.create(
+            full_name="Provider", email="provider@example.com", location="Delhi",
+            user=self.provider_user,
+        )
+        open_wallet(self.provider)
+        self.skill = Skill.objects.create(
+            member=self.provider, skill_name="Guitar", description=""
+        )
+        self.factory = AsyncRequestFactory()
+
+    async def call(self, view, user, data=None):
+        if data is None:
+            request = self.factory.get("/")
+        else:
+            request = self.factory.post(
+                "/", json.dumps(data), content_type="application/json"
+            )
+
+        async def auser():
+            return user
+
+        request.auser = auser
+        return await view(request)
+
+    async def test_request_accept_and_message_round_trip(self):
+        response = await self.call(
+            async_views.request_skill, self.seeker_user,
+            {"skill_id": self.skill.skill_id, "note": "hi"},
+        )
+        request_id = json.loads(response.content)["request_id"]
+
+        response = await self.call(
+            async_views.update_request, self.provider_user,
+            {"request_id": request_id, "action": "accept"},
+        )
+        self.assertEqual(json.loads(response.content)["status"], "accepted")
+        self.assertTrue(
+            await ServiceSession.objects.filter(request_id=request_id).aexists()
+        )
+
+        response = await self.call(
+            async_views.send_message, self.provider_user,
+            {"request_id": request_id, "text": "see you"},
+        )
+        self.assertEqual(response.status_code, 200)
+        summary = await ConversationSummary.objects.aget(request_id=request_id)
+        self.assertEqual(summary.message_count, 2)
+        self.assertEqual(summary.requester_unread, 1)
+
+    async def test_outsiders_cannot_post_messages(self):
+        req = await SkillRequest.objects.acreate(
+            skill=self.skill, requester=self.seeker, provider=self.provider
+        )
+        outsider = await sync_to_async(User.objects.create_user)(
+            username="x@example.com", email="x@example.com"
+        )
+
+        response = await self.call(
+            async_views.send_message, outsider,
+            {"request_id": req.request_id, "text": "hello"},
+        )
+
+        self.assertEqual(response.status_code, 403)
+
+    async def test_sync_data_matches_the_sync_view(self):
+        req = await SkillRequest.objects.acreate(
+            skill=self.skill, requester=self.seeker, provider=self.provider
+        )
+        await sync_to_async(post_message)(req, self.seeker, "hello")
+
+        def sync_view_payload():
+            self.client.force_login(self.seeker_user)
+            return self.client.get(reverse("sync_data")).json()
+
+        expected = await sync_to_async(sync_view_payload)()
+        response = await self.call(async_views.sync_data, self.seeker_user)
+        payload = json.loads(response.content)
+
+        # Fresh rows put the cursor inside the overlap window, i.e. "now".
+        self.assertIsNotNone(payload.pop("cursor"))
+        expected.pop("cursor")
+        self.assertEqual(payload, expected)
+
+
+class JsonResponseTests(TestCase):
+    def setUp(self):
+        user = User.objects.create_user(
+            username="seeker@example.com", email="seeker@example.com"
+        )
+        self.seeker = Member.objects.create(
+            full_name="Seeker", email=user.email, location="Delhi", user=user
+        )
+        provider = Member.objects.create(
+            full_name="Provider", email="provider@example.com", location="Delhi"
+        )
+        skill = Skill.objects.create(member=provider, skill_name="Guitar", description="")
+        for i in range(5):
+            req = SkillRequest.objects.create(
+                skill=skill, requester=self.seeker, provider=provider, note=f"note {i}"
+            )
+            post_message(req, self.seeker, f"hello {i}")
+        # Settled data keeps the sync cursor, and so the body, stable.
+        past = timezone.now() - timedelta(hours=1)
+        SkillRequest.objects.update(created_at=past, updated_at=past)
+        ConversationSummary.objects.update(last_message_at=past)
+        self.client.force_login(user)
+
+    def test_unchanged_sync_data_answers_304(self):
+        first = self.client.get(reverse("sync_data"))
+        etag = first["ETag"]
+        self.assertIn("no-cache", first["Cache-Control"])
+
+        second = self.client.get(reverse("sync_data"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(second.status_code, 304)
+
+        post_message(SkillRequest.objects.first(), self.seeker, "new")
+        third = self.client.get(reverse("sync_data"), HTTP_IF_NONE_MATCH=etag)
+        self.assertEqual(third.status_code, 200)
+
+    def test_json_is_gzipped_and_revalidates_weakly(self):
+        response = self.client.get(reverse("sync_data"), HTTP_ACCEPT_ENCODING="gzip")
+
+        self.assertEqual(response["Content-Encoding"], "gzip")
+        self.assertTrue(response["ETag"].startswith('W/"'))
+        again = self.client.get(
+            reverse("sync_data"),
+            HTTP_ACCEPT_ENCODING="gzip",
+            HTTP_IF_NONE_MATCH=response["ETag"],
+        )
+        self.assertEqual(again.status_code, 304)
+
+    def test_brotli_is_preferred_when_available(self):
+        fake_brotli = mock.Mock()
+        fake_brotli.compress.return_value = b"tiny"
+        with mock.patch("members.responses.brotli", fake_brotli):
+            response = self.client.get(
+                reverse("sync_data"), HTTP_ACCEPT_ENCODING="gzip, br"
+            )
+        self.assertEqual(response["Content-Encoding"], "br")
+        self.assertEqual(response.content, b"tiny")
+
+    def test_html_pages_are_left_alone(self):
+        response = self.client.get(reverse("index"), HTTP_ACCEPT_ENCODING="gzip")
+        self.assertFalse(response.has_header("Content-Encoding"))
+
+    def test_serializers_agree(self):
+        data = {"by_id": {1: [1.5]}, "price": Decimal("2.50"), "text": "naïve"}
+
+        fast = json.loads(dumps(data))
+        with override_settings(JSON_SERIALIZER="json"):
+            plain = json.loads(dumps(data))
+
+        self.assertEqual(fast, plain)
+        self.assertEqual(fast, {"by_id": {"1": [1.5]}, "price": "2.50", "text": "naïve"})
+
+    def test_unusable_serializer_setting_is_a_configuration_error(self):
+        app = apps.get_app_config("members")
+        with mock.patch("members.responses.orjson", None):
+            with override_settings(JSON_SERIALIZER="orjson"):
+                self.assertRaises(ImproperlyConfigured, app.ready)
+                self.assertRaises(ImproperlyConfigured, dumps, {})
+            with override_settings(JSON_SERIALIZER="auto"):
+                self.assertEqual(dumps({"a": 1}), b'{"a":1}')
+        with override_settings(JSON_SERIALIZER="ujson"):
+            self.assertRaises(ImproperlyConfigured, dumps, {})
@@ -1,18 +1,52 @@
+from django.conf import settings
 from django.urls import path
 from . import views
 
+if settings.ASYNC_API_VIEWS:
+    from . import async_views as api_views
+else:
+    api_views = views
+
 urlpatterns = [
     path('', views.index, name='index'),
     path('add-skill/', views.add_skill, name='add_skill'),
     path('delete-skill/<int:skill_id>/', views.delete_skill, name='delete_skill'),
-    path('request-skill/', views.request_skill, name='request_skill'),
-    path('update-request/', views.update_request, name='update_request'),
-    path('send-message/', views.send_message, name='send_message'),
-    path('sync-data/', views.sync_data, name='sync_data'),
+    path('request-skill/', api_views.request_skill, name='request_skill'),
+    path('update-request/', api_views.update_request, name='update_request'),
+    path('send-message/', api_views.send_message, name='send_message'),
+    path('sync-data/', api_views.sync_data, name='sync_data'),
+    path(
+        'api/conversations/<int:request_id>/messages/',
+        views.conversation_messages,
+        name='conversation_messages',
+    ),
+    path(
+        'api/conversations/<int:request_id>/read/',
+        views.mark_conversation_read,
+        name='mark_conversation_read',
+    ),
+    path('metrics/', views.metrics, name='metrics'),
     path("complete-session/", views.complete_session, name="complete_session"),
+    path("api/reviews/", views.submit_review, name="submit_review"),
+    path("api/availability/", views.availability, name="availability"),
+    path(
+        "api/providers/<int:member_id>/slots/",
+        views.provider_slots,
+        name="provider_slots",
+    ),
+    path("api/me/requests/", views.member_requests, name="member_requests"),
+    path("api/me/conversations/", views.member_conversations, name="member_conversations"),
+    path("api/csrf/", views.csrf_cookie, name="csrf_cookie"),
+    path('api/skills/', views.skills_nearby, name='skills_nearby'),
+    path('api/skills/catalog/', views.skills_catalog, name='skills_catalog'),
+    path('api/skills/search/', views.skills_search, name='skills_search'),
+    path('api/match/', views.match_providers, name='match_providers'),
 
     path('login/', views.login_user, name='login_user'),
     path('signup/', views.signup_user, name='signup_user'),
     path('logout/', views.logout_user, name='logout_user'),
 
 ]
+
+if settings.EVENT_STREAM_ENABLED:
+    urlpatterns.append(path('events/', views.event_stream, name='event_stream'))
@@ -1,15 +1,55 @@
+from django.conf import settings
 from django.shortcuts import render, redirect, get_object_or_404
-from .models import Skill, Member, SkillRequest, Message, ServiceSession,CreditWallet
+from .models import (
+    AvailabilityException,
+    AvailabilityWindow,
+    ConversationSummary,
+    Skill,
+    Member,
+    SkillRequest,
+    Message,
+    ServiceSession,
+)
 from django.contrib.auth import authenticate, login, logout
 from django.contrib.auth.models import User
-from django.http import JsonResponse
-from django.views.decorators.csrf import csrf_exempt
-from django.db.models import Q
+from django.core.handlers.asgi import ASGIRequest
+from django.http import HttpResponse, StreamingHttpResponse
+from asgiref.sync import sync_to_async
+from django.views.decorators.cache import never_cache
+from django.views.decorators.csrf import csrf_exempt, ensure_csrf_cookie
+from django.db.models import F, Q
 import json
-from collections import defaultdict
+import math
+from .geo import skills_within_radius
+from .metrics import client_address, registry as metrics_registry
+from .responses import JsonResponse, conditional_response, content_etag
+from .identity import get_member_for_user
+from .inbox import mark_read, open_conversation, post_message
+from .events import publish_on_commit, stream_events
+from .catalog import catalog_etag, get_catalog_snapshot, serialize_skill
+from .stats import get_member_stats
+from .ledger import InsufficientCredits, open_wallet, settle_session
+from .jobs import enqueue
+from .matchmaking import rank_providers
+from .reviews import ReviewError, submit_review as create_review
+from .routers import read_only
+from .scheduling import (
+    MAX_SEARCH_DAYS,
+    MAX_SESSION_HOURS,
+    SchedulingConflict,
+    SchedulingError,
+    ensure_bookable,
+    find_free_slots,
+    set_availability,
+)
+from .search import search_skills
+from django.views.decorators.http import condition
 from django.db import transaction
 from django.shortcuts import get_object_or_404
-from django.db.models import Sum
+from django.db.models import Max
+from django.utils import timezone
+from django.utils.dateparse import parse_date, parse_datetime, parse_time
+from datetime import datetime, timedelta
 from .models import ServiceSession
 
 
@@ -19,34 +59,61 @@ def _parse_float(value):
     except (TypeError, ValueError):
         return None
 
+def _non_finite(*values):
+    # float() accepts "nan" and "inf", which no range check or grid bucket
+    # can handle.
+    return any(value is not None and not math.isfinite(value) for value in values)
+
 def _parse_int(value, default=1):
     try:
         return int(value)
     except (TypeError, ValueError):
         return default
 
+def _parse_whole(value):
+    # Unlike _parse_int, refuses "4.7" and 4.7 instead of truncating them.
+    if isinstance(value, float) and value.is_integer():
+        return int(value)
+    if isinstance(value, str) and value.strip().isascii() and value.strip().isdigit():
+        return int(value)
+    if isinstance(value, bool) or not isinstance(value, int):
+        return None
+    return value
+
 
-def _build_requests_payload(member):
+def _request_session(skill_request):
+    # Missing reverse one-to-one raises RelatedObjectDoesNotExist, an
+    # AttributeError subclass, so getattr's default covers it.
+    return getattr(skill_request, "servicesession", None)
+
+
+def _build_requests_payload(member, since=None):
     if not member:
         return []
 
     requests_payload = []
 
+    # The reverse one-to-one join pulls each request's session in the same
+    # query, so the loops below never hit the database.
     incoming = SkillRequest.objects.select_related(
-        "skill", "requester", "provider"
+        "skill", "requester", "provider", "servicesession"
     ).filter(provider=member)
 
     outgoing = SkillRequest.objects.select_related(
         "skill", "requester", "provider"
     ).filter(requester=member)
 
+    if since:
+        incoming = incoming.filter(updated_at__gt=since)
+        outgoing = outgoing.filter(updated_at__gt=since)
+
     def safe_avatar(name):
         name = (name or "").strip()
         return name[0].upper() if name else "?"
 
     # ✅ INCOMING REQUESTS
     for req in incoming:
-        session = ServiceSession.objects.filter(request=req).first()
+        session = _request_session(req)
 
         requests_payload.append({
             "id": req.request_id,
@@ -61,7 +128,7 @@ def _build_requests_payload(member):
             "can_complete": (
                 session is not None
                 and session.status == "pending"
-                and req.provider == member
+                and req.provider_id == member.member_id
             ),
         })
 
@@ -82,67 +149,75 @@ def _build_requests_payload(member):
 
     return requests_payload
 
-def _build_conversations_payload(member):
+def _serialize_message(msg, member):
+    return {
+        "id": msg.message_id,
+        "text": msg.text,
+        "sent": msg.sender_id == member.member_id,
+        "time": msg.created_at.strftime("%I:%M %p").lstrip("0"),
+    }
+
+
+def _note_placeholder(req):
+    # Requests whose note predates chat messages show it as the first message.
+    return Message(
+        message_id=0,
+        request=req,
+        sender_id=req.requester_id,
+        text=req.note,
+        created_at=req.created_at,
+    )
+
+
+def _build_conversations_payload(member, since=None):
     if not member:
         return [], {}
 
-        
-    requests = list(
-        SkillRequest.objects.select_related("skill", "requester", "provider")
-        .filter(Q(requester=member) | Q(provider=member))
-        .order_by("-created_at")
-    )
+    # The preview, unread counters and ordering all come from the summary
+    # row kept up to date by inbox.post_message. The full history is paged
+    # in by conversation_messages when a chat opens.
+    requests = SkillRequest.objects.select_related(
+        "skill", "requester", "provider", "servicesession", "summary"
+    ).filter(Q(requester=member) | Q(provider=member))
 
-    for req in requests:
-        session = ServiceSession.objects.filter(request=req).first()
-        
-    messages = (
-        Message.objects.select_related("sender", "request")
-        .filter(request__in=requests)
-        .order_by("created_at")
-    )
+    if since:
+        requests = requests.filter(
+            Q(updated_at__gt=since) | Q(summary__last_message_at__gt=since)
+        )
 
-    messages_by_request = defaultdict(list)
-    for msg in messages:
-        messages_by_request[msg.request_id].append(msg)
+    requests = list(
+        requests.order_by(
+            F("summary__last_message_at").desc(nulls_last=True), "-created_at"
+        )
+    )
 
     def safe_avatar(name):
         name = (name or "").strip()
         return name[0].upper() if name else "?"
 
     conversations = []
-    messages_payload = {}
 
     for req in requests:
         other = req.provider if req.requester_id == member.member_id else req.requester
         other_name = other.full_name if other else "Unknown"
         avatar = safe_avatar(other_name)
 
-        req_messages = messages_by_request.get(req.request_id, [])
-        if not req_messages and req.note:
-            req_messages = [
-                Message(
-                    message_id=0,
-                    request=req,
-                    sender=req.requester,
-                    text=req.note,
-                    created_at=req.created_at,
-                )
-            ]
-
-        last_message = req_messages[-1] if req_messages else None
-        last_text = last_message.text if last_message else "No messages yet"
-        last_time = (
-            last_message.created_at if last_message else req.created_at
-        ).strftime("%b %d, %Y")
+        session = _request_session(req)
+        summary = getattr(req, "summary", None)
+        if summary and summary.message_count:
+            last_text, last_at = summary.last_message_text, summary.last_message_at
+        elif req.note:
+            last_text, last_at = req.note, req.created_at
+        else:
+            last_text, last_at = "No messages yet", req.created_at
 
         conversations.append({
             "id": req.request_id,
             "name": other_name,
             "avatar": avatar,
             "lastMessage": last_text,
-            "time": last_time,
-            "unread": 0,
+            "time": last_at.strftime("%b %d, %Y"),
+            "unread": summary.unread_for(member.member_id) if summary else 0,
             "status": "offline",
             "requestStatus": req.status,
 
@@ -155,100 +230,38 @@ def _build_conversations_payload(member):
             ),
         })
 
-
-        messages_payload[req.request_id] = [
-            {
-                "id": msg.message_id,
-                "text": msg.text,
-                "sent": msg.sender_id == member.member_id,
-                "time": msg.created_at.strftime("%I:%M %p").lstrip("0"),
-            }
-            for msg in req_messages
-        ]
+    # Deltas carry the messages created since the cursor so open chats stay
+    # current; full syncs leave history to the paginated endpoint.
+    messages_payload = {}
+    if since and requests:
+        new_messages = Message.objects.filter(
+            request__in=requests, created_at__gt=since
+        ).order_by("created_at", "message_id")
+        for msg in new_messages:
+            messages_payload.setdefault(msg.request_id, []).append(
+                _serialize_message(msg, member)
+            )
 
     return conversations, messages_payload
 
 
 def _build_index_context(member, skills, extra=None):
-    all_skills = Skill.objects.select_related("member").all()
-    skills_payload = [
-        {
-            "id": skill.skill_id,
-            "skill_name": skill.skill_name,
-            "description": skill.description,
-            "category": skill.category,
-            "rate": skill.rate,
-            "rating": float(skill.rating) if skill.rating is not None else None,
-            "latitude": skill.latitude,
-            "longitude": skill.longitude,
-            "member_id": skill.member.member_id if skill.member else None,
-            "member_email": skill.member.email if skill.member else None,
-            "member_name": skill.member.full_name if skill.member else "Unknown",
-        }
-        for skill in all_skills
-    ]
-
-    conversations_payload, messages_payload = _build_conversations_payload(member)
-    pending_requests_count = (
-        SkillRequest.objects.filter(provider=member, status="pending").count()
-        if member
-        else 0
-    )
-    offers_count = (
-        Skill.objects.filter(member=member).count() if member else 0
-    )
-    total_requests_count = (
-        SkillRequest.objects.filter(Q(requester=member) | Q(provider=member)).count()
-        if member
-        else 0
-    )
-    
-    completed_sessions_count = (
-    ServiceSession.objects.filter(
-        Q(seeker=member) | Q(provider=member),
-        status="completed",
-    ).count()
-    if member
-    else 0
-    )
-    
-    pending_sessions_count = (
-    ServiceSession.objects.filter(
-        provider=member,
-        status="pending",
-    ).count()
-    if member
-    else 0
-    )
-    
-    pending_credits = (
-        ServiceSession.objects.filter(
-            seeker=member,
-            status="pending",
-        ).aggregate(total=Sum("hours"))["total"]
-        if member
-        else 0
-        ) or 0
+    # Only what the shell itself shows. The catalog, requests and
+    # conversations are fetched by the page from their own endpoints.
+    stats = get_member_stats(member)
     context = {
         "skills": skills,
         "member": member,
-        "current_member_id": member.member_id if member else None,
-        
-        # ✅ FIXED — JSON STRINGS
-        "all_skills_json": skills_payload,
-        "requests_json": _build_requests_payload(member),
-        "conversations_json": conversations_payload,
-        "messages_json": messages_payload,
-        "current_member_id": member.member_id if member else None,
-        "pending_requests_count": pending_requests_count,
-        "offers_count": offers_count,
-        "total_requests_count": total_requests_count,
-        "completed_sessions_count": completed_sessions_count,
-        "context_pending_sessions": pending_sessions_count,
-        "context_pending_credits": pending_credits,
+        "pending_requests_count": stats["pending_requests_count"],
+        "offers_count": stats["offers_count"],
+        "total_requests_count": stats["total_requests_count"],
+        "completed_sessions_count": stats["completed_sessions_count"],
+        "context_pending_sessions": stats["pending_sessions_count"],
+        "context_pending_credits": stats["pending_credits"],
+        "wallet_credits": stats["wallet_credits"],
+        "event_stream": settings.EVENT_STREAM_ENABLED,
     }
 
-
     if extra:
         context.update(extra)
 
@@ -257,41 +270,49 @@ def _build_index_context(member, skills, extra=None):
 def complete_service_session(session_id, member):
     session = get_object_or_404(ServiceSession, session_id=session_id)
 
-    if session.provider != member:
+    if session.provider_id != member.member_id:
         return {"error": "Unauthorized"}
 
     if session.status == "completed":
         return {"error": "Already completed"}
 
-    seeker_wallet = CreditWallet.objects.get(member=session.seeker)
-    provider_wallet = CreditWallet.objects.get(member=session.provider)
-
-    if seeker_wallet.credits < session.hours:
-        return {"error": "Seeker has insufficient credits"}
-
     with transaction.atomic():
-        seeker_wallet.credits -= session.hours
-        provider_wallet.credits += session.hours
-
-        seeker_wallet.save()
-        provider_wallet.save()
+        try:
+            settled = settle_session(session)
+        except InsufficientCredits:
+            return {"error": "Seeker has insufficient credits"}
+
+        if not settled:
+            return {"error": "Already completed"}
+
+        # Bump the request so delta syncs pick up the finished session.
+        if session.request_id:
+            SkillRequest.objects.filter(request_id=session.request_id).update(
+                updated_at=timezone.now()
+            )
 
-        session.status = "completed"
-        session.save()
+        publish_on_commit(
+            [session.seeker_id, session.provider_id],
+            "session",
+            {"session_id": session.session_id, "status": session.status},
+        )
+        # Everything that can lag behind the transfer goes to the job queue
+        # and commits with it, so this request's latency does not grow.
+        enqueue(
+            "refresh_member_features",
+            {"member_ids": [session.provider_id]},
+            key=f"session:{session.session_id}:features",
+        )
+        enqueue(
+            "reconcile_wallets",
+            {"member_ids": [session.seeker_id, session.provider_id]},
+            key=f"session:{session.session_id}:reconcile",
+        )
 
     return {"success": True}
 def get_available_credits(member):
-    wallet = CreditWallet.objects.get(member=member)
-
-    pending_hours = (
-        ServiceSession.objects.filter(
-            seeker=member,
-            status="pending"
-        ).aggregate(total=Sum("hours"))["total"]
-        or 0
-    )
-
-    return wallet.credits - pending_hours
+    stats = get_member_stats(member, fresh=True)
+    return stats["wallet_credits"] - stats["pending_credits"]
 
 def get_logged_in_member(request):
     if not request.user.is_authenticated:
@@ -300,17 +321,18 @@ def get_logged_in_member(request):
     if request.user.is_superuser:
         return None
 
-    member, _ = Member.objects.get_or_create(
-        email=request.user.email,
-        defaults={
-            "full_name": request.user.username,
-            "location": "Not set"
-        }
-    )
-    return member
+    # Memoised on the request and cached per user id between requests, so
+    # a sync poll resolves its member without touching the database.
+    if not hasattr(request, "_member"):
+        request._member = get_member_for_user(request.user)
+    return request._member
 
 
 # READ → Show logged-in user's skills
+# Seconds browsers may reuse the signed-out page without revalidating.
+ANONYMOUS_SHELL_MAX_AGE = 300
+
+
 def index(request):
     if request.user.is_authenticated:
         member = get_logged_in_member(request)
@@ -319,7 +341,14 @@ def index(request):
         member = None
         skills = []
 
-    return render(request, "index.html", _build_index_context(member, skills))
+    response = render(request, "index.html", _build_index_context(member, skills))
+    if request.user.is_authenticated:
+        return conditional_response(request, response)
+    # The signed-out shell is the same for everyone: no data and no CSRF
+    # token in the body (the page reads the token from its cookie).
+    return conditional_response(
+        request, response, public=True, max_age=ANONYMOUS_SHELL_MAX_AGE
+    )
 
 
 
@@ -331,15 +360,19 @@ def add_skill(request):
         if not member:
             return JsonResponse({"error": "Not logged in"}, status=403)
 
+        latitude = _parse_float(request.POST.get('latitude'))
+        longitude = _parse_float(request.POST.get('longitude'))
+        if _non_finite(latitude, longitude):
+            return JsonResponse({"error": "Coordinates must be finite numbers"}, status=400)
+
         Skill.objects.create(
             member=member,
             skill_name=request.POST.get('skill_name'),
             description=request.POST.get('description'),
             category=request.POST.get('category') or "education",
             rate=_parse_int(request.POST.get('rate'), default=1),
-            rating=_parse_float(request.POST.get('rating')) or 5.0,
-            latitude=_parse_float(request.POST.get('latitude')),
-            longitude=_parse_float(request.POST.get('longitude')),
+            latitude=latitude,
+            longitude=longitude,
         )
 
     return redirect('index')
@@ -381,16 +414,7 @@ def request_skill(request):
             }
         )
 
-    new_request = SkillRequest.objects.create(
-        skill=skill,
-        requester=member,
-        provider=skill.member,
-        status="pending",
-        note=note,
-    )
-
-    if note:
-        Message.objects.create(request=new_request, sender=member, text=note)
+    new_request = _create_skill_request(member, skill, note)
 
     return JsonResponse(
         {
@@ -399,6 +423,122 @@ def request_skill(request):
         }
     )
 
+
+# Write paths shared by the sync views and their async counterparts in
+# async_views, which call these through sync_to_async.
+def _create_skill_request(member, skill, note):
+    with transaction.atomic():
+        new_request = SkillRequest.objects.create(
+            skill=skill,
+            requester=member,
+            provider=skill.member,
+            status="pending",
+            note=note,
+        )
+        open_conversation(new_request)
+        if note:
+            post_message(new_request, member, note)
+
+    publish_on_commit(
+        [member.member_id, new_request.provider_id],
+        "request",
+        {"request_id": new_request.request_id},
+    )
+    return new_request
+
+
+def _set_request_status(skill_request, status, hours=1, starts_at=None):
+    # Raises SchedulingError before anything is saved if the slot is taken.
+    with transaction.atomic():
+        ends_at = None
+        # A request that already has its session keeps it (get_or_create
+        # below), so there is nothing new to book.
+        if (
+            status == "accepted"
+            and starts_at is not None
+            and _request_session(skill_request) is None
+        ):
+            ends_at = ensure_bookable(
+                skill_request.provider_id, skill_request.requester_id, starts_at, hours
+            )
+
+        skill_request.status = status
+        skill_request.save()
+
+        if status == "accepted":
+            ServiceSession.objects.get_or_create(
+                request=skill_request,
+                defaults={
+                    "skill": skill_request.skill,
+                    "seeker": skill_request.requester,
+                    "provider": skill_request.provider,
+                    "hours": hours,
+                    "status": "pending",
+                    "starts_at": starts_at,
+                    "ends_at": ends_at,
+                },
+            )
+
+    publish_on_commit(
+        [skill_request.requester_id, skill_request.provider_id],
+        "request",
+        {"request_id": skill_request.request_id, "status": skill_request.status},
+    )
+    enqueue("refresh_member_features", {"member_ids": [skill_request.provider_id]})
+
+
+def _store_message(skill_request, member, text):
+    message = post_message(skill_request, member, text)
+    publish_on_commit(
+        [skill_request.requester_id, skill_request.provider_id],
+        "message",
+        {"request_id": skill_request.request_id, "message_id": message.message_id},
+    )
+    return message
+
+
+def _parse_when(parse, value):
+    # dateparse returns None for malformed text but raises ValueError for a
+    # well-formed impossible value such as 2026-02-30.
+    try:
+        return parse(value)
+    except (TypeError, ValueError):
+        return None
+
+
+def _parse_booking(data):
+    """Return ``(starts_at, hours)`` from an accept payload; the slot is optional."""
+    hours = data.get("hours")
+    # Hours are both the booked length and the charge, so anything but a
+    # whole number is refused rather than rounded.
+    hours = 1 if hours in (None, "") else _parse_whole(hours)
+    if hours is None:
+        raise SchedulingError("hours must be a whole number")
+    if not 1 <= hours <= MAX_SESSION_HOURS:
+        raise SchedulingError(f"Sessions last 1 to {MAX_SESSION_HOURS} hours")
+    value = data.get("starts_at")
+    if not value:
+        return None, hours
+    starts_at = _parse_when(parse_datetime, value)
+    if starts_at is None:
+        raise SchedulingError("starts_at must be an ISO 8601 date and time")
+    if timezone.is_naive(starts_at):
+        starts_at = timezone.make_aware(starts_at)
+    return starts_at, hours
+
+
+def _scheduling_error(error):
+    status = 409 if isinstance(error, SchedulingConflict) else 400
+    return JsonResponse({"error": str(error)}, status=status)
+
+
+def _message_payload(message):
+    return {
+        "id": message.message_id,
+        "text": message.text,
+        "time": message.created_at.strftime("%I:%M %p").lstrip("0"),
+    }
+
 def update_request(request):
     if request.method != "POST":
         return JsonResponse({"error": "Invalid request method"}, status=405)
@@ -425,7 +565,12 @@ def update_request(request):
 
     if action == "accept":
         seeker = skill_request.requester
-        required_credits = 1  
+        try:
+            starts_at, required_credits = _parse_booking(
+                {**request.POST.dict(), **data}
+            )
+        except SchedulingError as error:
+            return _scheduling_error(error)
 
         available_credits = get_available_credits(seeker)
 
@@ -438,23 +583,15 @@ def update_request(request):
                 status=400,
             )
 
-        skill_request.status = "accepted"
-        skill_request.save()
-
-        ServiceSession.objects.get_or_create(
-            request=skill_request,
-            defaults={
-                "skill": skill_request.skill,
-                "seeker": seeker,
-                "provider": skill_request.provider,
-                "hours": required_credits,
-                "status": "pending",
-            },
-        )
+        try:
+            _set_request_status(
+                skill_request, "accepted", hours=required_credits, starts_at=starts_at
+            )
+        except SchedulingError as error:
+            return _scheduling_error(error)
 
     else:
-        skill_request.status = "declined"
-        skill_request.save()
+        _set_request_status(skill_request, "declined")
 
     return JsonResponse({"status": skill_request.status})
 
@@ -481,20 +618,38 @@ def send_message(request):
     if skill_request.requester != member and skill_request.provider != member:
         return JsonResponse({"error": "Unauthorized"}, status=403)
 
-    message = Message.objects.create(
-        request=skill_request,
-        sender=member,
-        text=text,
-    )
+    message = _store_message(skill_request, member, text)
 
-    return JsonResponse(
-        {
-            "id": message.message_id,
-            "text": message.text,
-            "time": message.created_at.strftime("%I:%M %p").lstrip("0"),
-        }
+    return JsonResponse(_message_payload(message))
+
+# The cursor never advances past "now minus this window", so a write that
+# commits slightly after a poll read past its timestamp is still delivered
+# by the next poll. The client merges by id, so re-sent rows are harmless.
+SYNC_CURSOR_OVERLAP = timedelta(seconds=2)
+
+
+def _parse_sync_cursor(value):
+    try:
+        cursor = parse_datetime(value) if value else None
+    except ValueError:
+        return None
+    if cursor is not None and timezone.is_naive(cursor):
+        cursor = timezone.make_aware(cursor)
+    return cursor
+
+
+def _latest_change_at(member):
+    member_requests = SkillRequest.objects.filter(
+        Q(requester=member) | Q(provider=member)
     )
+    latest_request = member_requests.aggregate(latest=Max("updated_at"))["latest"]
+    latest_message = ConversationSummary.objects.filter(
+        request__in=member_requests.values("request_id")
+    ).aggregate(latest=Max("last_message_at"))["latest"]
+    return max(filter(None, [latest_request, latest_message]), default=None)
+
 
+@content_etag
 def sync_data(request):
     if request.method != "GET":
         return JsonResponse({"error": "Invalid request method"}, status=405)
@@ -503,25 +658,310 @@ def sync_data(request):
     if not member:
         return JsonResponse({"error": "Not logged in"}, status=403)
 
-    wallet = CreditWallet.objects.get(member=member)
+    # The cursor is the newest change timestamp the client has seen. Without
+    # one (first poll, or an unparseable value) everything is sent.
+    since = _parse_sync_cursor(request.GET.get("since"))
+    cursor = _sync_cursor(_latest_change_at(member), since)
+
+    stats = get_member_stats(member)
+
+    conversations_payload, messages_payload = _build_conversations_payload(
+        member, since=since
+    )
+
+    return JsonResponse(_sync_payload(
+        since,
+        cursor,
+        _build_requests_payload(member, since=since),
+        conversations_payload,
+        messages_payload,
+        stats,
+    ))
+
+
+def _sync_cursor(latest, since):
+    if latest:
+        latest = min(latest, timezone.now() - SYNC_CURSOR_OVERLAP)
+    if since and (latest is None or latest < since):
+        latest = since
+    return latest
+
+
+def _sync_payload(since, cursor, requests, conversations, messages, stats):
+    return {
+        "delta": since is not None,
+        "cursor": cursor.isoformat() if cursor else None,
+        "requests": requests,
+        "conversations": conversations,
+        "messages": messages,
+        "wallet_credits": stats["wallet_credits"],
+        "pending_credits": stats["pending_credits"],
+    }
+
+# READ → Page bootstrap slices, each revalidated by its own ETag. Both carry
+# the sync cursor their data is current to, so the page polls deltas next.
+def _bootstrap_cursor(member):
+    cursor = _sync_cursor(_latest_change_at(member), None)
+    return cursor.isoformat() if cursor else None
+
+
+@content_etag
+def member_requests(request):
+    if request.method != "GET":
+        return JsonResponse({"error": "Invalid request method"}, status=405)
+
+    member = get_logged_in_member(request)
+    if not member:
+        return JsonResponse({"error": "Not logged in"}, status=403)
+
+    cursor = _bootstrap_cursor(member)
+    return JsonResponse({"cursor": cursor, "requests": _build_requests_payload(member)})
+
+
+@content_etag
+def member_conversations(request):
+    if request.method != "GET":
+        return JsonResponse({"error": "Invalid request method"}, status=405)
+
+    member = get_logged_in_member(request)
+    if not member:
+        return JsonResponse({"error": "Not logged in"}, status=403)
+
+    # Messages are not included: each chat loads its history when opened.
+    cursor = _bootstrap_cursor(member)
+    conversations, _ = _build_conversations_payload(member)
+    return JsonResponse({"cursor": cursor, "conversations": conversations})
+
 
-    pending_credits = (
-        ServiceSession.objects.filter(
-            seeker=member,
-            status="pending"
-        ).aggregate(total=Sum("hours"))["total"] or 0
+# READ → Sets the CSRF cookie for pages served without a token in the body
+@never_cache
+@ensure_csrf_cookie
+def csrf_cookie(request):
+    return HttpResponse(status=204)
+
+
+# READ → Per-view request metrics in Prometheus text format
+def metrics(request):
+    if client_address(request) not in settings.METRICS_ALLOWED_IPS:
+        return HttpResponse(status=403)
+    return HttpResponse(
+        metrics_registry.render(), content_type="text/plain; version=0.0.4"
     )
 
-    conversations_payload, messages_payload = _build_conversations_payload(member)
+
+# READ → Whole skill catalog, revalidated by version ETag
+@read_only
+@condition(etag_func=lambda request: catalog_etag())
+def skills_catalog(request):
+    if request.method != "GET":
+        return JsonResponse({"error": "Invalid request method"}, status=405)
+
+    catalog = get_catalog_snapshot()
+    response = HttpResponse(catalog["json"], content_type="application/json")
+    response["ETag"] = catalog_etag(catalog["version"])
+    response["Cache-Control"] = "no-cache"
+    return response
+
+MAX_SEARCH_RADIUS_KM = 100
+MAX_SKILLS_PAGE_SIZE = 100
+MAX_MATCHES = 50
+
+
+# READ → Full-text skill search, best match first
+@read_only
+def skills_search(request):
+    if request.method != "GET":
+        return JsonResponse({"error": "Invalid request method"}, status=405)
+
+    page = max(_parse_int(request.GET.get("page"), default=1), 1)
+    page_size = _parse_int(request.GET.get("page_size"), default=20)
+    page_size = min(max(page_size, 1), MAX_SKILLS_PAGE_SIZE)
+
+    skills, total = search_skills(
+        request.GET.get("q", ""),
+        category=request.GET.get("category") or None,
+        limit=page_size,
+        offset=(page - 1) * page_size,
+    )
+
+    return JsonResponse({
+        "results": [serialize_skill(skill) for skill in skills],
+        "count": total,
+        "page": page,
+        "page_size": page_size,
+        "has_next": page * page_size < total,
+    })
+
+# READ → Best providers for a query near a point
+@read_only
+def match_providers(request):
+    if request.method != "GET":
+        return JsonResponse({"error": "Invalid request method"}, status=405)
+
+    lat = _parse_float(request.GET.get("lat"))
+    lng = _parse_float(request.GET.get("lng"))
+    radius = _parse_float(request.GET.get("radius"))
+    if _non_finite(lat, lng, radius):
+        return JsonResponse({"error": "lat, lng and radius must be finite"}, status=400)
+    if lat is None or lng is None:
+        lat = lng = radius = None
+    elif radius is None or radius <= 0:
+        radius = 10
+    if radius:
+        radius = min(radius, MAX_SEARCH_RADIUS_KM)
+
+    k = min(max(_parse_int(request.GET.get("k"), default=10), 1), MAX_MATCHES)
+
+    matches = rank_providers(
+        query=request.GET.get("q", ""),
+        lat=lat,
+        lng=lng,
+        radius_km=radius,
+        k=k,
+        category=request.GET.get("category") or None,
+        exclude_member=get_logged_in_member(request),
+    )
+
+    results = []
+    for score, distance, skill, signals in matches:
+        item = serialize_skill(skill)
+        item["score"] = round(score, 4)
+        item["signals"] = {name: round(value, 4) for name, value in signals.items()}
+        item["distance_km"] = round(distance, 2) if distance is not None else None
+        results.append(item)
+
+    return JsonResponse({"results": results})
+
+
+MESSAGES_PAGE_SIZE = 50
+MAX_MESSAGES_PAGE_SIZE = 200
+
+
+# READ → One page of a conversation, newest page first
+def conversation_messages(request, request_id):
+    if request.method != "GET":
+        return JsonResponse({"error": "Invalid request method"}, status=405)
+
+    member = get_logged_in_member(request)
+    if not member:
+        return JsonResponse({"error": "Not logged in"}, status=403)
+
+    skill_request = get_object_or_404(SkillRequest, request_id=request_id)
+    if member.member_id not in (skill_request.requester_id, skill_request.provider_id):
+        return JsonResponse({"error": "Unauthorized"}, status=403)
+
+    limit = _parse_int(request.GET.get("limit"), default=MESSAGES_PAGE_SIZE)
+    limit = min(max(limit, 1), MAX_MESSAGES_PAGE_SIZE)
+
+    # Keyset pagination on (created_at, message_id): "before" is the oldest
+    # message the client already holds, so pages stay stable as new
+    # messages arrive.
+    messages = Message.objects.filter(request=skill_request)
+    before_at = _parse_sync_cursor(request.GET.get("before_at"))
+    before_id = _parse_int(request.GET.get("before_id"), default=None)
+    if before_at is not None and before_id is not None:
+        messages = messages.filter(
+            Q(created_at__lt=before_at)
+            | Q(created_at=before_at, message_id__lt=before_id)
+        )
+
+    page = list(messages.order_by("-created_at", "-message_id")[:limit + 1])
+    has_more = len(page) > limit
+    page = page[:limit][::-1]
+
+    if not page and before_at is None and skill_request.note:
+        page = [_note_placeholder(skill_request)]
+
+    oldest = page[0] if page and page[0].message_id else None
+    return JsonResponse({
+        "messages": [_serialize_message(msg, member) for msg in page],
+        "has_more": has_more,
+        "before_at": oldest.created_at.isoformat() if oldest else None,
+        "before_id": oldest.message_id if oldest else None,
+    })
+
+# UPDATE → Clear the caller's unread counter for a conversation
+def mark_conversation_read(request, request_id):
+    if request.method != "POST":
+        return JsonResponse({"error": "Invalid request method"}, status=405)
+
+    member = get_logged_in_member(request)
+    if not member:
+        return JsonResponse({"error": "Not logged in"}, status=403)
+
+    skill_request = get_object_or_404(SkillRequest, request_id=request_id)
+    if member.member_id not in (skill_request.requester_id, skill_request.provider_id):
+        return JsonResponse({"error": "Unauthorized"}, status=403)
+
+    mark_read(skill_request, member)
+    return JsonResponse({"unread": 0})
+
+# READ → Skills near a point, nearest first
+@read_only
+def skills_nearby(request):
+    if request.method != "GET":
+        return JsonResponse({"error": "Invalid request method"}, status=405)
+
+    lat = _parse_float(request.GET.get("lat"))
+    lng = _parse_float(request.GET.get("lng"))
+    radius = _parse_float(request.GET.get("radius"))
+
+    if _non_finite(lat, lng, radius):
+        return JsonResponse({"error": "lat, lng and radius must be finite"}, status=400)
+    if lat is None or lng is None or not (-90 <= lat <= 90 and -180 <= lng <= 180):
+        return JsonResponse({"error": "Valid lat and lng required"}, status=400)
+    if radius is None or radius <= 0:
+        radius = 1
+    radius = min(radius, MAX_SEARCH_RADIUS_KM)
+
+    page = max(_parse_int(request.GET.get("page"), default=1), 1)
+    page_size = _parse_int(request.GET.get("page_size"), default=20)
+    page_size = min(max(page_size, 1), MAX_SKILLS_PAGE_SIZE)
+
+    skills = Skill.objects.select_related("member")
+    member = get_logged_in_member(request)
+    if member:
+        skills = skills.exclude(member=member)
+
+    start = (page - 1) * page_size
+    matches, count = skills_within_radius(
+        skills, lat, lng, radius, offset=start, limit=page_size
+    )
+    results = []
+    for skill, distance in matches:
+        item = serialize_skill(skill)
+        item["distance_km"] = round(distance, 2)
+        results.append(item)
 
     return JsonResponse({
-        "requests": _build_requests_payload(member),
-        "conversations": conversations_payload,
-        "messages": messages_payload,
-        "wallet_credits": wallet.credits,
-        "pending_credits": pending_credits,
+        "results": results,
+        "count": count,
+        "page": page,
+        "page_size": page_size,
+        "has_next": start + page_size < count,
     })
 
+# STREAM → Push request/message/session events (needs ASGI)
+async def event_stream(request):
+    if request.method != "GET":
+        return JsonResponse({"error": "Invalid request method"}, status=405)
+
+    # A WSGI handler buffers a streaming body before sending it, so this
+    # endless stream would hang the worker instead of reaching the client.
+    if not isinstance(request, ASGIRequest):
+        return JsonResponse({"error": "Event stream needs ASGI"}, status=501)
+
+    member = await sync_to_async(get_logged_in_member)(request)
+    if not member:
+        return JsonResponse({"error": "Not logged in"}, status=403)
+
+    response = StreamingHttpResponse(
+        stream_events(member.member_id), content_type="text/event-stream"
+    )
+    response["Cache-Control"] = "no-cache"
+    response["X-Accel-Buffering"] = "no"
+    return response
+
 # DELETE → Remove skill (only owner can delete)
 def delete_skill(request, skill_id):
     member = get_logged_in_member(request)
@@ -590,10 +1030,11 @@ def signup_user(request):
         member = Member.objects.create(
             full_name=name,
             email=email,
-            location="Not set"
+            location="Not set",
+            user=user
         )
         
-        CreditWallet.objects.create(member=member, credits=10)  
+        open_wallet(member, credits=10)
         
         login(request, user)
         return redirect("index")   # ✅ MAIN PAGE
@@ -618,6 +1059,155 @@ def complete_session(request):
 
     return JsonResponse({"status": "completed"})
 
+
+def submit_review(request):
+    if request.method != "POST":
+        return JsonResponse({"error": "Invalid request method"}, status=405)
+
+    member = get_logged_in_member(request)
+    if not member:
+        return JsonResponse({"error": "Not logged in"}, status=403)
+
+    try:
+        data = json.loads(request.body.decode("utf-8")) if request.body else {}
+    except json.JSONDecodeError:
+        data = {}
+    session = get_object_or_404(ServiceSession, session_id=data.get("session_id"))
+
+    rating = _parse_whole(data.get("rating"))
+    if rating is None or not 1 <= rating <= 5:
+        return JsonResponse({"error": "rating must be a whole number from 1 to 5"}, status=400)
+
+    try:
+        review = create_review(session, member, rating, (data.get("comment") or "").strip())
+    except ReviewError as error:
+        return JsonResponse({"error": str(error)}, status=400)
+
+    return JsonResponse({"review_id": review.review_id, "rating": review.rating})
+
+
+SLOT_SEARCH_DAYS = 7
+MAX_SLOTS = 100
+
+
+# READ → A provider's bookable slots over the next few days
+@read_only
+def provider_slots(request, member_id):
+    if request.method != "GET":
+        return JsonResponse({"error": "Invalid request method"}, status=405)
+
+    provider = get_object_or_404(Member, member_id=member_id)
+    day = timezone.localdate()
+    if request.GET.get("from"):
+        day = _parse_when(parse_date, request.GET["from"])
+        if day is None:
+            return JsonResponse({"error": "from must be an ISO 8601 date"}, status=400)
+    days = min(max(_parse_int(request.GET.get("days"), SLOT_SEARCH_DAYS), 1), MAX_SEARCH_DAYS)
+    hours = min(max(_parse_int(request.GET.get("hours"), 1), 1), MAX_SESSION_HOURS)
+    limit = min(max(_parse_int(request.GET.get("limit"), MAX_SLOTS), 1), MAX_SLOTS)
+
+    start = timezone.make_aware(datetime.combine(day, datetime.min.time()))
+    slots = find_free_slots(
+        provider.member_id, start, start + timedelta(days=days), hours=hours, limit=limit
+    )
+    return JsonResponse(
+        {
+            "provider_id": provider.member_id,
+            "hours": hours,
+            "slots": [
+                {"starts_at": starts_at.isoformat(), "ends_at": ends_at.isoformat()}
+                for starts_at, ends_at in slots
+            ],
+        }
+    )
+
+
+def _clock(value):
+    return value.strftime("%H:%M") if value else None
+
+
+def _availability_payload(member):
+    windows = AvailabilityWindow.objects.filter(provider=member).order_by(
+        "weekday", "start_time"
+    )
+    exceptions = AvailabilityException.objects.filter(
+        provider=member, date__gte=timezone.localdate()
+    ).order_by("date", "start_time")
+    return {
+        "windows": [
+            {
+                "weekday": window.weekday,
+                "start": _clock(window.start_time),
+                "end": _clock(window.end_time),
+            }
+            for window in windows
+        ],
+        "exceptions": [
+            {
+                "date": exception.date.isoformat(),
+                "start": _clock(exception.start_time),
+                "end": _clock(exception.end_time),
+                "available": exception.available,
+            }
+            for exception in exceptions
+        ],
+    }
+
+
+def _parse_availability(data):
+    def clock(value):
+        parsed = _parse_when(parse_time, value) if value else None
+        if value and parsed is None:
+            raise SchedulingError(f"Invalid time: {value}")
+        return parsed
+
+    def entries(key):
+        items = data.get(key) or []
+        if not isinstance(items, list) or not all(isinstance(item, dict) for item in items):
+            raise SchedulingError(f"{key} must be a list of objects")
+        return items
+
+    if not isinstance(data, dict):
+        raise SchedulingError("Expected a JSON object")
+
+    windows = []
+    for item in entries("windows"):
+        start, end = clock(item.get("start")), clock(item.get("end"))
+        if start is None or end is None:
+            raise SchedulingError("Each window needs a start and an end")
+        windows.append((_parse_int(item.get("weekday"), -1), start, end))
+
+    exceptions = []
+    for item in entries("exceptions"):
+        day = _parse_when(parse_date, item.get("date") or "")
+        if day is None:
+            raise SchedulingError("Each exception needs a date")
+        exceptions.append(
+            (day, clock(item.get("start")), clock(item.get("end")), bool(item.get("available")))
+        )
+    return windows, exceptions
+
+
+# READ/UPDATE → The logged-in member's weekly hours and exceptions
+def availability(request):
+    member = get_logged_in_member(request)
+    if not member:
+        return JsonResponse({"error": "Not logged in"}, status=403)
+
+    if request.method == "POST":
+        try:
+            data = json.loads(request.body.decode("utf-8")) if request.body else {}
+        except json.JSONDecodeError:
+            data = {}
+        try:
+            set_availability(member, *_parse_availability(data))
+        except SchedulingError as error:
+            return JsonResponse({"error": str(error)}, status=400)
+    elif request.method != "GET":
+        return JsonResponse({"error": "Invalid request method"}, status=405)
+
+    return JsonResponse(_availability_payload(member))
+
 def logout_user(request):
     logout(request)
     return redirect("index")
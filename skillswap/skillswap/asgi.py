@@ -12,5 +12,7 @@ import os
 from django.core.asgi import get_asgi_application
 
 os.environ.setdefault('DJANGO_SETTINGS_MODULE', 'skillswap.settings')
+# Under ASGI the JSON API views run natively async (see members.async_views).
+os.environ.setdefault('SKILLSWAP_ASYNC_VIEWS', '1')
 
 application = get_asgi_application()
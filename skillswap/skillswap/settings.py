@@ -10,6 +10,7 @@ For the full list of settings and their values, see
 https://docs.djangoproject.com/en/6.0/ref/settings/
 """
 
+import os
 from pathlib import Path
 
 # Build paths inside the project like this: BASE_DIR / 'subdir'.
@@ -41,6 +42,8 @@ INSTALLED_APPS = [
 ]
 
 MIDDLEWARE = [
+    'members.metrics.QueryMetricsMiddleware',
+    'members.responses.JsonCompressionMiddleware',
     'django.middleware.security.SecurityMiddleware',
     'django.contrib.sessions.middleware.SessionMiddleware',
     'django.middleware.common.CommonMiddleware',
@@ -73,6 +76,37 @@ WSGI_APPLICATION = 'skillswap.wsgi.application'
 # Database
 # https://docs.djangoproject.com/en/6.0/ref/settings/#databases
 
+# SKILLSWAP_DB_PROFILE picks the connection setup:
+#   "tuned" (default) - WAL journal so readers never wait on the writer,
+#                       relaxed fsync, a busy timeout instead of instant
+#                       "database is locked" errors, and reused
+#                       connections under WSGI.
+#   "plain"           - Django's stock SQLite settings.
+# SKILLSWAP_DB_REPLICA, when set to a database file, adds a read-only
+# "replica" connection that views marked with members.routers.read_only
+# read from. Pointing it at the primary file gives those reads their own
+# connection, which WAL lets run alongside writes.
+
+DB_PROFILE = os.environ.get('SKILLSWAP_DB_PROFILE', 'tuned')
+DB_REPLICA = os.environ.get('SKILLSWAP_DB_REPLICA', '')
+
+# Persistent connections pay off under WSGI, where a fixed pool of worker
+# threads serves every request. Under ASGI (asgi.py sets
+# SKILLSWAP_ASYNC_VIEWS) sync code runs on short-lived executor threads, so
+# each would keep a connection nobody reuses; close them per request.
+DB_CONN_MAX_AGE = 0 if os.environ.get('SKILLSWAP_ASYNC_VIEWS') == '1' else 600
+
+# Applied on every new connection. journal_mode is persistent in the file,
+# the rest are per connection.
+SQLITE_PRAGMAS = [
+    'PRAGMA journal_mode=WAL',
+    'PRAGMA synchronous=NORMAL',
+    'PRAGMA busy_timeout=5000',
+    'PRAGMA mmap_size=134217728',
+    'PRAGMA cache_size=-20000',
+    'PRAGMA temp_store=MEMORY',
+]
+
 DATABASES = {
     'default': {
         'ENGINE': 'django.db.backends.sqlite3',
@@ -80,6 +114,85 @@ DATABASES = {
     }
 }
 
+if DB_PROFILE == 'tuned':
+    DATABASES['default'].update({
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            'init_command': ';'.join(SQLITE_PRAGMAS),
+            # Seconds sqlite3 waits on a locked database before raising.
+            'timeout': 5,
+            # Take the write lock when the transaction starts, so two
+            # writers queue on the busy timeout instead of deadlocking on a
+            # read-to-write upgrade.
+            'transaction_mode': 'IMMEDIATE',
+        },
+    })
+
+if DB_REPLICA:
+    DATABASES['replica'] = {
+        'ENGINE': 'django.db.backends.sqlite3',
+        'NAME': f'file:{DB_REPLICA}?mode=ro',
+        'CONN_MAX_AGE': DB_CONN_MAX_AGE,
+        'CONN_HEALTH_CHECKS': True,
+        'OPTIONS': {
+            # journal_mode cannot be changed on a read-only connection.
+            'init_command': ';'.join(SQLITE_PRAGMAS[1:]),
+            'timeout': 5,
+        },
+        'TEST': {'MIRROR': 'default'},
+    }
+    DATABASE_ROUTERS = ['members.routers.ReadReplicaRouter']
+
+# Cache
+# https://docs.djangoproject.com/en/6.0/topics/cache/
+# Point this at a shared backend (e.g. Redis or Memcached) when running more
+# than one process, so catalog invalidations reach every worker.
+
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+        'LOCATION': 'skillswap',
+    }
+}
+
+
+# Serve sync_data, send_message, request_skill and update_request from
+# members.async_views. asgi.py switches this on; WSGI keeps the sync views.
+
+ASYNC_API_VIEWS = os.environ.get('SKILLSWAP_ASYNC_VIEWS') == '1'
+
+# /events/ holds its response open for as long as the tab stays open, which
+# only an ASGI server can do; under WSGI the route is not registered and the
+# page keeps polling.
+EVENT_STREAM_ENABLED = ASYNC_API_VIEWS
+
+
+# JSON responses are encoded with orjson when it is installed ("auto");
+# set "json" to force the standard library encoder, or "orjson" to refuse to
+# start without orjson.
+
+JSON_SERIALIZER = os.environ.get('SKILLSWAP_JSON_SERIALIZER', 'auto')
+
+
+# Request metrics
+# Per-view timings and query counts are served at /metrics/ to these
+# client addresses only; requests slower than SLOW_REQUEST_MS are logged
+# with their query shapes.
+#
+# Behind a reverse proxy REMOTE_ADDR is the proxy itself. List the proxy
+# addresses in SKILLSWAP_TRUSTED_PROXIES (comma separated) and the client
+# is read from X-Forwarded-For instead; the header is ignored when the
+# request did not come through one of them, so it cannot be spoofed.
+
+METRICS_ALLOWED_IPS = ['127.0.0.1', '::1']
+TRUSTED_PROXIES = [
+    address.strip()
+    for address in os.environ.get('SKILLSWAP_TRUSTED_PROXIES', '').split(',')
+    if address.strip()
+]
+SLOW_REQUEST_MS = 500
+
 
 # Password validation
 # https://docs.djangoproject.com/en/6.0/ref/settings/#auth-password-validators
@@ -120,6 +233,21 @@ STATIC_URL = 'static/'
 STATICFILES_DIRS = [
     BASE_DIR / "static",
 ]
+
+STATIC_ROOT = BASE_DIR / 'staticfiles'
+
+# SKILLSWAP_STATIC_MODE=production serves the fingerprinted, minified and
+# precompressed files that `manage.py build_static` writes to STATIC_ROOT,
+# with far-future cache headers (see members.assets). Under runserver pass
+# --nostatic, or its own handler serves STATICFILES_DIRS instead.
+STATIC_MODE = os.environ.get('SKILLSWAP_STATIC_MODE', 'dev')
+
+if STATIC_MODE == 'production':
+    STORAGES = {
+        'default': {'BACKEND': 'django.core.files.storage.FileSystemStorage'},
+        'staticfiles': {'BACKEND': 'members.assets.CompressedManifestStaticFilesStorage'},
+    }
+    MIDDLEWARE.insert(0, 'members.assets.StaticFilesMiddleware')
 LOGIN_URL = '/accounts/login/'
 LOGIN_REDIRECT_URL = '/'
 LOGOUT_REDIRECT_URL = '/accounts/login/'
@@ -153,15 +153,11 @@ defaultSampleSkills.forEach((skill) => {
   skill.isSample = true;
 });
 
-const serverSkillsRaw = Array.isArray(window.SKILLSWAP_SERVER_SKILLS)
-  ? window.SKILLSWAP_SERVER_SKILLS
-  : [];
-const currentMemberIdRaw = window.SKILLSWAP_CURRENT_MEMBER_ID;
+// The page shell carries no data; see loadBootstrapData().
+const currentMemberIdRaw = document.body.dataset.memberId;
 const currentMemberId = Number(currentMemberIdRaw);
 const hasCurrentMember =
-  currentMemberIdRaw !== null &&
-  currentMemberIdRaw !== undefined &&
-  Number.isFinite(currentMemberId);
+  Boolean(currentMemberIdRaw) && Number.isFinite(currentMemberId);
 
 function normalizeServerSkill(skill, takenIds) {
   const name = (skill?.member_name || "Unknown").trim();
@@ -183,6 +179,7 @@ function normalizeServerSkill(skill, takenIds) {
 
   return {
     id,
+    serverId: Number(skill?.id),
     title: skill?.skill_name || "Untitled Skill",
     category: skill?.category || "education",
     description: skill?.description || "",
@@ -199,16 +196,19 @@ function normalizeServerSkill(skill, takenIds) {
   };
 }
 
-const takenIds = new Set(defaultSampleSkills.map((skill) => skill.id));
-const serverSkills = serverSkillsRaw
-  .filter((skill) => {
-    if (!hasCurrentMember) return true;
-    const skillMemberId = Number(skill?.member_id);
-    return !Number.isFinite(skillMemberId) || skillMemberId !== currentMemberId;
-  })
-  .map((skill) => normalizeServerSkill(skill, takenIds));
+let sampleSkills = [...defaultSampleSkills];
 
-const sampleSkills = [...defaultSampleSkills, ...serverSkills];
+function setServerSkills(serverSkillsRaw) {
+  const takenIds = new Set(defaultSampleSkills.map((skill) => skill.id));
+  const serverSkills = serverSkillsRaw
+    .filter((skill) => {
+      if (!hasCurrentMember) return true;
+      const skillMemberId = Number(skill?.member_id);
+      return !Number.isFinite(skillMemberId) || skillMemberId !== currentMemberId;
+    })
+    .map((skill) => normalizeServerSkill(skill, takenIds));
+  sampleSkills = [...defaultSampleSkills, ...serverSkills];
+}
 // const sampleSkills =
 //   hasCurrentMember && serverSkills.length > 0
 //     ? serverSkills
@@ -257,15 +257,8 @@ const defaultSampleRequests = [
   },
 ];
 
-const serverRequestsRaw = Array.isArray(window.SKILLSWAP_SERVER_REQUESTS)
-  ? window.SKILLSWAP_SERVER_REQUESTS
-  : [];
-
-const hasServerRequests = Array.isArray(window.SKILLSWAP_SERVER_REQUESTS);
-const useServerRequests = hasServerRequests && hasCurrentMember;
-let requestsData = useServerRequests
-  ? serverRequestsRaw
-  : defaultSampleRequests;
+// Members start empty and are filled by loadBootstrapData().
+let requestsData = hasCurrentMember ? [] : defaultSampleRequests;
 
 const defaultSampleConversations = [
   {
@@ -361,31 +354,8 @@ const defaultSampleMessages = {
   ],
 };
 
-const serverConversationsRaw = Array.isArray(
-  window.SKILLSWAP_SERVER_CONVERSATIONS,
-)
-  ? window.SKILLSWAP_SERVER_CONVERSATIONS
-  : [];
-const serverMessagesRaw =
-  window.SKILLSWAP_SERVER_MESSAGES &&
-  typeof window.SKILLSWAP_SERVER_MESSAGES === "object"
-    ? window.SKILLSWAP_SERVER_MESSAGES
-    : {};
-
-const hasServerConversations = Array.isArray(
-  window.SKILLSWAP_SERVER_CONVERSATIONS,
-);
-const hasServerMessages = window.SKILLSWAP_SERVER_MESSAGES !== undefined;
-
-const useServerConversations = hasCurrentMember && hasServerConversations;
-const useServerMessages = hasCurrentMember && hasServerMessages;
-
-let conversationsData = useServerConversations
-  ? serverConversationsRaw
-  : defaultSampleConversations;
-let messagesData = useServerMessages
-  ? serverMessagesRaw
-  : defaultSampleMessages;
+let conversationsData = hasCurrentMember ? [] : defaultSampleConversations;
+let messagesData = hasCurrentMember ? {} : defaultSampleMessages;
 
 // Experience level mapping (slider values are 1-5)
 const EXPERIENCE_MAP = [
@@ -440,6 +410,19 @@ function getCookie(name) {
   return "";
 }
 
+// The page is served without a CSRF token (so it can be cached); forms take
+// theirs from the cookie, which /api/csrf/ sets when it is missing.
+function ensureCsrfCookie() {
+  if (getCookie("csrftoken")) return;
+  fetch("/api/csrf/", { credentials: "same-origin" }).catch(() => {});
+}
+
+function fillCsrfInputs(form) {
+  form.querySelectorAll("[data-csrf-input]").forEach((input) => {
+    input.value = getCookie("csrftoken");
+  });
+}
+
 function getRequestNote() {
   const noteInput = document.getElementById("request-note");
   if (noteInput) {
@@ -454,6 +437,8 @@ function getRequestNote() {
 
 let syncIntervalId = null;
 let syncInFlight = false;
+let syncCursor = null;
+let syncQueued = false;
 
 function updatePendingRequestsCount() {
   const line = document.getElementById("pending-requests-line");
@@ -503,11 +488,109 @@ function refreshMessagesView() {
   renderMessages();
 }
 
+function mergeById(existing, updates, prepend = false) {
+  const updatesById = new Map(updates.map((item) => [item.id, item]));
+  const merged = existing.map((item) => {
+    const update = updatesById.get(item.id);
+    if (!update) return item;
+    updatesById.delete(item.id);
+    return update;
+  });
+  const added = [...updatesById.values()];
+  return prepend ? [...added, ...merged] : [...merged, ...added];
+}
+
+function combineMessages(existing, incoming) {
+  const byId = new Map(existing.map((msg) => [msg.id, msg]));
+  incoming.forEach((msg) => byId.set(msg.id, msg));
+  const combined = [...byId.values()].sort((a, b) => a.id - b.id);
+  // Drop the note placeholder (id 0) once real messages arrive.
+  const real = combined.filter((msg) => msg.id);
+  return real.length ? real : combined;
+}
+
+function mergeMessages(existing, updates) {
+  const merged = { ...existing };
+  Object.entries(updates).forEach(([requestId, messages]) => {
+    merged[requestId] = combineMessages(merged[requestId] || [], messages);
+  });
+  return merged;
+}
+
+function markConversationRead(conv) {
+  if (!conv.unread) return;
+  conv.unread = 0;
+  if (!hasCurrentMember) return;
+
+  fetch(`/api/conversations/${conv.id}/read/`, {
+    method: "POST",
+    headers: { "X-CSRFToken": getCookie("csrftoken") },
+    credentials: "same-origin",
+  }).catch(() => {});
+}
+
+// Chat history is fetched a page at a time when a conversation is opened,
+// then older pages as the user scrolls to the top.
+const HISTORY_PAGE_SIZE = 50;
+const historyState = {};
+
+function loadConversationHistory(requestId, older = false) {
+  if (!hasCurrentMember) return;
+
+  const state = historyState[requestId] || {
+    loaded: false,
+    hasMore: false,
+    loading: false,
+  };
+  historyState[requestId] = state;
+  if (state.loading || (older ? !state.hasMore : state.loaded)) return;
+
+  const params = new URLSearchParams({ limit: HISTORY_PAGE_SIZE });
+  if (older) {
+    params.set("before_at", state.beforeAt);
+    params.set("before_id", state.beforeId);
+  }
+
+  state.loading = true;
+  fetch(`/api/conversations/${requestId}/messages/?${params}`, {
+    credentials: "same-origin",
+  })
+    .then((res) => {
+      if (!res.ok) throw new Error("Could not load messages");
+      return res.json();
+    })
+    .then((data) => {
+      messagesData[requestId] = combineMessages(
+        messagesData[requestId] || [],
+        data.messages || [],
+      );
+      state.loaded = true;
+      state.hasMore = data.has_more === true;
+      if (data.before_id) {
+        state.beforeAt = data.before_at;
+        state.beforeId = data.before_id;
+      }
+      if (currentChatId === requestId) renderMessages(older);
+    })
+    .catch(() => {})
+    .finally(() => {
+      state.loading = false;
+    });
+}
+
 function syncServerData() {
-  if (!hasCurrentMember || syncInFlight) return;
+  if (!hasCurrentMember) return;
+  if (syncInFlight) {
+    // An event arrived mid-sync; fetch again once this one lands.
+    syncQueued = true;
+    return;
+  }
 
   syncInFlight = true;
-  fetch("/sync-data/", {
+  const url = syncCursor
+    ? `/sync-data/?since=${encodeURIComponent(syncCursor)}`
+    : "/sync-data/";
+  fetch(url, {
     credentials: "same-origin",
   })
     .then((res) => {
@@ -518,17 +601,28 @@ function syncServerData() {
       return res.json();
     })
     .then((data) => {
+      const isDelta = data.delta === true;
+
       if (Array.isArray(data.requests)) {
-        requestsData = data.requests;
+        requestsData = isDelta
+          ? mergeById(requestsData, data.requests)
+          : data.requests;
         if (currentPage === "requests") renderRequests();
       }
 
       if (Array.isArray(data.conversations)) {
-        conversationsData = data.conversations;
+        conversationsData = isDelta
+          ? mergeById(conversationsData, data.conversations, true)
+          : data.conversations;
       }
 
       if (data.messages && typeof data.messages === "object") {
-        messagesData = data.messages;
+        // Sync only carries new messages; history loaded per chat is kept.
+        messagesData = mergeMessages(messagesData, data.messages);
+      }
+
+      if (typeof data.cursor === "string") {
+        syncCursor = data.cursor;
       }
 
       if (typeof data.wallet_credits === "number") {
@@ -547,19 +641,54 @@ function syncServerData() {
         }
       }
 
-      if (currentPage === "messages") refreshMessagesView();
+      if (currentPage === "messages") {
+        // Messages arriving in the open chat are read as they render.
+        const openConv = conversationsData.find((c) => c.id === currentChatId);
+        if (openConv) markConversationRead(openConv);
+        refreshMessagesView();
+      }
       updatePendingRequestsCount();
     })
 
     .catch(() => {})
     .finally(() => {
       syncInFlight = false;
+      if (syncQueued) {
+        syncQueued = false;
+        syncServerData();
+      }
     });
 }
 
+const POLL_INTERVAL_MS = 12000;
+// While the event stream is open polling is only a safety net.
+const STREAM_POLL_INTERVAL_MS = 60000;
+let eventSource = null;
+// Set by the server only when /events/ can actually stream (ASGI).
+const eventStreamEnabled = document.body.dataset.eventStream === "true";
+
+function setPollInterval(intervalMs) {
+  if (syncIntervalId) clearInterval(syncIntervalId);
+  syncIntervalId = setInterval(syncServerData, intervalMs);
+}
+
 function startPolling() {
   if (!hasCurrentMember || syncIntervalId) return;
-  syncIntervalId = setInterval(syncServerData, 12000);
+  setPollInterval(POLL_INTERVAL_MS);
+  startEventStream();
+}
+
+function startEventStream() {
+  if (!hasCurrentMember || !eventStreamEnabled || eventSource || !window.EventSource) {
+    return;
+  }
+
+  eventSource = new EventSource("/events/", { withCredentials: true });
+  eventSource.onopen = () => setPollInterval(STREAM_POLL_INTERVAL_MS);
+  eventSource.onerror = () => setPollInterval(POLL_INTERVAL_MS);
+  ["message", "request", "session"].forEach((type) => {
+    eventSource.addEventListener(type, () => syncServerData());
+  });
 }
 
 function renderStars(rating) {
@@ -734,11 +863,24 @@ function renderSkillsGrid() {
   const searchTerm =
     document.getElementById("search-input")?.value.toLowerCase() || "";
   if (searchTerm) {
-    filtered = filtered.filter(
-      (s) =>
+    // Real skills are ranked by the server index; demo skills only exist
+    // in the browser, so they are still matched locally.
+    const serverMatches =
+      searchResults && searchResults.term === searchTerm
+        ? searchResults.ranks
+        : null;
+    filtered = filtered.filter((s) => {
+      if (!s.isSample && serverMatches) return serverMatches.has(s.serverId);
+      return (
         s.title.toLowerCase().includes(searchTerm) ||
-        s.description.toLowerCase().includes(searchTerm),
-    );
+        s.description.toLowerCase().includes(searchTerm)
+      );
+    });
+    if (serverMatches) {
+      const rank = (s) =>
+        s.isSample ? Infinity : (serverMatches.get(s.serverId) ?? Infinity);
+      filtered.sort((a, b) => rank(a) - rank(b));
+    }
   }
 
   const skillsCount = document.getElementById("skills-count");
@@ -788,6 +930,43 @@ function renderSkillsGrid() {
     .join("");
 }
 
+let searchResults = null;
+let searchTimer = null;
+
+function searchSkillsOnServer() {
+  clearTimeout(searchTimer);
+  const term =
+    document.getElementById("search-input")?.value.trim().toLowerCase() || "";
+  if (!term) {
+    searchResults = null;
+    renderSkillsGrid();
+    return;
+  }
+
+  searchTimer = setTimeout(() => {
+    const params = new URLSearchParams({ q: term, page_size: "100" });
+    if (selectedCategory !== "all") params.set("category", selectedCategory);
+
+    fetch(`/api/skills/search/?${params}`, { credentials: "same-origin" })
+      .then((res) => {
+        if (!res.ok) throw new Error("Search failed");
+        return res.json();
+      })
+      .then((data) => {
+        const ranks = new Map();
+        (data.results || []).forEach((skill, index) => {
+          ranks.set(Number(skill.id), index);
+        });
+        searchResults = { term, ranks };
+        renderSkillsGrid();
+      })
+      .catch(() => {
+        searchResults = null;
+        renderSkillsGrid();
+      });
+  }, 250);
+}
+
 function requestSkill(skillId) {
   const skill = sampleSkills.find((s) => s.id === skillId);
   if (skill) {
@@ -1227,20 +1406,30 @@ function selectConversation(id) {
     updateChatHeader(conv);
 
     // Mark as read
-    conv.unread = 0;
+    markConversationRead(conv);
     renderConversations();
     renderMessages();
+    loadConversationHistory(id);
 
     // On mobile, show chat
     document.querySelector(".message-list-panel").classList.remove("active");
   }
 }
 
-function renderMessages() {
+function renderMessages(keepScrollPosition = false) {
   const container = document.getElementById("chat-messages");
   const messages = messagesData[currentChatId] || [];
+  const history = historyState[currentChatId];
 
   if (messages.length === 0) {
+    if (history && history.loading) {
+      container.innerHTML = `
+      <div class="text-center opacity-40 py-8">
+        <p>Loading messages...</p>
+      </div>
+    `;
+      return;
+    }
     container.innerHTML = `
       <div class="text-center opacity-40 py-8">
         <p>No messages yet. Start the conversation!</p>
@@ -1249,6 +1438,7 @@ function renderMessages() {
     return;
   }
 
+  const previousHeight = container.scrollHeight;
   container.innerHTML = messages
     .map(
       (msg) => `
@@ -1260,7 +1450,12 @@ function renderMessages() {
     )
     .join("");
 
-  container.scrollTop = container.scrollHeight;
+  if (keepScrollPosition) {
+    // Older messages were prepended; keep the visible ones in place.
+    container.scrollTop += container.scrollHeight - previousHeight;
+  } else {
+    container.scrollTop = container.scrollHeight;
+  }
 }
 
 function sendMessage() {
@@ -1362,6 +1557,16 @@ document.addEventListener("DOMContentLoaded", () => {
     navigateTo(page);
   });
 
+  // Older chat history loads as the user scrolls to the top
+  const chatMessages = document.getElementById("chat-messages");
+  if (chatMessages) {
+    chatMessages.addEventListener("scroll", () => {
+      if (currentChatId && chatMessages.scrollTop < 40) {
+        loadConversationHistory(currentChatId, true);
+      }
+    });
+  }
+
   // Mobile menu
   const mobileMenuBtn = document.getElementById("mobile-menu-btn");
   if (mobileMenuBtn) {
@@ -1390,21 +1595,23 @@ document.addEventListener("DOMContentLoaded", () => {
       chip.classList.add("active");
       selectedCategory = chip.dataset.category;
       renderSkillsGrid();
+      searchSkillsOnServer();
     });
   });
 
-  // Search (prevent page refresh and filter locally)
+  // Search (prevent page refresh; ranked by the server index)
   const searchForm = document.querySelector("#page-find-skill form");
   const searchInput = document.getElementById("search-input");
   if (searchForm) {
     searchForm.addEventListener("submit", (e) => {
       e.preventDefault();
-      renderSkillsGrid();
+      searchSkillsOnServer();
     });
   }
   if (searchInput) {
     searchInput.addEventListener("input", () => {
       renderSkillsGrid();
+      searchSkillsOnServer();
     });
   }
 
@@ -1519,15 +1726,61 @@ document.addEventListener("DOMContentLoaded", () => {
     });
   }
 
+  ensureCsrfCookie();
+  document.addEventListener("submit", (e) => fillCsrfInputs(e.target), true);
+
   updateUIFromConfig();
-  if (hasCurrentMember) {
-    syncServerData();
-    startPolling();
-  }
+  loadBootstrapData();
   updatePendingRequestsCount();
   navigateTo("dashboard");
 });
 
+function fetchJson(url) {
+  // Default cache mode: the browser revalidates with the stored ETag and
+  // reuses its copy on 304.
+  return fetch(url, { credentials: "same-origin" }).then((res) => {
+    if (!res.ok) throw new Error(`${url} failed`);
+    return res.json();
+  });
+}
+
+function loadBootstrapData() {
+  fetchJson("/api/skills/catalog/")
+    .then((skills) => {
+      if (!Array.isArray(skills)) return;
+      setServerSkills(skills);
+      renderSkillsGrid();
+    })
+    .catch(() => {});
+
+  if (!hasCurrentMember) return;
+
+  Promise.all([
+    fetchJson("/api/me/requests/"),
+    fetchJson("/api/me/conversations/"),
+  ])
+    .then(([requests, conversations]) => {
+      requestsData = requests.requests || [];
+      conversationsData = conversations.conversations || [];
+
+      // Polling resumes from the older of the two snapshots.
+      const cursors = [requests.cursor, conversations.cursor];
+      if (cursors.every((cursor) => typeof cursor === "string")) {
+        syncCursor = cursors.sort()[0];
+      }
+
+      if (currentPage === "requests") renderRequests();
+      if (currentPage === "messages") refreshMessagesView();
+      updatePendingRequestsCount();
+    })
+    .catch(() => {})
+    .finally(() => {
+      // No cursor means the bootstrap failed: a full sync covers it.
+      if (!syncCursor) syncServerData();
+      startPolling();
+    });
+}
+
 function haversineDistance(coords1, coords2) {
   const R = 6371; // Radius of the Earth in km
   const dLat = ((coords2.lat - coords1.lat) * Math.PI) / 180;
@@ -1691,9 +1944,16 @@ function getZoomLevel(radiusKm) {
 }
 
 function fetchSkills(lat, lng, radius) {
-  fetch(`/api/skills/?lat=${lat}&lng=${lng}&radius=${radius}`)
+  fetch(`/api/skills/?lat=${lat}&lng=${lng}&radius=${radius}`, {
+    credentials: "same-origin",
+  })
     .then((res) => res.json())
-    .then(renderSkills);
+    .then((data) => {
+      const ids = new Set();
+      renderSkills(
+        (data.results || []).map((skill) => normalizeServerSkill(skill, ids)),
+      );
+    });
 }
 
 function renderSkills(skills) {